@@ -4,11 +4,8 @@ import logging
 from src.components.opeai_client_config import initialize_openai_client
 from src.components.sidebar import configure_sidebar
 from src.config.logging_config import setup_logging
-from src.pages.chat_ui import chat_app
-from src.pages.prompt_generator_ui import prompt_generator_ui
-from src.pages.tell_joke_ui import tell_joke_ui
-from src.pages.text_translator_ui import text_translator_ui
-from flask_app import start_flask_in_thread
+from src.pages.registry import load_page
+from src.config import settings
 
 
 def main():
@@ -20,9 +17,11 @@ def main():
     st.set_page_config(page_title="AI Assistant", page_icon="🤖")
     logger.info("Streamlit page configured.")
 
-    # Start Flask server in a separate thread
-    logger.info("Starting Flask server...")
-    start_flask_in_thread()  # This starts Flask in a separate thread
+    # Start Flask server in a separate thread, unless the REST API is served standalone
+    if settings.EMBED_REST_API:
+        # Imported here so the Flask/flask-restx stack is only loaded when the API is embedded
+        from flask_app import start_flask_in_thread
+        start_flask_in_thread()  # Starts Flask once per process, later reruns are no-ops
 
     # Configure the sidebar and get user input
     sidebar_config = configure_sidebar()
@@ -41,16 +40,13 @@ def main():
     app_mode = sidebar_config["app_mode"]
     logger.info(f"App mode selected: {app_mode}")
 
-    if app_mode == "Chat":
-        chat_app(client)
-    elif app_mode == "Text Translator":
-        text_translator_ui(client)
-    elif app_mode == "Prompt Engineering Assistant":
-        prompt_generator_ui(client)
-    elif app_mode == "Tell me a joke":
-        tell_joke_ui(client)
-    else:
+    # Only the selected page module is imported, on its first use
+    try:
+        page = load_page(app_mode)
+    except KeyError:
         logger.warning(f"Unknown app mode selected: {app_mode}")
+        return
+    page(client)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,110 @@
+"""
+Cold import times of the app entry points and pages.
+
+Each module is imported in a fresh interpreter with `python -X importtime`, so the numbers
+reflect a container cold start. Results are printed as JSON for regression tracking:
+
+    python -m benchmarks.import_times
+    python -m benchmarks.import_times --module app --module src.pages.chat_ui --repeat 5
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from src.pages.registry import PAGES
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODULES = ["app", "src.components.opeai_client_config", "flask_app"] + \
+    [module for module, _ in PAGES.values()]
+
+
+def _slowest_imports(stderr: str, limit: int) -> List[dict]:
+    """
+    Extracts the modules with the highest self time from `-X importtime` output.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            entries.append({"module": name.strip(), "self_ms": int(self_us) / 1000,
+                            "cumulative_ms": int(cumulative_us) / 1000})
+        except ValueError:
+            continue
+    return sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[:limit]
+
+
+def measure(module: str, top: int = 10) -> Optional[dict]:
+    """
+    Imports a module in a fresh interpreter and reports its cumulative import time.
+
+    Args:
+        module (str): The module to import.
+        top (int): Number of slowest transitive imports to report.
+
+    Returns:
+        dict | None: The import time, wall time and slowest imports, or None if the import failed.
+    """
+    env = dict(os.environ, GENIUS_EMBED_REST_API="false")
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        logger.warning(f"Importing {module} failed: {completed.stderr.strip().splitlines()[-1:]}")
+        return None
+
+    cumulative_ms = None
+    for line in completed.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_ms = int(parts[1]) / 1000
+    return {"import_ms": cumulative_ms, "wall_ms": round(wall * 1000, 1),
+            "slowest": _slowest_imports(completed.stderr, top)}
+
+
+def main(argv=None):
+    """
+    Measures the selected modules and emits the results as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Measure cold import times of the app modules.")
+    parser.add_argument("--module", action="append", help="Module to measure; repeat for several")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="Slowest transitive imports to list")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+
+    results: Dict[str, dict] = {}
+    for module in args.module or DEFAULT_MODULES:
+        runs = [measure(module, args.top) for _ in range(args.repeat)]
+        runs = [run for run in runs if run is not None]
+        if not runs:
+            results[module] = {"error": "import failed"}
+            continue
+        import_times = [run["import_ms"] for run in runs if run["import_ms"] is not None]
+        results[module] = {
+            "import_ms_median": round(statistics.median(import_times), 1) if import_times else None,
+            "wall_ms_median": round(statistics.median(run["wall_ms"] for run in runs), 1),
+            "slowest": runs[-1]["slowest"],
+        }
+
+    output = json.dumps({"python": sys.version.split()[0], "modules": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Local OpenAI-compatible stub server for benchmarks.
+
+Implements `POST /v1/chat/completions` (including streaming) with configurable latency,
+completion length and error injection, so the clients, services and REST API can be measured
+without network access or API spend. The Files and Batch endpoints used by
+`src.services.batch_backend` are implemented as well; batches complete after
+`batch_latency_ms`.
+
+Run standalone:
+
+    python -m benchmarks.mock_openai_server --port 8765 --latency-ms 200 --rate-limit-rate 0.05
+
+and point the OpenAI SDK at it with `OPENAI_BASE_URL=http://127.0.0.1:8765/v1`.
+"""
+import argparse
+import email
+import email.policy
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockConfig:
+    """
+    Behaviour of the mock server.
+
+    Attributes:
+        latency_ms (float): Mean time before the response (or the first streamed chunk) is sent.
+        jitter_ms (float): Uniform random deviation added to the latency.
+        completion_tokens (int): Length of every completion, in tokens.
+        stream_token_ms (float): Delay between streamed tokens.
+        error_rate (float): Share of requests answered with a 500 error.
+        rate_limit_rate (float): Share of requests answered with a 429 error.
+        retry_after_ms (int): Delay advertised in the `retry-after-ms` header of 429 responses.
+        batch_latency_ms (float): Time a batch takes to complete once created.
+        seed (int | None): Seed for the random error injection and jitter.
+    """
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    completion_tokens: int = 64
+    stream_token_ms: float = 2.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_ms: int = 100
+    seed: int = None
+    batch_latency_ms: float = 200.0
+
+
+class MockOpenAIServer:
+    """
+    OpenAI-compatible HTTP server running on a background thread.
+
+    Attributes:
+        config (MockConfig): The server behaviour; may be changed between scenarios.
+        requests (int): Number of chat completion requests received, including those in batches.
+        batches (int): Number of batches created.
+    """
+
+    def __init__(self, config: MockConfig = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Binds the server; port 0 picks a free port.
+        """
+        self.config = config or MockConfig()
+        self.requests = 0
+        self.batches = 0
+        self._files: Dict[str, Tuple[dict, bytes]] = {}
+        self._batch_objects: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        The URL to pass as `base_url` to the OpenAI SDK.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        """
+        Starts serving on a daemon thread.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-openai", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock OpenAI server listening on {self.base_url}")
+        return self
+
+    def serve_forever(self):
+        """
+        Serves on the calling thread until interrupted.
+        """
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        """
+        Stops the server and closes its socket.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _next_outcome(self) -> Tuple[str, float]:
+        """
+        Counts a request and decides whether it succeeds or fails, and by how much its
+        latency deviates from the mean.
+        """
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            jitter = self._random.uniform(-1, 1) * self.config.jitter_ms
+        if roll < self.config.rate_limit_rate:
+            return "rate_limited", jitter
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return "error", jitter
+        return "ok", jitter
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _send_json(self, status: int, payload: dict, headers: dict = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_bytes(self, status: int, body: bytes, content_type: str = "application/octet-stream"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                path = self.path.rstrip("/")
+                if path == "/v1/files":
+                    server._handle_file_upload(self, self.headers.get("Content-Type", ""), body)
+                    return
+                payload = json.loads(body or b"{}")
+                if path == "/v1/batches":
+                    server._handle_batch_create(self, payload)
+                    return
+                if path != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                server._handle_chat_completion(self, payload)
+
+            def do_GET(self):
+                parts = self.path.rstrip("/").split("/")
+                if len(parts) == 4 and parts[2] == "batches":
+                    batch = server._batch(parts[3])
+                    if batch is not None:
+                        self._send_json(200, batch)
+                        return
+                elif len(parts) == 5 and parts[2] == "files" and parts[4] == "content":
+                    stored = server._files.get(parts[3])
+                    if stored is not None:
+                        self._send_bytes(200, stored[1])
+                        return
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+        return Handler
+
+    def _store_file(self, filename: str, purpose: str, content: bytes) -> dict:
+        file_object = {"id": f"file-{uuid.uuid4().hex[:12]}", "object": "file", "bytes": len(content),
+                       "created_at": int(time.time()), "filename": filename, "purpose": purpose,
+                       "status": "processed"}
+        with self._lock:
+            self._files[file_object["id"]] = (file_object, content)
+        return file_object
+
+    def _handle_file_upload(self, handler, content_type: str, body: bytes):
+        """
+        Stores a file sent as multipart/form-data, as the SDK's `files.create` does.
+        """
+        message = email.message_from_bytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body,
+                                           policy=email.policy.HTTP)
+        fields, filename, content = {}, "upload", b""
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename():
+                filename, content = part.get_filename(), part.get_payload(decode=True)
+            else:
+                fields[name] = part.get_content().strip()
+        handler._send_json(200, self._store_file(filename, fields.get("purpose", "batch"), content))
+
+    def _handle_batch_create(self, handler, payload: dict):
+        stored = self._files.get(payload.get("input_file_id"))
+        if stored is None:
+            handler._send_json(404, {"error": {"message": f"No such file: {payload.get('input_file_id')}"}})
+            return
+        batch = {"id": f"batch_{uuid.uuid4().hex[:12]}", "object": "batch", "endpoint": payload.get("endpoint"),
+                 "input_file_id": payload["input_file_id"], "completion_window": payload.get("completion_window"),
+                 "status": "validating", "created_at": int(time.time()), "output_file_id": None,
+                 "error_file_id": None, "request_counts": {"total": 0, "completed": 0, "failed": 0},
+                 "_ready_at": time.monotonic() + self.config.batch_latency_ms / 1000}
+        with self._lock:
+            self.batches += 1
+            self._batch_objects[batch["id"]] = batch
+        handler._send_json(200, self._public_batch(batch))
+
+    @staticmethod
+    def _public_batch(batch: dict) -> dict:
+        return {key: value for key, value in batch.items() if not key.startswith("_")}
+
+    def _batch(self, batch_id: str) -> Optional[dict]:
+        """
+        Returns a batch, running its requests once `batch_latency_ms` has passed.
+        """
+        with self._lock:
+            batch = self._batch_objects.get(batch_id)
+        if batch is None:
+            return None
+        if batch["status"] == "validating":
+            batch["status"] = "in_progress"
+        elif batch["status"] == "in_progress" and time.monotonic() >= batch["_ready_at"]:
+            self._complete_batch(batch)
+        return self._public_batch(batch)
+
+    def _complete_batch(self, batch: dict):
+        outputs, errors = [], []
+        for line in self._files[batch["input_file_id"]][1].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            outcome, _ = self._next_outcome()
+            if outcome == "ok":
+                response = {"status_code": 200, "body": self._completion_body(request.get("body") or {})}
+                outputs.append({"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": request.get("custom_id"),
+                                "response": response, "error": None})
+            else:
+                status = 429 if outcome == "rate_limited" else 500
+                response = {"status_code": status, "body": {"error": {"message": f"Request failed (mock {status})"}}}
+                errors.append({"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": request.get("custom_id"),
+                               "response": response, "error": None})
+
+        def to_file(records):
+            content = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+            return self._store_file(f"{batch['id']}_output.jsonl", "batch_output", content)["id"]
+
+        batch["output_file_id"] = to_file(outputs) if outputs else None
+        batch["error_file_id"] = to_file(errors) if errors else None
+        batch["request_counts"] = {"total": len(outputs) + len(errors), "completed": len(outputs),
+                                   "failed": len(errors)}
+        batch["status"] = "completed"
+
+    def _completion_words(self, payload: dict) -> Tuple[List[str], dict]:
+        """
+        Returns the completion tokens and the usage reported for a request.
+        """
+        config = self.config
+        prompt_tokens = 3 + sum(4 + math.ceil(len(message.get("content") or "") / 4)
+                                for message in payload.get("messages", []))
+        completion_tokens = min(config.completion_tokens, payload.get("max_tokens") or config.completion_tokens)
+        words = [f"tok{i}" for i in range(completion_tokens)]
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens,
+                 "prompt_tokens_details": {"cached_tokens": 0}}
+        return words, usage
+
+    def _completion_body(self, payload: dict) -> dict:
+        """
+        Builds a chat completion response for a request.
+        """
+        words, usage = self._completion_words(payload)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": " ".join(words)}}],
+            "usage": usage,
+        }
+
+    def _handle_chat_completion(self, handler, payload: dict):
+        config = self.config
+        outcome, jitter = self._next_outcome()
+        time.sleep(max(0.0, config.latency_ms + jitter) / 1000)
+
+        if outcome == "rate_limited":
+            handler._send_json(429, {"error": {"message": "Rate limit reached (mock)", "type": "requests",
+                                               "code": "rate_limit_exceeded"}},
+                               headers={"retry-after-ms": str(config.retry_after_ms)})
+            return
+        if outcome == "error":
+            handler._send_json(500, {"error": {"message": "Internal server error (mock)", "type": "server_error"}})
+            return
+
+        if not payload.get("stream"):
+            handler._send_json(200, self._completion_body(payload))
+            return
+
+        words, usage = self._completion_words(payload)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = payload.get("model", "mock")
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+
+        def send_chunk(choices, chunk_usage=None):
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": choices, "usage": chunk_usage}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        for i, word in enumerate(words):
+            content = word if i == 0 else f" {word}"
+            send_chunk([{"index": 0, "delta": {"content": content}, "finish_reason": None}])
+            time.sleep(config.stream_token_ms / 1000)
+        send_chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            send_chunk([], usage)
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+def main():
+    """
+    Command line entry point for running the mock server standalone.
+    """
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible mock server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=MockConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=MockConfig.jitter_ms)
+    parser.add_argument("--completion-tokens", type=int, default=MockConfig.completion_tokens)
+    parser.add_argument("--stream-token-ms", type=float, default=MockConfig.stream_token_ms)
+    parser.add_argument("--error-rate", type=float, default=MockConfig.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=MockConfig.rate_limit_rate)
+    parser.add_argument("--retry-after-ms", type=int, default=MockConfig.retry_after_ms)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--batch-latency-ms", type=float, default=MockConfig.batch_latency_ms)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.completion_tokens, args.stream_token_ms,
+                        args.error_rate, args.rate_limit_rate, args.retry_after_ms, args.seed,
+                        args.batch_latency_ms)
+    server = MockOpenAIServer(config, args.host, args.port)
+    logger.info(f"Serving mock OpenAI API on {server.base_url} (Ctrl+C to stop).")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
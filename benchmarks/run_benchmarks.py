@@ -0,0 +1,339 @@
+"""
+Benchmark scenarios for the OpenAI clients, services and REST API.
+
+Every scenario runs against a local `MockOpenAIServer`, so results reflect this code base
+(client overhead, prompt building, concurrency, retries) rather than OpenAI's latency.
+Results are printed as JSON, suitable for tracking regressions between commits:
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --scenario concurrent --concurrency 32 --latency-ms 200
+
+The response cache and the client-side rate limiter are disabled unless requested, so every
+request reaches the mock server.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.mock_openai_server import MockConfig, MockOpenAIServer
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+API_KEY = "sk-benchmark"
+MODEL = "gpt-3.5-turbo"
+TEMPERATURE = 0.7
+MAX_TOKENS = 256
+
+SAMPLE_TEXT = ("The quick brown fox jumps over the lazy dog while the committee reviews the "
+               "quarterly report on renewable energy adoption across member states.")
+
+SCENARIOS = ("translate", "stream", "batch", "chat", "concurrent", "rest")
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0, **extra) -> dict:
+    """
+    Reduces per-request latencies (in seconds) to the reported statistics, in milliseconds.
+
+    Args:
+        latencies (list): Latency of every request, including failed ones.
+        elapsed (float): Wall-clock duration of the scenario, in seconds.
+        errors (int): Number of failed requests.
+        **extra: Scenario-specific values to include.
+
+    Returns:
+        dict: Request count, error count, requests per second and latency percentiles.
+    """
+    values = sorted(latencies)
+    result = {
+        "requests": len(values),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "requests_per_s": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(values) * 1000, 2) if values else 0.0,
+            "p50": round(_percentile(values, 50) * 1000, 2),
+            "p95": round(_percentile(values, 95) * 1000, 2),
+            "p99": round(_percentile(values, 99) * 1000, 2),
+            "max": round(values[-1] * 1000, 2) if values else 0.0,
+        },
+    }
+    result.update(extra)
+    return result
+
+
+def _is_error(content: str) -> bool:
+    return content.startswith("An error occurred")
+
+
+def _make_client():
+    from src.services.openai_client import OpenAIGeniusClient
+
+    return OpenAIGeniusClient(API_KEY, MODEL, TEMPERATURE, MAX_TOKENS)
+
+
+def _timed(fn: Callable[[], bool]):
+    """
+    Runs a request and returns its latency and whether it failed.
+    """
+    start = time.perf_counter()
+    try:
+        failed = fn()
+    except Exception as e:
+        logger.warning(f"Benchmark request failed: {e}")
+        failed = True
+    return time.perf_counter() - start, failed
+
+
+def bench_translate(args) -> dict:
+    """
+    Sequential single translations through `TextTranslator` and the sync client.
+    """
+    from src.services.text_translator_service import TextTranslator
+
+    client = _make_client()
+
+    def request(i: int) -> bool:
+        translation, _ = TextTranslator("English", "French", f"{SAMPLE_TEXT} #{i}").execute(client)
+        return _is_error(translation)
+
+    start = time.perf_counter()
+    samples = [_timed(lambda i=i: request(i)) for i in range(args.requests)]
+    return summarize([s[0] for s in samples], time.perf_counter() - start, sum(s[1] for s in samples))
+
+
+def bench_stream(args) -> dict:
+    """
+    Streamed translations; reports time to first token next to the full response time.
+    """
+    from src.services.text_translator_service import TextTranslator
+
+    client = _make_client()
+    latencies, first_token = [], []
+    errors = 0
+    start = time.perf_counter()
+    for i in range(args.requests):
+        request_start = time.perf_counter()
+        try:
+            first = None
+            for delta, _ in TextTranslator("English", "French", f"{SAMPLE_TEXT} #{i}").stream(client):
+                if delta and first is None:
+                    first = time.perf_counter() - request_start
+            first_token.append(first or 0.0)
+        except Exception as e:
+            logger.warning(f"Streamed request failed: {e}")
+            errors += 1
+        latencies.append(time.perf_counter() - request_start)
+    elapsed = time.perf_counter() - start
+
+    first_token.sort()
+    return summarize(latencies, elapsed, errors, time_to_first_token_ms={
+        "p50": round(_percentile(first_token, 50) * 1000, 2),
+        "p95": round(_percentile(first_token, 95) * 1000, 2),
+        "p99": round(_percentile(first_token, 99) * 1000, 2),
+    })
+
+
+def bench_batch(args) -> dict:
+    """
+    `BatchTranslator` on the async client; latency is per batch, throughput per item.
+    """
+    from src.services.async_openai_client import AsyncOpenAIGeniusClient
+    from src.services.batch_translator_service import BatchTranslator
+
+    async def run_batch(offset: int):
+        client = AsyncOpenAIGeniusClient(API_KEY, MODEL, TEMPERATURE, MAX_TOKENS)
+        try:
+            items = [{"source_lang": "English", "target_lang": "German", "text": f"{SAMPLE_TEXT} #{offset + i}"}
+                     for i in range(args.batch_size)]
+            results, _ = await BatchTranslator(items, args.concurrency).aexecute(client)
+            return sum(1 for r in results if r["error"] or _is_error(r["translation"] or ""))
+        finally:
+            await client.close()
+
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for run in range(max(1, args.requests // args.batch_size)):
+        batch_start = time.perf_counter()
+        errors += asyncio.run(run_batch(run * args.batch_size))
+        latencies.append(time.perf_counter() - batch_start)
+    elapsed = time.perf_counter() - start
+    items = len(latencies) * args.batch_size
+    return summarize(latencies, elapsed, errors, batch_size=args.batch_size, concurrency=args.concurrency,
+                     items_per_s=round(items / elapsed, 2) if elapsed else 0.0)
+
+
+def bench_chat(args) -> dict:
+    """
+    A single conversation with growing history, context built by `ChatHistoryManager`.
+    Reports how the context size and per-turn latency evolve.
+    """
+    from src.services.chat_history import ChatHistoryManager
+    from src.utils.token_counter import count_message_tokens
+
+    client = _make_client()
+    history = ChatHistoryManager()
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    latencies, context_tokens = [], []
+    errors = 0
+    start = time.perf_counter()
+    for turn in range(args.requests):
+        messages.append({"role": "user", "content": f"Turn {turn}: {SAMPLE_TEXT}"})
+        turn_start = time.perf_counter()
+        context = history.build_context(messages, client)
+        content, _ = client.get_chat_completion(context)
+        latencies.append(time.perf_counter() - turn_start)
+        context_tokens.append(count_message_tokens(context, MODEL))
+        errors += _is_error(content)
+        messages.append({"role": "assistant", "content": content})
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, errors, turns=args.requests,
+                     context_tokens={"first": context_tokens[0], "last": context_tokens[-1],
+                                     "max": max(context_tokens)} if context_tokens else {})
+
+
+def bench_concurrent(args) -> dict:
+    """
+    Many threads sharing the pooled sync client, as the REST API workers do.
+    """
+    from src.services.client_registry import get_shared_client
+    from src.services.text_translator_service import TextTranslator
+
+    def request(i: int):
+        client = get_shared_client(API_KEY, MODEL, TEMPERATURE, MAX_TOKENS)
+        translation, _ = TextTranslator("English", "Spanish", f"{SAMPLE_TEXT} #{i}").execute(client)
+        return _is_error(translation)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        samples = list(executor.map(lambda i: _timed(lambda: request(i)), range(args.requests)))
+    return summarize([s[0] for s in samples], time.perf_counter() - start, sum(s[1] for s in samples),
+                     concurrency=args.concurrency)
+
+
+def bench_rest(args) -> dict:
+    """
+    Concurrent `POST /translate` requests through the Flask app (WSGI test client, no socket),
+    covering request parsing, routing and serialization on top of the client.
+    """
+    from flask_app import app
+
+    def request(i: int) -> bool:
+        with app.test_client() as http:
+            response = http.post("/translate", headers={"Authorization": API_KEY}, json={
+                "source_lang": "English", "target_lang": "Italian", "text": f"{SAMPLE_TEXT} #{i}"})
+            return response.status_code != 200 or _is_error(response.get_json().get("translation", ""))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        samples = list(executor.map(lambda i: _timed(lambda: request(i)), range(args.requests)))
+    return summarize([s[0] for s in samples], time.perf_counter() - start, sum(s[1] for s in samples),
+                     concurrency=args.concurrency)
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "translate": bench_translate,
+    "stream": bench_stream,
+    "batch": bench_batch,
+    "chat": bench_chat,
+    "concurrent": bench_concurrent,
+    "rest": bench_rest,
+}
+
+
+def _configure_environment(args, base_url: str):
+    """
+    Points the OpenAI SDK at the mock server and sets the app configuration. Must run before
+    any `src` module is imported, since settings are read at import time.
+    """
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["GENIUS_CACHE_ENABLED"] = "true" if args.cache else "false"
+    os.environ["GENIUS_RATE_LIMIT_ENABLED"] = "true" if args.rate_limit else "false"
+    os.environ["GENIUS_EMBED_REST_API"] = "false"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark OpenAI-Genius-Hub against a local mock OpenAI server.")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to run; repeat for several. Defaults to all.")
+    parser.add_argument("--requests", type=int, default=50, help="Requests (or chat turns) per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallelism of concurrent scenarios")
+    parser.add_argument("--batch-size", type=int, default=25, help="Items per batch in the batch scenario")
+    parser.add_argument("--latency-ms", type=float, default=MockConfig.latency_ms, help="Mock response latency")
+    parser.add_argument("--jitter-ms", type=float, default=MockConfig.jitter_ms, help="Mock latency jitter")
+    parser.add_argument("--completion-tokens", type=int, default=MockConfig.completion_tokens,
+                        help="Tokens in every mock completion")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of mock 429 responses")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for mock jitter and error injection")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the client-side rate limiter enabled")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Log application output to stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Runs the selected scenarios and emits their results as JSON.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    config = MockConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        completion_tokens=args.completion_tokens, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mock": vars(config),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+            "rate_limit": args.rate_limit,
+        },
+        "scenarios": {},
+    }
+
+    with MockOpenAIServer(config) as server:
+        _configure_environment(args, server.base_url)
+        for name in args.scenario or SCENARIOS:
+            logger.warning(f"Running benchmark scenario '{name}'...")
+            before = server.requests
+            result = BENCHMARKS[name](args)
+            result["upstream_requests"] = server.requests - before
+            report["scenarios"][name] = result
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        logger.warning(f"Benchmark results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
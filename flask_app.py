@@ -1,30 +1,241 @@
-from flask import Flask
-import threading
+from flask import Flask, Response, g, request
+import argparse
 import logging
+import signal
+import threading
+import time
 
+from src.config import settings
+from src.config.logging_config import setup_logging
 from src.rest_service.routes.translate import translate_bp
+from src.services.metrics import HTTP_DURATION, render_metrics
 
-# Initialize Flask app and logger
-app = Flask(__name__)
+# Initialize logger
 logger = logging.getLogger(__name__)
 
-# Register the Blueprint
-app.register_blueprint(translate_bp)
+# Readiness is withdrawn as soon as a shutdown starts, so load balancers stop routing to us
+_ready = threading.Event()
+
+# The embedded server thread, started at most once per process
+_flask_thread = None
+_flask_thread_lock = threading.Lock()
+
+
+def create_app() -> Flask:
+    """
+    Creates the Flask application with the translation API, health and metrics endpoints.
+
+    Returns:
+        Flask: The configured application.
+    """
+    flask_app = Flask(__name__)
+
+    # Register the Blueprint
+    flask_app.register_blueprint(translate_bp)
+
+    @flask_app.get("/healthz")
+    def healthz():
+        """
+        Liveness probe: the process is up and serving requests.
+        """
+        return {"status": "ok"}, 200
+
+    @flask_app.get("/readyz")
+    def readyz():
+        """
+        Readiness probe: the server accepts new work and is not shutting down.
+        """
+        if not _ready.is_set():
+            return {"status": "unavailable"}, 503
+        return {"status": "ready"}, 200
+
+    @flask_app.get("/metrics")
+    def metrics():
+        """
+        Prometheus scrape endpoint.
+        """
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+    @flask_app.before_request
+    def start_timer():
+        g.request_started_at = time.perf_counter()
+
+    @flask_app.after_request
+    def record_request_duration(response):
+        started_at = g.get("request_started_at")
+        if started_at is not None and request.endpoint != "metrics":
+            endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            HTTP_DURATION.observe(time.perf_counter() - started_at, endpoint=endpoint,
+                                  method=request.method, status=str(response.status_code))
+        return response
+
+    _ready.set()
+    return flask_app
+
+
+# WSGI entry point, e.g. `gunicorn flask_app:app`
+app = create_app()
+
+
+def _resolve_backend(backend: str, workers: int) -> str:
+    """
+    Picks the server implementation, preferring gunicorn for multi-process serving and
+    waitress where gunicorn is unavailable (e.g. on Windows).
+    """
+    if backend != "auto":
+        return backend
+    if workers > 1:
+        try:
+            import gunicorn  # noqa: F401
+            return "gunicorn"
+        except ImportError:
+            pass
+    try:
+        import waitress  # noqa: F401
+        return "waitress"
+    except ImportError:
+        return "flask"
+
+
+def _drain_on_sigterm(worker):
+    """
+    Gunicorn `post_worker_init` hook: a graceful shutdown sends SIGTERM, which gunicorn's
+    `worker_int` hook does not see, so the worker's SIGTERM handler is wrapped to mark the
+    worker not ready before gunicorn stops it.
+    """
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def shutdown(signum, frame):
+        logger.info(f"Worker {worker.pid} received SIGTERM; no longer ready.")
+        _ready.clear()
+        if callable(handle_exit):
+            handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+
+def _serve_gunicorn(host: str, port: int, workers: int, threads: int, graceful_timeout: int):
+    """
+    Serves the app with gunicorn's pre-fork workers. SIGTERM triggers gunicorn's graceful
+    shutdown: workers stop accepting connections and finish in-flight requests.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class GeniusApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("threads", threads)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("graceful_timeout", graceful_timeout)
+            # Streaming and document translations can take longer than gunicorn's default timeout
+            self.cfg.set("timeout", int(max(settings.OPENAI_TIMEOUT_SECONDS * 2, 120)))
+            self.cfg.set("post_worker_init", _drain_on_sigterm)
+            self.cfg.set("worker_int", lambda worker: _ready.clear())
+            self.cfg.set("worker_abort", lambda worker: _ready.clear())
+
+        def load(self):
+            return app
+
+    GeniusApplication().run()
+
+
+def _serve_waitress(host: str, port: int, threads: int):
+    """
+    Serves the app with waitress' multi-threaded server, closing it gracefully on SIGTERM/SIGINT.
+    """
+    from waitress import create_server
+
+    server = create_server(app, host=host, port=port, threads=threads)
+
+    def shutdown(signum, frame):
+        logger.info(f"Received signal {signum}; shutting down REST API server.")
+        _ready.clear()
+        server.close()
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+    try:
+        server.run()
+    except OSError:
+        # Raised by the event loop once the server socket is closed during shutdown
+        if _ready.is_set():
+            raise
+    logger.info("REST API server stopped.")
+
+
+def serve(host: str = None, port: int = None, backend: str = None, workers: int = None, threads: int = None):
+    """
+    Runs the REST API with a production server.
+
+    Args:
+        host (str, optional): Interface to bind. Defaults to settings.
+        port (int, optional): Port to bind. Defaults to settings.
+        backend (str, optional): One of "auto", "gunicorn", "waitress" or "flask". Defaults to settings.
+        workers (int, optional): Worker processes (gunicorn only). Defaults to settings.
+        threads (int, optional): Threads per worker. Defaults to settings.
+    """
+    host = host or settings.SERVER_HOST
+    port = port or settings.SERVER_PORT
+    workers = workers or settings.SERVER_WORKERS
+    threads = threads or settings.SERVER_THREADS
+    backend = _resolve_backend(backend or settings.SERVER_BACKEND, workers)
+
+    logger.info(f"Starting REST API on {host}:{port} with {backend} (workers: {workers}, threads: {threads}).")
+    if backend == "gunicorn":
+        _serve_gunicorn(host, port, workers, threads, settings.SERVER_GRACEFUL_TIMEOUT)
+    elif backend == "waitress":
+        _serve_waitress(host, port, threads)
+    elif backend == "flask":
+        logger.warning("Serving with the Flask development server; install waitress or gunicorn for production.")
+        app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+    else:
+        raise ValueError(f"Unknown server backend: {backend}")
+
 
 def run_flask():
     """
     Function to run the Flask app in a separate thread.
+    Uses waitress when it is installed and the threaded development server otherwise.
     """
-    app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False)
+    backend = "waitress" if _resolve_backend("auto", workers=1) == "waitress" else "flask"
+    serve(backend=backend, workers=1)
+
 
 def start_flask_in_thread():
     """
     Starts the Flask server on a new thread.
+
+    Safe to call on every Streamlit rerun: the server is started at most once per process,
+    and is not restarted if it could not bind (e.g. a standalone server already owns the port).
+    """
+    global _flask_thread
+    with _flask_thread_lock:
+        if _flask_thread is not None:
+            return
+        logger.info("Starting Flask server in a separate thread.")
+        _flask_thread = threading.Thread(target=run_flask, name="rest-api", daemon=True)
+        _flask_thread.start()  # Daemon thread will close when the main thread closes
+
+
+def main():
     """
-    logger.info("Starting Flask server in a separate thread.")
-    flask_thread = threading.Thread(target=run_flask)
-    flask_thread.daemon = True  # Daemon thread will close when the main thread closes
-    flask_thread.start()
+    Command line entry point for serving the REST API standalone.
+    """
+    parser = argparse.ArgumentParser(description="Serve the OpenAI-Genius-Hub REST API.")
+    parser.add_argument("--host", default=settings.SERVER_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT, help="Port to bind")
+    parser.add_argument("--server", default=settings.SERVER_BACKEND,
+                        choices=["auto", "gunicorn", "waitress", "flask"], help="Server implementation")
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS,
+                        help="Worker processes (gunicorn only)")
+    parser.add_argument("--threads", type=int, default=settings.SERVER_THREADS, help="Threads per worker")
+    args = parser.parse_args()
+
+    setup_logging()
+    serve(args.host, args.port, args.server, args.workers, args.threads)
+
 
 if __name__ == "__main__":
-    run_flask()
+    main()
@@ -1,4 +1,5 @@
 import logging
+from src.services.model_router import get_client
 from src.services.openai_client import OpenAIGeniusClient
 
 
@@ -6,9 +7,13 @@ def initialize_openai_client(api_key: str, model: str, temperature: float, max_t
     """
     Initializes the OpenAI client with the given configuration.
 
+    The client is taken from the process-wide registry, so Streamlit reruns with the same
+    settings reuse the existing client and its HTTP connection pool. The model "auto" returns
+    a `RoutedClient` that picks the model per request.
+
     Args:
         api_key (str): OpenAI API key.
-        model (str): Selected model name.
+        model (str): Selected model name, or "auto".
         temperature (float): The temperature setting for creativity.
         max_tokens (int): Maximum token limit.
 
@@ -18,6 +23,6 @@ def initialize_openai_client(api_key: str, model: str, temperature: float, max_t
     logger = logging.getLogger(__name__)
     logger.info("Initializing OpenAI client.")
 
-    client = OpenAIGeniusClient(api_key, model, temperature, max_tokens)
+    client = get_client(api_key, model, temperature, max_tokens)
     logger.info("OpenAI client initialized successfully.")
     return client
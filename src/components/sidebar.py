@@ -1,6 +1,9 @@
 import streamlit as st
 import logging
 
+from src.config.models import get_max_output_tokens
+from src.pages.registry import get_page_names
+
 
 def configure_sidebar():
     """
@@ -17,21 +20,20 @@ def configure_sidebar():
     st.sidebar.markdown("[Get OpenAI API Key](https://platform.openai.com/account/api-keys)")
 
     # Sidebar navigation for selecting the app mode
-    options = ["Chat", "Text Translator", "Prompt Engineering Assistant", "Tell me a joke"]
-    app_mode = st.sidebar.selectbox("Choose the app mode", options)
+    app_mode = st.sidebar.selectbox("Choose the app mode", get_page_names())
 
     # Add slider to configure the temperature
     temperature = st.sidebar.slider(
         "Select Temperature (for creativity)", min_value=0.0, max_value=1.0, value=0.7, step=0.1
     )
 
-    # Dropdown to choose model
+    # Dropdown to choose model; "auto" lets the model router pick one per request
     model = st.sidebar.selectbox(
-        "Select OpenAI Model", ["gpt-3.5-turbo", "gpt-4", "gpt-4o-mini"]
+        "Select OpenAI Model", ["gpt-3.5-turbo", "gpt-4", "gpt-4o-mini", "auto"]
     )
 
-    # Sidebar configuration for max tokens
-    max_tokens = st.sidebar.slider("Set max tokens", min_value=50, max_value=20000, value=50)
+    # Sidebar configuration for max tokens, bounded by what the selected model can generate
+    max_tokens = st.sidebar.slider("Set max tokens", min_value=50, max_value=get_max_output_tokens(model), value=50)
 
     return {
         "api_key": api_key,
@@ -1,12 +1,84 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
+import threading
+
+from src.config import settings
+from src.utils.log_sanitizer import redact, truncate
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the caller: when the queue is full, the record is dropped
+    and counted, and the count is reported once the writer catches up.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        # Logging threads update the counter concurrently
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord):
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        try:
+            if dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                    "msg": f"Dropped {dropped} log record(s) because the log queue was full.",
+                }))
+                dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Keep the count of a report that could not be queued either
+            with self._dropped_lock:
+                self.dropped += dropped + 1
+
+
+class _SanitizingFormatter(logging.Formatter):
+    """
+    Formatter that redacts credentials and bounds the size of every record. Runs on the
+    background writer thread, off the request path.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        return truncate(redact(super().format(record)), settings.LOG_MAX_MESSAGE_CHARS)
+
 
 def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        filename='app.log',  # Log to file
-        filemode='a'
-    )
-
-# You can also define more advanced configurations here
+    """
+    Routes log records through a bounded in-memory queue to a rotating log file.
+
+    Logging calls only enqueue the record; a background listener formats, redacts and writes
+    it. Safe to call repeatedly (e.g. on every Streamlit rerun): the pipeline is installed
+    once per process.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(_SanitizingFormatter(LOG_FORMAT))
+
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)  # Flushes queued records on interpreter exit
+
+        root = logging.getLogger()
+        root.setLevel(settings.LOG_LEVEL)
+        root.addHandler(_DroppingQueueHandler(log_queue))
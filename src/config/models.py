@@ -0,0 +1,33 @@
+# Context window (prompt + completion) of each supported model, in tokens
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+
+# Maximum number of completion tokens each model can generate
+MODEL_MAX_OUTPUT_TOKENS = {
+    "gpt-3.5-turbo": 4096,
+    "gpt-4": 8192,
+    "gpt-4o": 16384,
+    "gpt-4o-mini": 16384,
+}
+
+# Limits assumed for models missing from the tables above
+DEFAULT_CONTEXT_WINDOW = 8192
+DEFAULT_MAX_OUTPUT_TOKENS = 4096
+
+
+def get_context_window(model: str) -> int:
+    """
+    Returns the context window of a model, in tokens.
+    """
+    return MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+
+def get_max_output_tokens(model: str) -> int:
+    """
+    Returns the maximum number of completion tokens a model can generate.
+    """
+    return MODEL_MAX_OUTPUT_TOKENS.get(model, DEFAULT_MAX_OUTPUT_TOKENS)
@@ -0,0 +1,184 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Reads a boolean flag from the environment.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (bool): Value used when the variable is not set.
+
+    Returns:
+        bool: The parsed flag.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Reads an integer setting from the environment.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (int): Value used when the variable is not set.
+
+    Returns:
+        int: The parsed value.
+    """
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """
+    Reads a float setting from the environment.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (float): Value used when the variable is not set.
+
+    Returns:
+        float: The parsed value.
+    """
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Directory of the SQLite databases whose path is not set explicitly, outside the working tree
+DATA_DIR = os.getenv("GENIUS_DATA_DIR", os.path.join(os.path.expanduser("~"), ".openai-genius-hub"))
+
+# Response cache for chat completions
+CACHE_ENABLED = _env_bool("GENIUS_CACHE_ENABLED", True)
+CACHE_MAX_ENTRIES = _env_int("GENIUS_CACHE_MAX_ENTRIES", 1024)
+CACHE_TTL_SECONDS = _env_float("GENIUS_CACHE_TTL_SECONDS", 3600.0)
+# Optional on-disk tier, disabled unless a path is given
+CACHE_DB_PATH = os.getenv("GENIUS_CACHE_DB_PATH")
+CACHE_DB_MAX_ENTRIES = _env_int("GENIUS_CACHE_DB_MAX_ENTRIES", 50000)
+
+# Shared OpenAI client pool
+OPENAI_TIMEOUT_SECONDS = _env_float("GENIUS_OPENAI_TIMEOUT_SECONDS", 60.0)
+# Retries are handled by the clients (see src/services/retry_policy.py), not the OpenAI SDK
+OPENAI_MAX_RETRIES = _env_int("GENIUS_OPENAI_MAX_RETRIES", 0)
+CLIENT_POOL_MAX_SIZE = _env_int("GENIUS_CLIENT_POOL_MAX_SIZE", 32)
+CLIENT_POOL_IDLE_SECONDS = _env_float("GENIUS_CLIENT_POOL_IDLE_SECONDS", 900.0)
+
+# Batch translation
+BATCH_MAX_ITEMS = _env_int("GENIUS_BATCH_MAX_ITEMS", 1000)
+BATCH_DEFAULT_CONCURRENCY = _env_int("GENIUS_BATCH_DEFAULT_CONCURRENCY", 8)
+BATCH_MAX_CONCURRENCY = _env_int("GENIUS_BATCH_MAX_CONCURRENCY", 32)
+
+# Document translation
+DOCUMENT_SEGMENT_TOKENS = _env_int("GENIUS_DOCUMENT_SEGMENT_TOKENS", 400)
+DOCUMENT_CONCURRENCY = _env_int("GENIUS_DOCUMENT_CONCURRENCY", 8)
+
+# Chat history window
+CHAT_HISTORY_TOKEN_BUDGET = _env_int("GENIUS_CHAT_HISTORY_TOKEN_BUDGET", 3000)
+CHAT_HISTORY_SUMMARIZE = _env_bool("GENIUS_CHAT_HISTORY_SUMMARIZE", True)
+CHAT_SUMMARY_MAX_TOKENS = _env_int("GENIUS_CHAT_SUMMARY_MAX_TOKENS", 300)
+
+# REST API server
+SERVER_HOST = os.getenv("GENIUS_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = _env_int("GENIUS_SERVER_PORT", 5000)
+SERVER_BACKEND = os.getenv("GENIUS_SERVER_BACKEND", "auto")  # auto, gunicorn, waitress or flask
+SERVER_WORKERS = _env_int("GENIUS_SERVER_WORKERS", 4)
+SERVER_THREADS = _env_int("GENIUS_SERVER_THREADS", 8)
+SERVER_GRACEFUL_TIMEOUT = _env_int("GENIUS_SERVER_GRACEFUL_TIMEOUT", 30)
+# Start the REST API inside the Streamlit process
+EMBED_REST_API = _env_bool("GENIUS_EMBED_REST_API", True)
+
+# Client-side rate limiting and retries, per API key and model
+RATE_LIMIT_ENABLED = _env_bool("GENIUS_RATE_LIMIT_ENABLED", True)
+RATE_LIMIT_RPM = _env_int("GENIUS_RATE_LIMIT_RPM", 500)
+RATE_LIMIT_TPM = _env_int("GENIUS_RATE_LIMIT_TPM", 200000)
+# Bound on the limiters kept per process; one is created per API key and model in use
+RATE_LIMIT_MAX_LIMITERS = _env_int("GENIUS_RATE_LIMIT_MAX_LIMITERS", 1024)
+# Limiters idle for this long are dropped; longer than a minute, so their buckets have refilled
+RATE_LIMIT_IDLE_SECONDS = _env_float("GENIUS_RATE_LIMIT_IDLE_SECONDS", 300.0)
+RETRY_MAX_ATTEMPTS = _env_int("GENIUS_RETRY_MAX_ATTEMPTS", 5)
+RETRY_MAX_WAIT_SECONDS = _env_float("GENIUS_RETRY_MAX_WAIT_SECONDS", 30.0)
+
+# Let concurrent identical requests share a single upstream call
+SINGLE_FLIGHT_ENABLED = _env_bool("GENIUS_SINGLE_FLIGHT_ENABLED", True)
+
+# Logging: records are written by a background thread to a rotating file
+LOG_FILE = os.getenv("GENIUS_LOG_FILE", "app.log")
+LOG_LEVEL = os.getenv("GENIUS_LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = _env_int("GENIUS_LOG_MAX_BYTES", 10 * 1024 * 1024)
+LOG_BACKUP_COUNT = _env_int("GENIUS_LOG_BACKUP_COUNT", 5)
+LOG_QUEUE_SIZE = _env_int("GENIUS_LOG_QUEUE_SIZE", 10000)
+LOG_MAX_MESSAGE_CHARS = _env_int("GENIUS_LOG_MAX_MESSAGE_CHARS", 4000)
+# Log prompt and response bodies (redacted and truncated) instead of their sizes only
+LOG_PAYLOADS = _env_bool("GENIUS_LOG_PAYLOADS", False)
+LOG_PAYLOAD_MAX_CHARS = _env_int("GENIUS_LOG_PAYLOAD_MAX_CHARS", 200)
+
+# Minimum seconds between checks of src/prompts/*.yml for edits; negative disables reloading
+PROMPT_RELOAD_SECONDS = _env_float("GENIUS_PROMPT_RELOAD_SECONDS", 2.0)
+
+# Sentence-level translation memory for the /translate endpoint
+TRANSLATION_MEMORY_ENABLED = _env_bool("GENIUS_TRANSLATION_MEMORY_ENABLED", False)
+TRANSLATION_MEMORY_DB_PATH = os.getenv("GENIUS_TRANSLATION_MEMORY_DB_PATH", os.path.join(DATA_DIR, "translation_memory.db"))
+TRANSLATION_MEMORY_FUZZY_THRESHOLD = _env_float("GENIUS_TRANSLATION_MEMORY_FUZZY_THRESHOLD", 0.8)
+TRANSLATION_MEMORY_MAX_ENTRIES = _env_int("GENIUS_TRANSLATION_MEMORY_MAX_ENTRIES", 200000)
+# Token budget for the unmatched segments sent upstream in one request
+TRANSLATION_MEMORY_BATCH_TOKENS = _env_int("GENIUS_TRANSLATION_MEMORY_BATCH_TOKENS", 800)
+
+# Near-duplicate cache for prompt generation and joke explanations
+NEAR_DUPLICATE_CACHE_ENABLED = _env_bool("GENIUS_NEAR_DUPLICATE_CACHE_ENABLED", False)
+# Minimum trigram similarity of two normalized requests for one to reuse the other's response
+NEAR_DUPLICATE_CACHE_THRESHOLD = _env_float("GENIUS_NEAR_DUPLICATE_CACHE_THRESHOLD", 0.9)
+NEAR_DUPLICATE_CACHE_MAX_ENTRIES = _env_int("GENIUS_NEAR_DUPLICATE_CACHE_MAX_ENTRIES", 2048)
+NEAR_DUPLICATE_CACHE_TTL_SECONDS = _env_float("GENIUS_NEAR_DUPLICATE_CACHE_TTL_SECONDS", 86400.0)
+# "lru" evicts the least recently used entry, "lfu" the least often reused one
+NEAR_DUPLICATE_CACHE_EVICTION = os.getenv("GENIUS_NEAR_DUPLICATE_CACHE_EVICTION", "lru")
+
+# Stored explanations of the pyjokes corpus
+JOKE_STORE_ENABLED = _env_bool("GENIUS_JOKE_STORE_ENABLED", True)
+JOKE_STORE_DB_PATH = os.getenv("GENIUS_JOKE_STORE_DB_PATH", os.path.join(DATA_DIR, "joke_explanations.db"))
+# Completion budget of stored explanations, independent of the client's max_tokens since they
+# are served to every user of the model
+JOKE_STORE_MAX_TOKENS = _env_int("GENIUS_JOKE_STORE_MAX_TOKENS", 500)
+# Explaining the whole corpus costs tokens on the user's API key, so it is opt-in
+JOKE_WARMUP_ENABLED = _env_bool("GENIUS_JOKE_WARMUP_ENABLED", False)
+JOKE_WARMUP_CONCURRENCY = _env_int("GENIUS_JOKE_WARMUP_CONCURRENCY", 4)
+
+# Background translation jobs (/translate/jobs)
+JOBS_DB_PATH = os.getenv("GENIUS_JOBS_DB_PATH", os.path.join(DATA_DIR, "translation_jobs.db"))
+JOBS_CONCURRENCY = _env_int("GENIUS_JOBS_CONCURRENCY", 2)
+# A claimed job whose worker made no progress for this long is picked up again
+JOBS_LEASE_SECONDS = _env_float("GENIUS_JOBS_LEASE_SECONDS", 300.0)
+JOBS_POLL_SECONDS = _env_float("GENIUS_JOBS_POLL_SECONDS", 2.0)
+JOBS_RETENTION_SECONDS = _env_float("GENIUS_JOBS_RETENTION_SECONDS", 7 * 24 * 3600.0)
+
+# Model routing for clients created with model "auto"
+ROUTER_ENABLED = _env_bool("GENIUS_ROUTER_ENABLED", True)
+# Policy file; the bundled src/config/model_routing.yml is used when unset
+ROUTER_POLICY_PATH = os.getenv("GENIUS_ROUTER_POLICY_PATH")
+ROUTER_LATENCY_ALPHA = _env_float("GENIUS_ROUTER_LATENCY_ALPHA", 0.2)
+ROUTER_ERROR_THRESHOLD = _env_float("GENIUS_ROUTER_ERROR_THRESHOLD", 0.5)
+ROUTER_FAILURE_THRESHOLD = _env_int("GENIUS_ROUTER_FAILURE_THRESHOLD", 3)
+ROUTER_COOLDOWN_SECONDS = _env_float("GENIUS_ROUTER_COOLDOWN_SECONDS", 30.0)
+ROUTER_MAX_QUEUE_DEPTH = _env_int("GENIUS_ROUTER_MAX_QUEUE_DEPTH", 16)
+
+# Hedging: duplicate requests that are slower than most recent ones to cut tail latency
+HEDGING_ENABLED = _env_bool("GENIUS_HEDGING_ENABLED", False)
+# Percentile of recent latencies after which a pending request is hedged
+HEDGING_PERCENTILE = _env_float("GENIUS_HEDGING_PERCENTILE", 95.0)
+HEDGING_MIN_DELAY_SECONDS = _env_float("GENIUS_HEDGING_MIN_DELAY_SECONDS", 0.5)
+# Hedged requests allowed per request, bounding the extra spend
+HEDGING_MAX_RATIO = _env_float("GENIUS_HEDGING_MAX_RATIO", 0.05)
+HEDGING_WINDOW = _env_int("GENIUS_HEDGING_WINDOW", 200)
+HEDGING_MIN_SAMPLES = _env_int("GENIUS_HEDGING_MIN_SAMPLES", 20)
+HEDGING_MAX_WORKERS = _env_int("GENIUS_HEDGING_MAX_WORKERS", 64)
+
+# OpenAI Batch API backend for offline bulk work
+BATCH_API_POLL_SECONDS = _env_float("GENIUS_BATCH_API_POLL_SECONDS", 30.0)
+BATCH_API_COMPLETION_WINDOW = os.getenv("GENIUS_BATCH_API_COMPLETION_WINDOW", "24h")
+# Requests per submitted batch; the API accepts at most 50000
+BATCH_API_MAX_REQUESTS = _env_int("GENIUS_BATCH_API_MAX_REQUESTS", 50000)
+
+# Multi-target translation (/translate/multi)
+MULTI_TARGET_MAX_LANGUAGES = _env_int("GENIUS_MULTI_TARGET_MAX_LANGUAGES", 20)
@@ -1,6 +1,9 @@
 import streamlit as st
 import logging
 
+from src.services.chat_history import ChatHistoryManager
+from src.utils.log_sanitizer import loggable_text
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -19,15 +22,18 @@ def chat_app(client):
         st.session_state.messages = []
         logger.info("Session state for messages initialized.")
 
+    # Keep the context sent to OpenAI within the token budget as the conversation grows
+    if "history_manager" not in st.session_state:
+        st.session_state.history_manager = ChatHistoryManager()
+
     # Display chat messages from the session state
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
-        logger.info(f"Displayed {message['role']} message: {message['content']}")
 
     # Handle user input and interaction
     if prompt := st.chat_input("Ask something..."):
-        logger.info(f"User input received: {prompt}")
+        logger.info(f"User input received: {loggable_text(prompt)}")
 
         # Store user message in session state
         st.session_state.messages.append({"role": "user", "content": prompt})
@@ -42,11 +48,18 @@ def chat_app(client):
         with st.chat_message("assistant"):
             message_placeholder = st.empty()  # Placeholder for AI response
             try:
-                # Get AI's response from the OpenAI client
-                full_response, tokens_used = client.get_chat_completion(st.session_state.messages)
-                message_placeholder.markdown(full_response)  # Display the AI response
+                # Stream AI's response from the OpenAI client, rendering it as it arrives
+                full_response = ""
+                tokens_used = None
+                context = st.session_state.history_manager.build_context(st.session_state.messages, client)
+                for delta, usage in client.stream_chat_completion(context):
+                    full_response += delta
+                    if usage is not None:
+                        tokens_used = usage
+                    message_placeholder.markdown(full_response + "▌")
+                message_placeholder.markdown(full_response)  # Display the final AI response
                 st.caption(f"Tokens used: {tokens_used}")  # Display token usage
-                logger.info(f"AI response received: {full_response}, Tokens used: {tokens_used}")
+                logger.info(f"AI response received: {loggable_text(full_response)}, Tokens used: {tokens_used}")
             except Exception as e:
                 # Handle API call errors gracefully
                 st.error(f"Error while communicating with OpenAI: {e}")
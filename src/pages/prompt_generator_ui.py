@@ -2,6 +2,7 @@ import streamlit as st
 import logging
 from src.services.openai_client import OpenAIGeniusClient
 from src.services.prompt_generator_service import PromptGenerator
+from src.utils.log_sanitizer import loggable_text
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -14,7 +15,7 @@ def prompt_generator_ui(client: OpenAIGeniusClient):
     # User input: Context
     context = st.text_area("Context", height=30)
     if context:
-        logger.info(f"User input - Context: {context[:50]}...")  # Log truncated input
+        logger.info(f"User input - Context: {loggable_text(context)}")
 
     # Tone options with descriptions
     tone_options = {
@@ -48,7 +49,7 @@ def prompt_generator_ui(client: OpenAIGeniusClient):
     # User input: Constraints
     constraints = st.text_area("Constraints", height=30)
     if constraints:
-        logger.info(f"User input - Constraints: {constraints[:50]}...")
+        logger.info(f"User input - Constraints: {loggable_text(constraints)}")
 
     # Generate prompt button
     if st.button("Generate Prompt"):
@@ -64,7 +65,7 @@ def prompt_generator_ui(client: OpenAIGeniusClient):
                 # Display generated prompt
                 st.text_area("Generated Prompt", generated_prompt, height=500)
                 st.caption(f"Tokens used: {tokens_used}")
-                logger.info(f"Generated Prompt: {generated_prompt[:50]}... (truncated)")
+                logger.info(f"Generated Prompt: {loggable_text(generated_prompt)}")
                 logger.info(f"Tokens used: {tokens_used}")
             except Exception as e:
                 logger.error(f"Error during prompt generation: {str(e)}", exc_info=True)
@@ -0,0 +1,66 @@
+import importlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# App modes shown in the sidebar, mapped to the module and function rendering them.
+# Modules are imported on first selection, so each page's dependencies only load when used.
+PAGES: Dict[str, Tuple[str, str]] = {
+    "Chat": ("src.pages.chat_ui", "chat_app"),
+    "Text Translator": ("src.pages.text_translator_ui", "text_translator_ui"),
+    "Prompt Engineering Assistant": ("src.pages.prompt_generator_ui", "prompt_generator_ui"),
+    "Tell me a joke": ("src.pages.tell_joke_ui", "tell_joke_ui"),
+}
+
+_loaded: Dict[str, Callable] = {}
+_import_times: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def get_page_names() -> List[str]:
+    """
+    Returns the app modes in display order.
+    """
+    return list(PAGES)
+
+
+def load_page(name: str) -> Callable:
+    """
+    Returns the render function of a page, importing its module on first use.
+
+    Args:
+        name (str): The app mode, as listed by `get_page_names`.
+
+    Returns:
+        callable: The page function, taking the OpenAI client.
+
+    Raises:
+        KeyError: If no page is registered under `name`.
+    """
+    page = _loaded.get(name)
+    if page is not None:
+        return page
+
+    module_name, function_name = PAGES[name]
+    with _lock:
+        page = _loaded.get(name)
+        if page is None:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            page = getattr(module, function_name)
+            _import_times[name] = time.perf_counter() - start
+            _loaded[name] = page
+            logger.info(f"Loaded page '{name}' from {module_name} in {_import_times[name] * 1000:.1f} ms.")
+    return page
+
+
+def get_import_times() -> Dict[str, float]:
+    """
+    Returns how long loading each page took, in seconds, for pages loaded so far.
+    """
+    with _lock:
+        return dict(_import_times)
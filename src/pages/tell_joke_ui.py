@@ -1,6 +1,7 @@
 import logging
 import streamlit as st
 
+from src.config import settings
 from src.services.joke_service import Joker
 from src.services.openai_client import OpenAIGeniusClient
 
@@ -14,6 +15,10 @@ def tell_joke_ui(client: OpenAIGeniusClient):
     # Initialize the joke service once
     if 'joke_service' not in st.session_state:
         st.session_state.joke_service = Joker(client)
+        if settings.JOKE_WARMUP_ENABLED:
+            # Explains the whole corpus in the background so later clicks are lookups
+            from src.services.joke_warmup import start_joke_warmup
+            start_joke_warmup(client)
 
     joke_service = st.session_state.joke_service
     joke = st.session_state.get('joke', '')
@@ -2,6 +2,7 @@ import streamlit as st
 import logging
 from src.services.openai_client import OpenAIGeniusClient
 from src.services.text_translator_service import TextTranslator
+from src.utils.log_sanitizer import loggable_text
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ def text_translator_ui(client: "OpenAIGeniusClient"):
 
     # User input for the text to be translated
     text_to_translate = st.text_area("Enter text to translate", height=150)
-    logger.info(f"Text to translate entered: {text_to_translate[:50]}...")  # Log only first 50 characters
+    logger.info(f"Text to translate entered: {loggable_text(text_to_translate)}")
 
     # Only enable translation if text is provided and source/target languages differ
     if st.button("Translate", disabled=not text_to_translate or source_lang == target_lang):
@@ -54,7 +55,7 @@ def text_translator_ui(client: "OpenAIGeniusClient"):
                     # Display results
                     st.text_area("Translation", translation, height=150)
                     st.caption(f"Tokens used: {tokens_used}")
-                    logger.info(f"Translation result: {translation[:50]}... (truncated)")
+                    logger.info(f"Translation result: {loggable_text(translation)}")
                     logger.info(f"Tokens used: {tokens_used}")
                 except Exception as e:
                     logger.error(f"Error during translation: {str(e)}", exc_info=True)
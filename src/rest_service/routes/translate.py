@@ -1,12 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_restx import Api, Resource, fields
+import asyncio
+import json
 import logging
-from src.services.openai_client import OpenAIGeniusClient
+from src.config import settings
+from src.services.async_openai_client import AsyncOpenAIGeniusClient
+from src.services.batch_translator_service import BatchTranslator
+from src.services.document_translator_service import DocumentTranslator
+from src.services.memory_translator_service import MemoryTranslator
+from src.services.model_router import AUTO_MODEL, AsyncRoutedClient, get_client
+from src.services.multi_target_translator_service import MultiTargetTranslator
+from src.services.openai_client import is_error_response
 from src.services.text_translator_service import TextTranslator
+from src.services.token_usage import TokenUsage
+from src.services.translation_jobs import SUCCEEDED, get_translation_job_queue
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Completion settings used by the translation endpoints; "auto" picks the model per request
+TRANSLATE_MODEL = AUTO_MODEL if settings.ROUTER_ENABLED else "gpt-3.5-turbo"
+TRANSLATE_TEMPERATURE = 0.7
+TRANSLATE_MAX_TOKENS = 1000
+
 # Define the Blueprint for the translation endpoints
 translate_bp = Blueprint('translate', __name__)
 
@@ -36,6 +52,106 @@ translate_model = api.model('Translate', {
     'text': fields.String(required=True, description='Text to translate')
 })
 
+usage_model = api.model('TokenUsage', {
+    'prompt_tokens': fields.Integer(description='Tokens in the prompt'),
+    'completion_tokens': fields.Integer(description='Tokens generated in the completion'),
+    'cached_tokens': fields.Integer(description='Prompt tokens served from the OpenAI prompt cache'),
+    'total_tokens': fields.Integer(description='Total number of tokens used')
+})
+
+leverage_model = api.model('TranslationLeverage', {
+    'segments': fields.Integer(description='Number of sentences in the text'),
+    'exact': fields.Integer(description='Sentences reused from the translation memory'),
+    'fuzzy': fields.Integer(description='Sentences translated with a similar memory entry as reference'),
+    'new': fields.Integer(description='Sentences without a memory match'),
+    'leverage_percent': fields.Float(description='Share of words reused from the translation memory'),
+    'fuzzy_percent': fields.Float(description='Share of words in sentences with a fuzzy match')
+})
+
+document_translate_model = api.inherit('TranslateDocument', translate_model, {
+    'stream': fields.Boolean(required=False, default=False,
+                             description='Stream translated segments as Server-Sent Events as they complete')
+})
+
+multi_translate_model = api.model('TranslateMulti', {
+    'source_lang': fields.String(required=True, description='Source language of the text'),
+    'target_langs': fields.List(fields.String, required=True, description='Target languages for the translation'),
+    'text': fields.String(required=True, description='Text to translate')
+})
+
+batch_translate_model = api.model('TranslateBatch', {
+    'items': fields.List(fields.Nested(translate_model), required=True, description='Items to translate'),
+    'concurrency': fields.Integer(required=False, description='Maximum number of translations in flight at once')
+})
+
+batch_result_model = api.model('TranslationBatchResult', {
+    'index': fields.Integer(description='Position of the item in the request'),
+    'translation': fields.String(description='Translated text, null if the item failed'),
+    'tokens_used': fields.Integer(description='Number of tokens used for the item'),
+    'usage': fields.Nested(usage_model, description='Token usage breakdown for the item'),
+    'error': fields.String(description='Error message, null if the item succeeded')
+})
+
+
+async def _translate_batch(api_key: str, batch: BatchTranslator):
+    """
+    Runs a batch translation on a dedicated async client and closes it afterwards.
+    """
+    if TRANSLATE_MODEL == AUTO_MODEL:
+        client = AsyncRoutedClient(api_key, temperature=TRANSLATE_TEMPERATURE, max_tokens=TRANSLATE_MAX_TOKENS)
+    else:
+        client = AsyncOpenAIGeniusClient(api_key, model=TRANSLATE_MODEL, temperature=TRANSLATE_TEMPERATURE,
+                                         max_tokens=TRANSLATE_MAX_TOKENS)
+    try:
+        return await batch.aexecute(client)
+    finally:
+        await client.close()
+
+
+job_model = api.model('TranslationJob', {
+    'job_id': fields.String(description='Identifier of the job'),
+    'status': fields.String(description='queued, running, succeeded or failed'),
+    'segments_total': fields.Integer(description='Segments the text was split into, null until the job starts'),
+    'segments_done': fields.Integer(description='Segments translated so far'),
+    'progress': fields.Float(description='Share of segments translated, from 0 to 1'),
+    'translation': fields.String(description='Translated text, once the job succeeded'),
+    'tokens_used': fields.Integer(description='Number of tokens used, once the job succeeded'),
+    'usage': fields.Nested(usage_model, description='Token usage breakdown, once the job succeeded'),
+    'error': fields.String(description='Error message, if the job failed'),
+    'created_at': fields.Float(description='Submission time, as a Unix timestamp'),
+    'updated_at': fields.Float(description='Time of the last change, as a Unix timestamp')
+})
+
+
+def _job_response(job: dict) -> dict:
+    """
+    Formats a job from the job store for the API.
+    """
+    total = job["segments_total"]
+    response = {
+        "job_id": job["id"],
+        "status": job["status"],
+        "segments_total": total,
+        "segments_done": job["segments_done"],
+        "progress": round(job["segments_done"] / total, 3) if total else 0.0,
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+    if job["status"] == SUCCEEDED:
+        response.update({"translation": job["translation"], "tokens_used": job["usage"].total_tokens,
+                         "usage": job["usage"].to_dict()})
+    return response
+
+
+def _sse_event(data: dict, event: str = None) -> str:
+    """
+    Formats a Server-Sent Events message with a JSON payload.
+    """
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 # Define the resource for translation
 @api.route('/translate')
 class TranslateText(Resource):
@@ -44,7 +160,9 @@ class TranslateText(Resource):
     @api.header('Authorization', 'API key for OpenAI', required=True)
     @api.response(200, 'Translation successful', model=api.model('TranslationResponse', {
         'translation': fields.String(description='Translated text'),
-        'tokens_used': fields.Integer(description='Number of tokens used')
+        'tokens_used': fields.Integer(description='Number of tokens used'),
+        'usage': fields.Nested(usage_model, description='Token usage breakdown'),
+        'leverage': fields.Nested(leverage_model, description='Translation memory reuse, when the memory is enabled')
     }))
     @api.response(400, 'Bad Request')
     @api.response(401, 'Unauthorized')
@@ -53,6 +171,9 @@ class TranslateText(Resource):
         """
         Translates text from one language to another using OpenAI.
 
+        When the translation memory is enabled, sentences translated before are reused and
+        only the others are sent to OpenAI; the response then reports the `leverage`.
+
         Expects the 'Authorization' header with the API key.
         """
         try:
@@ -73,21 +194,381 @@ class TranslateText(Resource):
                 logger.error("Missing fields: source_lang, target_lang, and text are required.")
                 return jsonify({"error": "source_lang, target_lang, and text are required"}), 400
 
-            # Initialize OpenAIGeniusClient with the API key
-            client = OpenAIGeniusClient(api_key, model="gpt-3.5-turbo", temperature=0.7, max_tokens=1000)
+            # Reuse the pooled clients for this API key, routed per request when the model is "auto"
+            client = get_client(api_key, model=TRANSLATE_MODEL, temperature=TRANSLATE_TEMPERATURE,
+                                max_tokens=TRANSLATE_MAX_TOKENS)
 
-            # Create TextTranslator instance
-            translator = TextTranslator(source_lang, target_lang, text)
+            # Create the translator, going through the translation memory when it is enabled
+            if settings.TRANSLATION_MEMORY_ENABLED:
+                translator = MemoryTranslator(source_lang, target_lang, text)
+            else:
+                translator = TextTranslator(source_lang, target_lang, text)
 
             # Perform translation
-            translation, tokens_used = translator.execute(client)
+            translation, usage = translator.execute(client)
 
-            logger.info(f"Translation successful. Tokens used: {tokens_used}")
-            return {
+            logger.info(f"Translation successful. Tokens used: {usage}")
+            response = {
                 "translation": translation,
-                "tokens_used": tokens_used
-            }, 200
+                "tokens_used": usage.total_tokens,
+                "usage": usage.to_dict()
+            }
+            if isinstance(translator, MemoryTranslator):
+                response["leverage"] = translator.leverage
+            return response, 200
 
+        except ValueError as e:
+            # Invalid input, including prompts that do not fit in the model's context window
+            logger.error(f"Invalid translation request: {str(e)}")
+            return {"error": str(e)}, 400
         except Exception as e:
             logger.error(f"Error during translation: {str(e)}", exc_info=True)
             return {"error": str(e)}, 500
+
+
+@api.route('/translate/multi')
+class TranslateMulti(Resource):
+    @api.doc('translate_multi')
+    @api.expect(multi_translate_model, validate=True)
+    @api.header('Authorization', 'API key for OpenAI', required=True)
+    @api.response(200, 'Translation successful', model=api.model('TranslationMultiResponse', {
+        'translations': fields.Raw(description='Translated text per target language, null for failed languages'),
+        'errors': fields.Raw(description='Error message per target language that could not be translated'),
+        'fallback_languages': fields.List(fields.String,
+                                          description='Languages translated with a separate request'),
+        'tokens_used': fields.Integer(description='Number of tokens used'),
+        'usage': fields.Nested(usage_model, description='Token usage breakdown')
+    }))
+    @api.response(400, 'Bad Request')
+    @api.response(401, 'Unauthorized')
+    @api.response(500, 'Internal Server Error')
+    def post(self):
+        """
+        Translates text into several languages with a single OpenAI request.
+
+        All target languages are requested together as JSON; languages missing from the
+        response are translated separately and listed in `fallback_languages`.
+
+        Expects the 'Authorization' header with the API key.
+        """
+        try:
+            api_key = request.headers.get("Authorization")
+
+            if not api_key:
+                logger.error("API key missing in Authorization header.")
+                return {"error": "API key is required"}, 401
+
+            data = request.get_json()
+            client = get_client(api_key, model=TRANSLATE_MODEL, temperature=TRANSLATE_TEMPERATURE,
+                                max_tokens=TRANSLATE_MAX_TOKENS)
+            translator = MultiTargetTranslator(data.get("source_lang"), data.get("target_langs"), data.get("text"))
+            translations, usage = translator.execute(client)
+
+            logger.info(f"Multi-target translation successful. Tokens used: {usage}")
+            return {
+                "translations": translations,
+                "errors": translator.errors,
+                "fallback_languages": translator.fallback_languages,
+                "tokens_used": usage.total_tokens,
+                "usage": usage.to_dict()
+            }, 200
+
+        except ValueError as e:
+            logger.error(f"Invalid multi-target translation request: {str(e)}")
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error(f"Error during multi-target translation: {str(e)}", exc_info=True)
+            return {"error": str(e)}, 500
+
+
+@api.route('/translate/batch')
+class TranslateBatch(Resource):
+    @api.doc('translate_batch')
+    @api.expect(batch_translate_model, validate=True)
+    @api.header('Authorization', 'API key for OpenAI', required=True)
+    @api.response(200, 'Batch processed', model=api.model('TranslationBatchResponse', {
+        'results': fields.List(fields.Nested(batch_result_model), description='Per-item results in input order'),
+        'tokens_used': fields.Integer(description='Total number of tokens used'),
+        'usage': fields.Nested(usage_model, description='Aggregate token usage breakdown'),
+        'failed': fields.Integer(description='Number of items that failed')
+    }))
+    @api.response(400, 'Bad Request')
+    @api.response(401, 'Unauthorized')
+    @api.response(500, 'Internal Server Error')
+    def post(self):
+        """
+        Translates a list of texts concurrently using OpenAI.
+
+        Items are processed with at most `concurrency` requests in flight. Results keep the
+        input order, and failing items report an error without failing the batch.
+        """
+        try:
+            api_key = request.headers.get("Authorization")
+
+            if not api_key:
+                logger.error("API key missing in Authorization header.")
+                return {"error": "API key is required"}, 401
+
+            data = request.get_json()
+            items = data.get("items") or []
+            concurrency = data.get("concurrency") or settings.BATCH_DEFAULT_CONCURRENCY
+
+            if not items:
+                logger.error("Batch request without items.")
+                return {"error": "items must be a non-empty list"}, 400
+            if len(items) > settings.BATCH_MAX_ITEMS:
+                logger.error(f"Batch request with {len(items)} items exceeds the limit.")
+                return {"error": f"A batch may contain at most {settings.BATCH_MAX_ITEMS} items"}, 400
+
+            concurrency = max(1, min(concurrency, settings.BATCH_MAX_CONCURRENCY))
+            batch = BatchTranslator(items, concurrency)
+            results, usage = asyncio.run(_translate_batch(api_key, batch))
+
+            failed = sum(1 for result in results if result["error"])
+            logger.info(f"Batch translation finished. Items: {len(results)}, failed: {failed}, "
+                        f"tokens used: {usage}")
+            return {
+                "results": [
+                    {
+                        "index": result["index"],
+                        "translation": result["translation"],
+                        "tokens_used": result["usage"].total_tokens,
+                        "usage": result["usage"].to_dict(),
+                        "error": result["error"]
+                    }
+                    for result in results
+                ],
+                "tokens_used": usage.total_tokens,
+                "usage": usage.to_dict(),
+                "failed": failed
+            }, 200
+
+        except Exception as e:
+            logger.error(f"Error during batch translation: {str(e)}", exc_info=True)
+            return {"error": str(e)}, 500
+
+
+@api.route('/translate/stream')
+class TranslateTextStream(Resource):
+    @api.doc('translate_text_stream')
+    @api.expect(translate_model, validate=True)
+    @api.header('Authorization', 'API key for OpenAI', required=True)
+    @api.produces(['text/event-stream'])
+    @api.response(200, 'Server-Sent Events stream: `data` events carry a `delta`, a final `done` event '
+                       'carries `tokens_used` and `usage`, an `error` event reports failures')
+    @api.response(400, 'Bad Request')
+    @api.response(401, 'Unauthorized')
+    @api.response(500, 'Internal Server Error')
+    def post(self):
+        """
+        Translates text and streams the translation as Server-Sent Events while it is generated.
+
+        Expects the 'Authorization' header with the API key.
+        """
+        try:
+            api_key = request.headers.get("Authorization")
+
+            if not api_key:
+                logger.error("API key missing in Authorization header.")
+                return {"error": "API key is required"}, 401
+
+            data = request.get_json()
+            source_lang = data.get("source_lang")
+            target_lang = data.get("target_lang")
+            text = data.get("text")
+
+            if not source_lang or not target_lang or not text:
+                logger.error("Missing fields: source_lang, target_lang, and text are required.")
+                return {"error": "source_lang, target_lang, and text are required"}, 400
+
+            client = get_client(api_key, model=TRANSLATE_MODEL, temperature=TRANSLATE_TEMPERATURE,
+                                max_tokens=TRANSLATE_MAX_TOKENS)
+            translator = TextTranslator(source_lang, target_lang, text)
+            try:
+                stream = translator.stream(client)
+            except ValueError as e:
+                logger.error(f"Invalid streaming translation request: {e}")
+                return {"error": str(e)}, 400
+
+            def generate():
+                try:
+                    for delta, usage in stream:
+                        if usage is None:
+                            yield _sse_event({"delta": delta})
+                        else:
+                            logger.info(f"Streaming translation successful. Tokens used: {usage}")
+                            yield _sse_event({"tokens_used": usage.total_tokens, "usage": usage.to_dict()},
+                                             event="done")
+                except Exception as e:
+                    logger.error(f"Error during streaming translation: {str(e)}", exc_info=True)
+                    yield _sse_event({"error": str(e)}, event="error")
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        except Exception as e:
+            logger.error(f"Error during streaming translation: {str(e)}", exc_info=True)
+            return {"error": str(e)}, 500
+
+
+@api.route('/translate/document')
+class TranslateDocument(Resource):
+    @api.doc('translate_document')
+    @api.expect(document_translate_model, validate=True)
+    @api.header('Authorization', 'API key for OpenAI', required=True)
+    @api.response(200, 'Translation successful', model=api.model('DocumentTranslationResponse', {
+        'translation': fields.String(description='Translated document'),
+        'tokens_used': fields.Integer(description='Number of tokens used'),
+        'usage': fields.Nested(usage_model, description='Token usage breakdown'),
+        'segments': fields.Integer(description='Number of segments the document was split into')
+    }))
+    @api.response(400, 'Bad Request')
+    @api.response(401, 'Unauthorized')
+    @api.response(500, 'Internal Server Error')
+    @api.response(502, 'A segment could not be translated')
+    def post(self):
+        """
+        Translates a long document by splitting it into segments translated in parallel.
+
+        With `stream` set, the response is a Server-Sent Events stream of `segment` events in
+        document order, followed by a `done` event with the total `tokens_used`. If a segment
+        cannot be translated, the stream ends with an `error` event naming the segment.
+        """
+        try:
+            api_key = request.headers.get("Authorization")
+
+            if not api_key:
+                logger.error("API key missing in Authorization header.")
+                return {"error": "API key is required"}, 401
+
+            data = request.get_json()
+            try:
+                translator = DocumentTranslator(data.get("source_lang"), data.get("target_lang"), data.get("text"))
+            except ValueError as e:
+                logger.error(f"Invalid document translation request: {e}")
+                return {"error": str(e)}, 400
+
+            client = get_client(api_key, model=TRANSLATE_MODEL, temperature=TRANSLATE_TEMPERATURE,
+                                max_tokens=TRANSLATE_MAX_TOKENS)
+
+            if not data.get("stream"):
+                translation, usage = translator.execute(client)
+                if translator.failed_segments:
+                    return {
+                        "error": translation,
+                        "failed_segments": sorted(translator.failed_segments),
+                        "tokens_used": usage.total_tokens
+                    }, 502
+                logger.info(f"Document translation successful. Segments: {len(translator.segments)}, "
+                            f"tokens used: {usage}")
+                return {
+                    "translation": translation,
+                    "tokens_used": usage.total_tokens,
+                    "usage": usage.to_dict(),
+                    "segments": len(translator.segments)
+                }, 200
+
+            def generate():
+                total_usage = TokenUsage()
+                try:
+                    for index, translation, usage in translator.iter_segments(client):
+                        total_usage += usage
+                        if is_error_response(translation.strip()):
+                            logger.warning(f"Streaming document translation failed on segment {index}.")
+                            yield _sse_event({"index": index, "error": translation.strip()}, event="error")
+                            return
+                        yield _sse_event({"index": index, "translation": translation,
+                                          "tokens_used": usage.total_tokens}, event="segment")
+                    yield _sse_event({"tokens_used": total_usage.total_tokens, "usage": total_usage.to_dict(),
+                                      "segments": len(translator.segments)}, event="done")
+                except Exception as e:
+                    logger.error(f"Error during streaming document translation: {str(e)}", exc_info=True)
+                    yield _sse_event({"error": str(e)}, event="error")
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        except Exception as e:
+            logger.error(f"Error during document translation: {str(e)}", exc_info=True)
+            return {"error": str(e)}, 500
+
+
+@api.route('/translate/jobs')
+class TranslationJobs(Resource):
+    @api.doc('submit_translation_job')
+    @api.expect(translate_model, validate=True)
+    @api.header('Authorization', 'API key for OpenAI', required=True)
+    @api.response(202, 'Job queued', model=api.model('TranslationJobAccepted', {
+        'job_id': fields.String(description='Identifier of the job'),
+        'status': fields.String(description='Always queued'),
+        'status_url': fields.String(description='Where to poll the job')
+    }))
+    @api.response(400, 'Bad Request')
+    @api.response(401, 'Unauthorized')
+    @api.response(500, 'Internal Server Error')
+    def post(self):
+        """
+        Queues a translation and returns immediately with a job id.
+
+        The text is translated in the background like `/translate/document`; poll
+        `GET /translate/jobs/<job_id>` with the same API key for progress and the result.
+        """
+        try:
+            api_key = request.headers.get("Authorization")
+
+            if not api_key:
+                logger.error("API key missing in Authorization header.")
+                return {"error": "API key is required"}, 401
+
+            data = request.get_json()
+            try:
+                job_id = get_translation_job_queue().submit(
+                    api_key, data.get("source_lang"), data.get("target_lang"), data.get("text"),
+                    model=TRANSLATE_MODEL, temperature=TRANSLATE_TEMPERATURE, max_tokens=TRANSLATE_MAX_TOKENS
+                )
+            except ValueError as e:
+                logger.error(f"Invalid translation job: {e}")
+                return {"error": str(e)}, 400
+
+            return {"job_id": job_id, "status": "queued", "status_url": f"/translate/jobs/{job_id}"}, 202
+
+        except Exception as e:
+            logger.error(f"Error while queueing translation job: {str(e)}", exc_info=True)
+            return {"error": str(e)}, 500
+
+
+@api.route('/translate/jobs/<string:job_id>')
+class TranslationJob(Resource):
+    @api.doc('get_translation_job')
+    @api.header('Authorization', 'API key the job was submitted with', required=True)
+    @api.response(200, 'Job status', model=job_model)
+    @api.response(401, 'Unauthorized')
+    @api.response(404, 'Job not found')
+    @api.response(500, 'Internal Server Error')
+    def get(self, job_id):
+        """
+        Returns the status and progress of a translation job, and its result once it succeeded.
+
+        Jobs are only visible with the API key they were submitted with.
+        """
+        try:
+            api_key = request.headers.get("Authorization")
+
+            if not api_key:
+                logger.error("API key missing in Authorization header.")
+                return {"error": "API key is required"}, 401
+
+            job = get_translation_job_queue().get(job_id, api_key)
+            if job is None:
+                return {"error": "Job not found"}, 404
+            return _job_response(job), 200
+
+        except Exception as e:
+            logger.error(f"Error while reading translation job {job_id}: {str(e)}", exc_info=True)
+            return {"error": str(e)}, 500
@@ -0,0 +1,163 @@
+import time
+from openai import AsyncOpenAI
+from typing import List, Optional, Tuple
+
+from src.config import settings
+from src.services.metrics import QUEUE_DURATION, UPSTREAM_DURATION, UPSTREAM_ERRORS, UPSTREAM_TOKENS, record_tokens
+from src.services.openai_client import ERROR_RESPONSE_PREFIX, _GeniusClientBase, _create_messages
+from src.services.response_cache import ResponseCache
+from src.services.retry_policy import completion_retry
+from src.services.token_usage import TokenUsage
+from src.utils.log_sanitizer import loggable_messages, loggable_text
+from src.utils.token_counter import ContextWindowExceededError
+
+
+class AsyncOpenAIGeniusClient(_GeniusClientBase):
+    """
+    Asyncio counterpart of `OpenAIGeniusClient`, built on `openai.AsyncOpenAI`.
+
+    The public methods mirror the synchronous client but are coroutines, so many completions
+    can be awaited concurrently from a single event loop. An instance is bound to the event
+    loop it is first used on and should not be shared across loops.
+
+    Attributes:
+        model (str): The OpenAI model to be used for generating responses.
+        temperature (float): The temperature to control the randomness of the model's output.
+        max_tokens (int): The maximum number of tokens for the completion.
+        cache (ResponseCache | None): Cache for completion responses, None when caching is disabled.
+        hedging (HedgePolicy | None): Hedging of slow completions, None when hedging is disabled.
+    """
+
+    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int,
+                 cache: Optional[ResponseCache] = None, openai_client: Optional[AsyncOpenAI] = None):
+        """
+        Initializes the AsyncOpenAIGeniusClient with the given API key, model, temperature, and max_tokens.
+        """
+        if not api_key:
+            raise ValueError("API key is required")
+        super().__init__(api_key, model, temperature, max_tokens, cache)
+        self.client = openai_client if openai_client is not None else AsyncOpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES
+        )
+
+    @completion_retry
+    async def _create_completion(self, messages: List[dict], temperature: float, max_tokens: int,
+                                 prompt_tokens: int, **kwargs):
+        """
+        Sends one chat completion request, waiting for rate limiter capacity first.
+        Transient failures are retried according to `src.services.retry_policy`; within an
+        attempt, a slow request may be hedged according to `src.services.hedging`.
+        """
+        tokens = prompt_tokens + max_tokens
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            QUEUE_DURATION.observe(await rate_limiter.aacquire(tokens), model=self.model)
+        if self.hedging is None:
+            return await self._send(messages, temperature, max_tokens, **kwargs)
+        return await self.hedging.arun(lambda: self._send(messages, temperature, max_tokens, **kwargs),
+                                       admit=self._hedge_admission(tokens), on_discard=self._record_discarded)
+
+    async def _send(self, messages: List[dict], temperature: float, max_tokens: int, **kwargs):
+        """
+        Sends the request upstream.
+        """
+        start = time.perf_counter()
+        try:
+            return await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(model=self.model, error=type(e).__name__)
+            self._on_request_error(e)
+            raise
+        finally:
+            UPSTREAM_DURATION.observe(time.perf_counter() - start, model=self.model)
+
+    async def get_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                                  use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
+        """
+        Fetches chat completion results from OpenAI's API without blocking the event loop.
+
+        Args:
+            messages (list): A list of formatted message dictionaries.
+            temperature (float, optional): Temperature for controlling randomness. Defaults to class setting.
+            max_tokens (int, optional): Maximum tokens for the completion. Defaults to class setting.
+            use_cache (bool, optional): Set to False to bypass the response cache for this call.
+            response_format (dict, optional): Structured output format, e.g. {"type": "json_object"}.
+
+        Returns:
+            tuple: The generated content and its TokenUsage. Cache hits and responses shared with
+            an identical in-flight request report zero usage, and errors that persist after
+            retrying are returned as an error message.
+
+        Raises:
+            ContextWindowExceededError: If the prompt does not fit in the model's context window.
+        """
+        try:
+            return await self.fetch_chat_completion(messages, temperature, max_tokens, use_cache, response_format)
+        except ContextWindowExceededError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error during chat completion: {e}", exc_info=True)
+            return f"{ERROR_RESPONSE_PREFIX}{e}", TokenUsage()
+
+    async def fetch_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                                    use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
+        """
+        Like `get_chat_completion`, but errors that persist after retrying are raised instead
+        of being returned as an error message.
+        """
+        temperature, max_tokens, prompt_tokens = self._resolve_params(messages, temperature, max_tokens)
+
+        cache_key, cached = self._cache_lookup(messages, temperature, max_tokens, use_cache, response_format)
+        if cached is not None:
+            self.logger.info("Serving chat completion from cache.")
+            return cached[0], TokenUsage()
+        kwargs = {"response_format": response_format} if response_format is not None else {}
+
+        async def fetch() -> Tuple[str, TokenUsage]:
+            self.logger.info(f"Sending async request to OpenAI API with messages {loggable_messages(messages)}")
+            completion = await self._create_completion(messages, temperature, max_tokens, prompt_tokens, **kwargs)
+            usage = TokenUsage.from_completion(completion.usage)
+            record_tokens(UPSTREAM_TOKENS, usage, model=self.model)
+            self.logger.info(f"Received response from OpenAI API. Tokens used: {usage}")
+            content = completion.choices[0].message.content
+            self._cache_store(cache_key, content, usage)
+            return content, usage
+
+        if cache_key is None or self.single_flight is None:
+            return await fetch()
+        # Coalesce per API key, so a response is never shared with a caller using a different key
+        (content, usage), shared = await self.single_flight.ado((self.api_key_hash, cache_key), fetch)
+        # Only the request that went upstream reports the tokens it spent
+        return content, TokenUsage() if shared else usage
+
+    async def call_openai_api(self, system_msg: str, user_msg: str) -> Tuple[str, TokenUsage]:
+        """
+        Helper function to structure messages and call OpenAI's API.
+
+        Args:
+            system_msg (str): The system's instruction message.
+            user_msg (str): The user's input message.
+
+        Returns:
+            tuple: The generated content and its TokenUsage.
+        """
+        self.logger.info(
+            f"Preparing to call OpenAI API with system message {loggable_text(system_msg)} "
+            f"and user message {loggable_text(user_msg)}")
+
+        messages = _create_messages(system_msg, user_msg)
+        return await self.get_chat_completion(messages)
+
+    async def close(self):
+        """
+        Closes the underlying HTTP connection pool.
+        """
+        await self.client.close()
@@ -1,13 +1,60 @@
+import functools
+import inspect
 from typing import Tuple
 
+from src.services.metrics import observe_operation
+from src.services.routing_context import routing_context
+from src.services.token_usage import TokenUsage
+
+
+def _instrument(operation: str, method):
+    """
+    Wraps an `execute`/`aexecute` implementation so its duration, token usage and errors are
+    recorded under the operation's class name, and the model router knows which operation
+    (and language pair) its requests belong to.
+    """
+    if getattr(method, "_instrumented", False):
+        return method
+
+    def context(instance):
+        return routing_context(operation, getattr(instance, "source_lang", None),
+                               getattr(instance, "target_lang", None))
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            with context(self), observe_operation(operation) as record_result:
+                result = await method(self, *args, **kwargs)
+                record_result(result)
+                return result
+    else:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with context(self), observe_operation(operation) as record_result:
+                result = method(self, *args, **kwargs)
+                record_result(result)
+                return result
+
+    wrapper._instrumented = True
+    return wrapper
+
 
 class OpenAIOperation:
     """
     Abstract base class for operations using the OpenAI client.
     Each specific operation must implement this interface.
+
+    The `execute` and `aexecute` methods of subclasses are instrumented automatically;
+    see `src.services.metrics`.
     """
 
-    def execute(self, client, *args, **kwargs) -> Tuple[str, int]:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in ("execute", "aexecute"):
+            if name in cls.__dict__:
+                setattr(cls, name, _instrument(cls.__name__, cls.__dict__[name]))
+
+    def execute(self, client, *args, **kwargs) -> Tuple[str, TokenUsage]:
         """
         Executes the OpenAI operation.
 
@@ -17,6 +64,20 @@ class OpenAIOperation:
             **kwargs: Additional keyword arguments for the operation.
 
         Returns:
-            Tuple[str, int]: The result of the operation and the token usage.
+            Tuple[str, TokenUsage]: The result of the operation and the token usage.
         """
         raise NotImplementedError("Each operation must implement the `execute` method.")
+
+    async def aexecute(self, client, *args, **kwargs) -> Tuple[str, TokenUsage]:
+        """
+        Executes the OpenAI operation without blocking the event loop.
+
+        Args:
+            client: The `AsyncOpenAIGeniusClient` instance used to perform the operation.
+            *args: Additional arguments for the operation.
+            **kwargs: Additional keyword arguments for the operation.
+
+        Returns:
+            Tuple[str, TokenUsage]: The result of the operation and the token usage.
+        """
+        raise NotImplementedError("Each operation must implement the `aexecute` method.")
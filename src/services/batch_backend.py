@@ -0,0 +1,305 @@
+import json
+import logging
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from openai import OpenAI
+
+from src.config import settings
+from src.services.base_operation import OpenAIOperation
+from src.services.metrics import BATCH_API_REQUESTS, UPSTREAM_TOKENS, record_tokens
+from src.services.openai_client import ERROR_RESPONSE_PREFIX, _create_messages
+from src.services.response_cache import ResponseCache, get_default_cache, make_cache_key
+from src.services.token_usage import TokenUsage
+from src.utils.hashing import hash_api_key
+from src.utils.token_counter import plan_completion_budget
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which the batch no longer changes
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class _PendingRequest(BaseException):
+    """
+    Raised by `_BatchClient` for a request whose result is not known yet.
+
+    Derives from BaseException so that the `except Exception` handlers of operations and of
+    the operation instrumentation let it through instead of treating it as a failure.
+    """
+
+
+def _usage_from_dict(usage: Optional[dict]) -> TokenUsage:
+    if not usage:
+        return TokenUsage()
+    details = usage.get("prompt_tokens_details") or {}
+    return TokenUsage(prompt_tokens=usage.get("prompt_tokens") or 0,
+                      completion_tokens=usage.get("completion_tokens") or 0,
+                      cached_tokens=details.get("cached_tokens") or 0)
+
+
+class _BatchClient:
+    """
+    Stands in for `OpenAIGeniusClient` while operations run against a batch: known results
+    are returned, unknown requests are recorded and abort the operation with `_PendingRequest`.
+    """
+
+    def __init__(self, executor: "BatchExecutor", results: Dict[str, Tuple[str, TokenUsage]],
+                 pending: Dict[str, dict], claimed: set):
+        self.model = executor.model
+        self._api_key_hash = executor.api_key_hash
+        self.temperature = executor.temperature
+        self.max_tokens = executor.max_tokens
+        self.cache = executor.cache
+        self._results = results
+        self._pending = pending
+        self._claimed = claimed
+        self.consumed: List[str] = []
+
+    def get_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                            use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
+        """
+        Returns the batch result of a request, or records it for the next batch.
+
+        Raises:
+            ContextWindowExceededError: If the prompt does not fit in the model's context window.
+        """
+        temperature = temperature if temperature is not None else self.temperature
+        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+        _, max_tokens = plan_completion_budget(messages, self.model, max_tokens)
+        key = make_cache_key(self._api_key_hash, self.model, temperature, max_tokens, messages, response_format)
+
+        if key in self._results:
+            content, usage = self._results[key]
+            self.consumed.append(key)
+            # Identical requests of several operations share one batch line, billed once
+            return content, TokenUsage() if key in self._claimed else usage
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached[0], TokenUsage()
+
+        self._pending[key] = {"model": self.model, "messages": messages, "temperature": temperature,
+                              "max_tokens": max_tokens}
+        if response_format is not None:
+            self._pending[key]["response_format"] = response_format
+        raise _PendingRequest(key)
+
+    def call_openai_api(self, system_msg: str, user_msg: str) -> Tuple[str, TokenUsage]:
+        """
+        Helper function to structure messages and look up the batch result.
+        """
+        return self.get_chat_completion(_create_messages(system_msg, user_msg))
+
+    def call_openai_api_stream(self, system_msg: str, user_msg: str):
+        raise TypeError("Streaming is not available for batched operations")
+
+
+class BatchExecutor:
+    """
+    Runs `OpenAIOperation`s through the OpenAI Batch API instead of one request at a time.
+
+    Each operation is executed against a stand-in client that records the requests it makes.
+    The recorded requests are written to a JSONL input file, submitted as a batch and polled
+    until it finishes; the operations are then executed again with the batch results, so
+    their parsing and validation run unchanged. Operations that make further requests
+    depending on earlier results take one more batch round per step, up to `max_rounds`.
+
+    Requests that fail inside the batch are returned to the operation as error responses,
+    like `OpenAIGeniusClient.get_chat_completion` does after retries.
+
+    A batch can take up to its completion window to finish, so callers may persist the IDs
+    of submitted batches (see `run`) and pass them again after an interruption: batches
+    holding the requests are then polled again instead of being submitted and paid twice.
+    Custom IDs are derived from the request itself, so re-executing the same operations
+    maps them back to the same requests.
+
+    Attributes:
+        model (str): The model the requests are sent to.
+        temperature (float): The sampling temperature.
+        max_tokens (int): The completion token limit.
+        poll_seconds (float): Interval between batch status checks.
+        completion_window (str): Completion window requested for each batch.
+        max_rounds (int): Batches submitted at most for one call of `run`.
+    """
+
+    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int,
+                 cache: Optional[ResponseCache] = None, openai_client: Optional[OpenAI] = None,
+                 poll_seconds: float = None, max_rounds: int = 3):
+        """
+        Initializes the executor. When no cache is given, the process-wide default cache is
+        used to skip requests answered before and to store batch results.
+        """
+        if not api_key:
+            raise ValueError("API key is required")
+        self.model = model
+        self.api_key_hash = hash_api_key(api_key)
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.cache = cache if cache is not None else get_default_cache()
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.BATCH_API_POLL_SECONDS
+        self.completion_window = settings.BATCH_API_COMPLETION_WINDOW
+        self.max_rounds = max_rounds
+        self.client = openai_client if openai_client is not None else OpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES
+        )
+
+    def run(self, operations: List[OpenAIOperation], batches: Dict[str, List[str]] = None,
+            on_submit: Callable[[], None] = None) -> Tuple[List[dict], TokenUsage]:
+        """
+        Executes the operations through batches.
+
+        Args:
+            operations (list): The operations to execute.
+            batches (dict, optional): Custom IDs of batches submitted earlier for these
+                operations, by batch ID; their requests are not submitted again. Batches
+                submitted by this call are added to it.
+            on_submit (callable, optional): Called after each batch is submitted and added to
+                `batches`, e.g. to persist them before waiting for the results.
+
+        Returns:
+            Tuple[List[dict], TokenUsage]: One result per operation, in input order, with
+            `index`, `output`, `usage` and `error`, and the total token usage.
+        """
+        results: Dict[str, Tuple[str, TokenUsage]] = {}
+        claimed = set()
+        outcomes: List[Optional[dict]] = [None] * len(operations)
+        remaining = list(range(len(operations)))
+
+        # One more pass than there are batches, to execute the operations on the last results
+        for round_number in range(1, self.max_rounds + 2):
+            pending: Dict[str, dict] = {}
+            waiting = []
+            for index in remaining:
+                client = _BatchClient(self, results, pending, claimed)
+                try:
+                    output, usage = operations[index].execute(client)
+                except _PendingRequest:
+                    waiting.append(index)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Batched operation {index} failed: {e}")
+                    outcomes[index] = {"index": index, "output": None, "usage": TokenUsage(), "error": str(e)}
+                    continue
+                claimed.update(client.consumed)
+                outcomes[index] = {"index": index, "output": output, "usage": usage, "error": None}
+
+            remaining = waiting
+            if not remaining:
+                break
+            if round_number > self.max_rounds:
+                break
+            logger.info(f"Batch round {round_number}: {len(pending)} request(s) for {len(remaining)} operation(s).")
+            results.update(self.submit(pending, batches, on_submit))
+
+        for index in remaining:
+            outcomes[index] = {"index": index, "output": None, "usage": TokenUsage(),
+                               "error": f"Operation needed more than {self.max_rounds} batch rounds"}
+
+        total_usage = sum((outcome["usage"] for outcome in outcomes), TokenUsage())
+        failed = sum(1 for outcome in outcomes if outcome["error"])
+        logger.info(f"Batched execution completed: {len(outcomes) - failed} succeeded, {failed} failed, "
+                    f"tokens used: {total_usage}.")
+        return outcomes, total_usage
+
+    def submit(self, requests: Dict[str, dict], batches: Dict[str, List[str]] = None,
+               on_submit: Callable[[], None] = None) -> Dict[str, Tuple[str, TokenUsage]]:
+        """
+        Sends chat completion requests as batches and waits for their results.
+
+        Args:
+            requests (dict): Request bodies keyed by their custom ID.
+            batches (dict, optional): Custom IDs of batches submitted earlier, by batch ID;
+                requests they hold are collected from them instead of being submitted again.
+                New batches are added to it.
+            on_submit (callable, optional): Called after each new batch is added to `batches`.
+
+        Returns:
+            dict: The content and usage of each request, keyed by custom ID; failed requests
+            carry an error response.
+        """
+        batches = batches if batches is not None else {}
+        results = {}
+        remaining = dict(requests)
+        for batch_id, custom_ids in list(batches.items()):
+            attached = {key: remaining.pop(key) for key in custom_ids if key in remaining}
+            if attached:
+                logger.info(f"Waiting for earlier batch {batch_id} with {len(attached)} of the request(s).")
+                results.update(self._collect(self._wait(self.client.batches.retrieve(batch_id)), attached))
+
+        items = list(remaining.items())
+        for start in range(0, len(items), settings.BATCH_API_MAX_REQUESTS):
+            chunk = dict(items[start:start + settings.BATCH_API_MAX_REQUESTS])
+            batch = self._create_batch(chunk)
+            batches[batch.id] = list(chunk)
+            if on_submit is not None:
+                on_submit()
+            results.update(self._collect(self._wait(batch), chunk))
+        return results
+
+    def _create_batch(self, requests: Dict[str, dict]):
+        lines = "".join(
+            json.dumps({"custom_id": key, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+                       ensure_ascii=False) + "\n"
+            for key, body in requests.items()
+        )
+        input_file = self.client.files.create(
+            file=(f"genius-batch-{uuid.uuid4().hex[:8]}.jsonl", lines.encode("utf-8")), purpose="batch"
+        )
+        batch = self.client.batches.create(input_file_id=input_file.id, endpoint=BATCH_ENDPOINT,
+                                           completion_window=self.completion_window)
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} request(s).")
+        return batch
+
+    def _wait(self, batch):
+        while batch.status not in _TERMINAL_STATUSES:
+            time.sleep(self.poll_seconds)
+            batch = self.client.batches.retrieve(batch.id)
+        logger.info(f"Batch {batch.id} finished with status {batch.status}.")
+        return batch
+
+    def _collect(self, batch, requests: Dict[str, dict]) -> Dict[str, Tuple[str, TokenUsage]]:
+        """
+        Reads the results of a finished batch; requests without a result get an error response.
+        """
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                for line in self.client.files.content(file_id).text.splitlines():
+                    if line.strip():
+                        key, result = self._parse_result(json.loads(line))
+                        results[key] = result
+
+        missing = [key for key in requests if key not in results]
+        for key in missing:
+            results[key] = (f"{ERROR_RESPONSE_PREFIX}Batch {batch.id} ended with status {batch.status}", TokenUsage())
+        if missing:
+            BATCH_API_REQUESTS.inc(len(missing), model=self.model, result=batch.status)
+        return results
+
+    def _parse_result(self, record: dict) -> Tuple[str, Tuple[str, TokenUsage]]:
+        """
+        Turns one line of a batch output or error file into a request result.
+        """
+        key = record.get("custom_id")
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        if response.get("status_code") == 200 and body.get("choices"):
+            content = body["choices"][0]["message"]["content"]
+            usage = _usage_from_dict(body.get("usage"))
+            record_tokens(UPSTREAM_TOKENS, usage, model=self.model)
+            BATCH_API_REQUESTS.inc(model=self.model, result="completed")
+            if self.cache is not None:
+                self.cache.set(key, (content, usage.total_tokens))
+            return key, (content, usage)
+
+        error = record.get("error") or body.get("error") or {}
+        message = error.get("message") or f"status {response.get('status_code')}"
+        BATCH_API_REQUESTS.inc(model=self.model, result="failed")
+        return key, (f"{ERROR_RESPONSE_PREFIX}{message}", TokenUsage())
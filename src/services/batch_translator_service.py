@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import List, Tuple
+
+from src.services.openai_client import is_error_response
+from src.services.text_translator_service import TextTranslator
+from src.services.token_usage import TokenUsage
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class BatchTranslator:
+    """
+    Translates a list of items concurrently with a bounded number of in-flight requests.
+
+    Each item is a dictionary with `source_lang`, `target_lang` and `text`. Results are
+    returned in input order; a failing item is reported with its error instead of failing
+    the whole batch.
+    """
+
+    def __init__(self, items: List[dict], concurrency: int):
+        """
+        Initializes the BatchTranslator with the items to translate and the concurrency cap.
+
+        Args:
+            items (list): The items to translate.
+            concurrency (int): Maximum number of translations in flight at once.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self.items = items
+        self.concurrency = concurrency
+        logger.info(f"BatchTranslator initialized with {len(items)} items, concurrency {concurrency}.")
+
+    async def aexecute(self, client) -> Tuple[List[dict], TokenUsage]:
+        """
+        Translates all items using the provided async OpenAI client.
+
+        Args:
+            client: The AsyncOpenAIGeniusClient instance used to perform the translations.
+
+        Returns:
+            Tuple[List[dict], TokenUsage]: One result per item, in input order, and the total token usage.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def translate(index: int, item: dict) -> dict:
+            async with semaphore:
+                try:
+                    translator = TextTranslator(item.get("source_lang"), item.get("target_lang"), item.get("text"))
+                    translation, usage = await translator.aexecute(client)
+                except Exception as e:
+                    logger.warning(f"Batch item {index} failed: {e}")
+                    return {"index": index, "translation": None, "usage": TokenUsage(), "error": str(e)}
+                if is_error_response(translation):
+                    # Upstream failures come back as an error message rather than an exception
+                    logger.warning(f"Batch item {index} failed: {translation}")
+                    return {"index": index, "translation": None, "usage": usage, "error": translation}
+                return {"index": index, "translation": translation, "usage": usage, "error": None}
+
+        results = await asyncio.gather(*(translate(i, item) for i, item in enumerate(self.items)))
+        total_usage = sum((result["usage"] for result in results), TokenUsage())
+        failed = sum(1 for result in results if result["error"])
+        logger.info(f"Batch translation completed: {len(results) - failed} succeeded, {failed} failed, "
+                    f"tokens used: {total_usage}.")
+        return list(results), total_usage
@@ -0,0 +1,415 @@
+"""
+Offline translation of large JSONL or CSV files through `TextTranslator`.
+
+Records are read, translated and written as a stream, so memory use does not depend on the
+file size. Progress is checkpointed next to the output file, and running the same command
+again after an interruption continues where it stopped:
+
+    OPENAI_API_KEY=... python -m src.services.bulk_translate input.jsonl output.jsonl \\
+        --source-lang English --target-lang French
+
+Each input record is a JSON object per line, or a CSV row with a header. The text is read
+from the `text` field (see `--text-field`); `source_lang` and `target_lang` fields override
+the command-line languages per record. Output records are the input records with
+`translation` and `error` added, in input order and in the input format.
+
+With `--backend batch`, records are sent through the OpenAI Batch API in chunks of
+`--checkpoint-every` records (see `src.services.batch_backend`), trading latency for
+cost and rate-limit headroom.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.config import settings
+from src.services.batch_backend import BatchExecutor
+from src.services.openai_client import is_error_response
+from src.services.text_translator_service import TextTranslator
+from src.services.token_usage import TokenUsage
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+
+# Bytes of the input hashed to recognize it when resuming
+_FINGERPRINT_BYTES = 65536
+
+
+def detect_format(path: str) -> str:
+    """
+    Returns "csv" for .csv files and "jsonl" otherwise.
+    """
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _fingerprint(path: str) -> dict:
+    with open(path, "rb") as f:
+        head = f.read(_FINGERPRINT_BYTES)
+    return {"size": os.path.getsize(path), "head_sha256": hashlib.sha256(head).hexdigest()}
+
+
+def read_records(path: str, fmt: str, text_field: str = "text") -> Iterator[dict]:
+    """
+    Yields the records of a JSONL or CSV file one at a time.
+
+    Blank JSONL lines are skipped. A JSONL line that is not a JSON object is yielded as a
+    record carrying an `error`, so output records stay aligned with the input.
+
+    Args:
+        path (str): The input file.
+        fmt (str): "jsonl" or "csv".
+        text_field (str, optional): Field holding the text, used for malformed lines.
+
+    Yields:
+        dict: The records, in file order.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                record = None
+                error = f"Line {line_number} is not valid JSON: {e}"
+            else:
+                error = None if isinstance(record, dict) else f"Line {line_number} is not a JSON object"
+            yield record if error is None else {text_field: None, "error": error}
+
+
+class _Checkpoint:
+    """
+    Progress of a bulk run: the records written and the output size after them, and with
+    the batch backend the batches submitted for the records being translated.
+    Saved atomically next to the output file.
+    """
+
+    def __init__(self, path: str, input_fingerprint: dict):
+        self.path = path
+        self.input = input_fingerprint
+        self.records_done = 0
+        self.output_bytes = 0
+        self.failed = 0
+        self.usage = TokenUsage()
+        self.batches: Dict[str, List[str]] = {}
+        self.complete = False
+
+    @classmethod
+    def load(cls, path: str, input_fingerprint: dict) -> "_Checkpoint":
+        """
+        Loads the checkpoint at `path`, or returns a fresh one if there is none.
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different input file.
+        """
+        checkpoint = cls(path, input_fingerprint)
+        if not os.path.exists(path):
+            return checkpoint
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("input") != input_fingerprint:
+            raise ValueError(f"Checkpoint {path} was written for a different input; use --restart to start over")
+        checkpoint.records_done = data["records_done"]
+        checkpoint.output_bytes = data["output_bytes"]
+        checkpoint.failed = data.get("failed", 0)
+        usage = data.get("usage") or {}
+        checkpoint.usage = TokenUsage(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0),
+                                      usage.get("cached_tokens", 0))
+        checkpoint.batches = data.get("batches") or {}
+        checkpoint.complete = data.get("complete", False)
+        return checkpoint
+
+    def save(self):
+        data = {"input": self.input, "records_done": self.records_done, "output_bytes": self.output_bytes,
+                "failed": self.failed, "usage": self.usage.to_dict(), "batches": self.batches,
+                "complete": self.complete}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+
+class BulkTranslator:
+    """
+    Translates the records of a file with bounded concurrency and writes them in input order.
+
+    At most `2 * concurrency` records are held in memory at once. The output is flushed and
+    the checkpoint saved every `checkpoint_every` records; on resume, output written after
+    the last checkpoint is truncated and those records are translated again.
+
+    With a `BatchExecutor`, records are instead sent through the Batch API in chunks of
+    `checkpoint_every`, each chunk checkpointed once its batch is done. Submitted batches are
+    checkpointed before waiting for them, so a resumed run waits for the same batches again
+    instead of paying for the chunk twice.
+
+    Attributes:
+        source_lang (str): Default source language.
+        target_lang (str): Default target language.
+        concurrency (int): Maximum number of translations in flight at once.
+        text_field (str): Field holding the text to translate.
+        checkpoint_every (int): Records written between checkpoints.
+    """
+
+    def __init__(self, client, source_lang: str, target_lang: str, concurrency: int = None,
+                 text_field: str = "text", checkpoint_every: int = 100, batch_executor: BatchExecutor = None):
+        """
+        Initializes the BulkTranslator.
+
+        Args:
+            client: The OpenAIGeniusClient (or RoutedClient) used to perform the translations;
+                None when a batch executor is given.
+            source_lang (str): Default source language.
+            target_lang (str): Default target language.
+            concurrency (int, optional): Maximum translations in flight. Defaults to settings.
+            text_field (str, optional): Field holding the text to translate.
+            checkpoint_every (int, optional): Records written between checkpoints.
+            batch_executor (BatchExecutor, optional): Translate through the Batch API instead,
+                `checkpoint_every` records per batch.
+
+        Raises:
+            ValueError: If the concurrency or checkpoint interval is below 1.
+        """
+        concurrency = concurrency or settings.BATCH_DEFAULT_CONCURRENCY
+        if concurrency < 1 or checkpoint_every < 1:
+            raise ValueError("Concurrency and checkpoint interval must be at least 1")
+        self.client = client
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.concurrency = concurrency
+        self.text_field = text_field
+        self.checkpoint_every = checkpoint_every
+        self.batch_executor = batch_executor
+
+    def _translator(self, record: dict) -> TextTranslator:
+        return TextTranslator(record.get("source_lang") or self.source_lang,
+                              record.get("target_lang") or self.target_lang,
+                              record.get(self.text_field))
+
+    @staticmethod
+    def _result(record: dict, translation: Optional[str], usage: TokenUsage,
+                error: Optional[str]) -> Tuple[dict, TokenUsage]:
+        """
+        Returns the record with `translation` and `error` added, and its token usage.
+        """
+        if error is None and is_error_response(translation):
+            translation, error = None, translation
+        return {**record, "translation": translation, "error": error}, usage
+
+    def _translate(self, record: dict) -> Tuple[dict, TokenUsage]:
+        """
+        Translates one record with the client.
+        """
+        if record.get("error"):
+            return self._result(record, None, TokenUsage(), record["error"])
+        try:
+            translation, usage = self._translator(record).execute(self.client)
+        except Exception as e:
+            return self._result(record, None, TokenUsage(), str(e))
+        return self._result(record, translation, usage, None)
+
+    def run(self, input_path: str, output_path: str, fmt: str = None, restart: bool = False) -> dict:
+        """
+        Translates `input_path` into `output_path`, resuming from the checkpoint if there is one.
+
+        Args:
+            input_path (str): The JSONL or CSV file to translate.
+            output_path (str): The file the translated records are written to.
+            fmt (str, optional): "jsonl" or "csv". Defaults to the input file extension.
+            restart (bool, optional): Ignore an existing checkpoint and start over.
+
+        Returns:
+            dict: Records translated in total and in this run, failed records, token usage and
+            whether the file is complete.
+
+        Raises:
+            ValueError: If the format is unknown or the checkpoint belongs to another input.
+        """
+        fmt = fmt or detect_format(input_path)
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+        checkpoint_path = f"{output_path}.checkpoint"
+        fingerprint = _fingerprint(input_path)
+        if restart and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        checkpoint = _Checkpoint.load(checkpoint_path, fingerprint)
+        if checkpoint.complete:
+            logger.info(f"{output_path} is already complete ({checkpoint.records_done} records).")
+            return self._summary(checkpoint, 0)
+
+        # Drop output written after the last checkpoint; those records are translated again
+        with open(output_path, "ab") as f:
+            f.truncate(checkpoint.output_bytes)
+        if checkpoint.records_done:
+            logger.info(f"Resuming {input_path} after {checkpoint.records_done} records.")
+
+        records = read_records(input_path, fmt, self.text_field)
+        for _ in range(checkpoint.records_done):
+            next(records, None)
+
+        resumed_at = checkpoint.records_done
+        start = time.perf_counter()
+        with open(output_path, "a", encoding="utf-8", newline="") as out:
+            write = self._writer(out, fmt, header=checkpoint.output_bytes == 0)
+            try:
+                if self.batch_executor is None:
+                    self._run_concurrently(records, write, out, checkpoint)
+                else:
+                    self._run_batched(records, write, out, checkpoint)
+                checkpoint.complete = True
+            finally:
+                self._save(out, checkpoint)
+
+        elapsed = time.perf_counter() - start
+        translated = checkpoint.records_done - resumed_at
+        logger.info(f"Translated {translated} records in {elapsed:.1f}s ({checkpoint.failed} failed in total), "
+                    f"tokens used: {checkpoint.usage}.")
+        return self._summary(checkpoint, translated)
+
+    def _run_concurrently(self, records: Iterator[dict], write, out, checkpoint: _Checkpoint):
+        """
+        Translates records on a thread pool and writes them in input order.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-translate") as executor:
+            in_flight = deque()
+            try:
+                for record in records:
+                    in_flight.append(executor.submit(self._translate, record))
+                    if len(in_flight) >= 2 * self.concurrency:
+                        self._write(*in_flight.popleft().result(), write, out, checkpoint)
+                while in_flight:
+                    self._write(*in_flight.popleft().result(), write, out, checkpoint)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def _run_batched(self, records: Iterator[dict], write, out, checkpoint: _Checkpoint):
+        """
+        Translates records through the Batch API, one batch per `checkpoint_every` records.
+        """
+        while True:
+            chunk = list(islice(records, self.checkpoint_every))
+            if not chunk:
+                return
+            if checkpoint.batches:
+                logger.info(f"Resuming with {len(checkpoint.batches)} batch(es) submitted before the interruption.")
+            translatable = [record for record in chunk if not record.get("error")]
+            outcomes, _ = self.batch_executor.run([self._translator(record) for record in translatable],
+                                                  checkpoint.batches, lambda: self._save(out, checkpoint))
+            results = {id(record): outcome for record, outcome in zip(translatable, outcomes)}
+            for record in chunk:
+                outcome = results.get(id(record))
+                if outcome is None:
+                    self._write(*self._result(record, None, TokenUsage(), record["error"]), write, out, checkpoint)
+                else:
+                    self._write(*self._result(record, outcome["output"], outcome["usage"], outcome["error"]),
+                                write, out, checkpoint)
+            checkpoint.batches = {}
+            self._save(out, checkpoint)
+
+    def _write(self, record: dict, usage: TokenUsage, write, out, checkpoint: _Checkpoint):
+        """
+        Writes a translated record and checkpoints periodically.
+        """
+        write(record)
+        checkpoint.records_done += 1
+        checkpoint.usage += usage
+        if record.get("error"):
+            checkpoint.failed += 1
+        if checkpoint.records_done % self.checkpoint_every == 0:
+            self._save(out, checkpoint)
+
+    @staticmethod
+    def _save(out, checkpoint: _Checkpoint):
+        """
+        Makes the written records durable, then records the output size in the checkpoint.
+        """
+        out.flush()
+        os.fsync(out.fileno())
+        checkpoint.output_bytes = os.fstat(out.fileno()).st_size
+        checkpoint.save()
+
+    def _writer(self, out, fmt: str, header: bool):
+        if fmt == "jsonl":
+            return lambda record: out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        writer: Optional[csv.DictWriter] = None
+
+        def write_csv(record: dict):
+            nonlocal writer
+            if writer is None:
+                fields: List[str] = list(record)
+                fields += [field for field in ("translation", "error") if field not in fields]
+                writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+                if header:
+                    writer.writeheader()
+            writer.writerow(record)
+        return write_csv
+
+    @staticmethod
+    def _summary(checkpoint: _Checkpoint, translated: int) -> dict:
+        return {"records": checkpoint.records_done, "translated_this_run": translated, "failed": checkpoint.failed,
+                "usage": checkpoint.usage.to_dict(), "complete": checkpoint.complete}
+
+
+def main(argv: List[str] = None):
+    """
+    Translates a JSONL or CSV file from the command line.
+    """
+    from src.services.model_router import AUTO_MODEL, get_client
+
+    parser = argparse.ArgumentParser(description="Translate a JSONL or CSV file, resuming interrupted runs.")
+    parser.add_argument("input", help="JSONL or CSV file to translate")
+    parser.add_argument("output", help="File the translated records are written to")
+    parser.add_argument("--source-lang", required=True, help="Source language, unless set per record")
+    parser.add_argument("--target-lang", required=True, help="Target language, unless set per record")
+    parser.add_argument("--format", choices=FORMATS, help="Input and output format; defaults to the input extension")
+    parser.add_argument("--text-field", default="text", help="Field holding the text to translate")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Model to translate with, or \"auto\"")
+    parser.add_argument("--temperature", type=float, default=0.7, help="Sampling temperature")
+    parser.add_argument("--max-tokens", type=int, default=1000, help="Completion token limit per record")
+    parser.add_argument("--concurrency", type=int, default=None, help="Translations in flight at once")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="Records written between checkpoints; with --backend batch, records per batch")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    parser.add_argument("--backend", choices=("sync", "batch"), default="sync",
+                        help="Translate with concurrent requests, or through the Batch API at lower cost")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        parser.error("OPENAI_API_KEY must be set")
+
+    if args.backend == "batch":
+        if args.model == AUTO_MODEL:
+            parser.error("The batch backend needs a fixed --model")
+        client, batch_executor = None, BatchExecutor(api_key, args.model, args.temperature, args.max_tokens)
+    else:
+        client, batch_executor = get_client(api_key, args.model, args.temperature, args.max_tokens), None
+    translator = BulkTranslator(client, args.source_lang, args.target_lang, args.concurrency,
+                                args.text_field, args.checkpoint_every, batch_executor)
+    try:
+        summary = translator.run(args.input, args.output, args.format, args.restart)
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.", file=sys.stderr)
+        sys.exit(130)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from src.config import settings
+from src.services.prompt_registry import render_prompt
+from src.utils.token_counter import TOKENS_PER_MESSAGE, count_message_tokens, count_tokens
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Summaries are produced off the request path on a small shared pool
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-summary")
+
+
+class ChatHistoryManager:
+    """
+    Keeps the chat context sent to OpenAI within a token budget.
+
+    The most recent messages that fit in the budget are sent verbatim. Older messages can
+    optionally be folded into a rolling summary; the summary is generated in the background
+    and picked up by a later turn, so building the context never waits on the API. Messages
+    evicted while a summary is being generated are folded in by the next one.
+
+    Attributes:
+        token_budget (int): Maximum estimated prompt tokens for the context.
+        summarize (bool): Whether messages that fall out of the window are summarized.
+        summary (str): The current rolling summary, empty until one has been generated.
+    """
+
+    def __init__(self, token_budget: int = None, summarize: bool = None):
+        """
+        Initializes the ChatHistoryManager.
+
+        Args:
+            token_budget (int, optional): Prompt token budget. Defaults to settings.
+            summarize (bool, optional): Enables the rolling summary. Defaults to settings.
+        """
+        self.token_budget = token_budget or settings.CHAT_HISTORY_TOKEN_BUDGET
+        self.summarize = settings.CHAT_HISTORY_SUMMARIZE if summarize is None else summarize
+        self.summary = ""
+        self._summarized_count = 0
+        self._pending: Optional[Future] = None
+        # Index the running summary job summarizes up to, and the follow-up job it queued
+        self._pending_upto = 0
+        self._queued: Optional[Tuple[List[dict], int, object]] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def build_context(self, messages: List[dict], client=None) -> List[dict]:
+        """
+        Selects the messages to send for the next completion.
+
+        Args:
+            messages (list): The full conversation, oldest first. Only appended to between calls.
+            client (OpenAIGeniusClient, optional): Client used to summarize evicted messages.
+
+        Returns:
+            list: The summary (as a system message, when available) followed by the most recent
+            messages that fit in the budget. The latest message is always included.
+        """
+        with self._lock:
+            summary_messages = self._summary_messages()
+            # The request overhead is counted once, with the summary
+            start = self._window_start(messages, count_message_tokens(summary_messages))
+            if self.summary:
+                start = max(start, min(self._summarized_count, len(messages) - 1))
+
+            if self.summarize and client is not None and start > self._summarized_count:
+                self._schedule_summary(messages, start, client)
+
+        window = messages[start:]
+        if start:
+            logger.info(f"Chat context trimmed to {len(window)} of {len(messages)} messages "
+                        f"(summary: {'yes' if summary_messages else 'no'}).")
+        return summary_messages + window
+
+    def reset(self):
+        """
+        Forgets the summary, e.g. when the conversation is cleared.
+        """
+        with self._lock:
+            self.summary = ""
+            self._summarized_count = 0
+            self._pending = None
+            self._pending_upto = 0
+            self._queued = None
+            self._generation += 1
+
+    def _window_start(self, messages: List[dict], used: int) -> int:
+        """
+        Returns the index of the oldest message that still fits in the budget, given the tokens
+        already used by the rest of the prompt, including the request overhead.
+        """
+        start = len(messages)
+        while start > 0:
+            cost = TOKENS_PER_MESSAGE + count_tokens(messages[start - 1].get("content") or "")
+            if used + cost > self.token_budget and start < len(messages):
+                break
+            used += cost
+            start -= 1
+        return start
+
+    def _summary_messages(self) -> List[dict]:
+        """
+        Returns the rolling summary formatted as a system message, or an empty list.
+        """
+        if not self.summary:
+            return []
+        return [{"role": "system", "content": render_prompt('chat_history', 'CONTEXT_SUMMARY', summary=self.summary)}]
+
+    def _schedule_summary(self, messages: List[dict], upto: int, client):
+        """
+        Folds the messages evicted up to `upto` into the summary in the background, one job
+        at a time. While a job runs, the messages it does not cover are queued for the next.
+        Must be called with the lock held.
+        """
+        if self._pending is not None and not self._pending.done():
+            if upto > self._pending_upto:
+                self._queued = (list(messages[self._pending_upto:upto]), upto, client)
+            return
+        self._submit(list(messages[self._summarized_count:upto]), upto, client)
+
+    def _submit(self, evicted: List[dict], upto: int, client):
+        """
+        Starts a summary job. Must be called with the lock held.
+        """
+        self._queued = None
+        self._pending_upto = upto
+        self._pending = _summary_executor.submit(
+            self._fold, self._generation, self.summary, evicted, upto, client
+        )
+
+    def _fold(self, generation: int, previous_summary: str, evicted: List[dict], upto: int, client):
+        """
+        Generates the updated summary and installs it if the history was not reset meanwhile.
+        """
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in evicted)
+        user_msg = f"Current summary:\n{previous_summary or '(empty)'}\n\nNext messages:\n{transcript}"
+        messages = [
+            {"role": "system", "content": render_prompt('chat_history', 'SYSTEM_SUMMARIZER')},
+            {"role": "user", "content": user_msg}
+        ]
+        try:
+            # Bypass the cache so that a zero token count reliably signals a failed request
+            summary, tokens_used = client.get_chat_completion(
+                messages, max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS, use_cache=False
+            )
+        except Exception as e:
+            logger.error(f"Failed to summarize chat history: {e}", exc_info=True)
+            self._drop_queued(generation)
+            return
+        if not summary or tokens_used.total_tokens == 0:
+            logger.warning("Chat history summary was not generated; keeping the previous summary.")
+            self._drop_queued(generation)
+            return
+
+        with self._lock:
+            if self._generation != generation:
+                return
+            self.summary = summary
+            self._summarized_count = upto
+            if self._queued is not None:
+                # The queued messages start where this summary ends
+                self._submit(*self._queued)
+        logger.info(f"Chat history summarized up to message {upto} "
+                    f"({count_tokens(summary)} tokens, tokens used: {tokens_used}).")
+
+    def _drop_queued(self, generation: int):
+        """
+        Forgets the queued job after a failed summary: its messages would leave a gap after
+        the previous summary, so the next turn summarizes from there instead.
+        """
+        with self._lock:
+            if self._generation == generation:
+                self._queued = None
@@ -0,0 +1,139 @@
+import logging
+import threading
+from typing import Tuple
+
+from openai import OpenAI
+
+from src.config import settings
+from src.services.openai_client import OpenAIGeniusClient
+from src.utils.bounded_pool import BoundedIdlePool
+from src.utils.hashing import hash_api_key
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of configured OpenAI clients.
+
+    Transports (`openai.OpenAI` instances holding the HTTP connection pool) are shared per
+    (API key hash, timeout, max retries), so keep-alive connections and TLS sessions are
+    reused across requests, Streamlit reruns and threads. `OpenAIGeniusClient` wrappers are
+    cached per (API key hash, model, temperature, max tokens) on top of those transports.
+    Both pools are bounded in size and drop entries that have been idle for too long;
+    dropped transports close their connections once the last wrapper using them is released.
+
+    Attributes:
+        timeout (float): Request timeout applied to new transports, in seconds.
+        max_retries (int): Retries performed by the OpenAI SDK on new transports.
+    """
+
+    def __init__(self, max_size: int, idle_seconds: float, timeout: float, max_retries: int):
+        """
+        Initializes the registry with its size bound, idle TTL and transport settings.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._transports = BoundedIdlePool(max_size, idle_seconds)
+        self._clients = BoundedIdlePool(max_size, idle_seconds)
+        self._lock = threading.Lock()
+
+    def get_client(self, api_key: str, model: str, temperature: float, max_tokens: int) -> OpenAIGeniusClient:
+        """
+        Returns a shared client for the given configuration, creating it on first use.
+
+        Args:
+            api_key (str): OpenAI API key.
+            model (str): Model name.
+            temperature (float): Sampling temperature.
+            max_tokens (int): Completion token limit.
+
+        Returns:
+            OpenAIGeniusClient: A client backed by a pooled transport.
+        """
+        if not api_key:
+            raise ValueError("API key is required")
+
+        key_hash = hash_api_key(api_key)
+        client_key = (key_hash, model, temperature, max_tokens)
+
+        with self._lock:
+            self._evict_idle()
+            client = self._clients.get(client_key)
+            if client is not None:
+                # Using a client uses its transport, so the transport stays pooled for the key
+                self._transports.get(self._transport_key(key_hash))
+                return client
+
+            transport = self._get_transport(api_key, key_hash)
+            client = OpenAIGeniusClient(api_key, model, temperature, max_tokens, openai_client=transport)
+            self._clients.put(client_key, client)
+            logger.info(f"Registered OpenAI client for model {model} ({len(self._clients)} cached).")
+            return client
+
+    def _get_transport(self, api_key: str, key_hash: str) -> OpenAI:
+        """
+        Returns the pooled `openai.OpenAI` instance for the key, creating it if needed.
+        Must be called with the registry lock held.
+        """
+        transport_key = self._transport_key(key_hash)
+        transport = self._transports.get(transport_key)
+        if transport is None:
+            transport = OpenAI(api_key=api_key, timeout=self.timeout, max_retries=self.max_retries)
+            self._transports.put(transport_key, transport)
+            logger.info("Created new pooled OpenAI transport.")
+        return transport
+
+    def _transport_key(self, key_hash: str) -> Tuple:
+        return key_hash, self.timeout, self.max_retries
+
+    def _evict_idle(self):
+        """
+        Drops idle clients and transports. Must be called with the registry lock held.
+        """
+        evicted = self._clients.evict_idle() + self._transports.evict_idle()
+        if evicted:
+            logger.info(f"Evicted {evicted} idle OpenAI client(s) from the registry.")
+
+    def clear(self):
+        """
+        Drops every cached client and transport.
+        """
+        with self._lock:
+            self._clients.clear()
+            self._transports.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+_registry = ClientRegistry(
+    max_size=settings.CLIENT_POOL_MAX_SIZE,
+    idle_seconds=settings.CLIENT_POOL_IDLE_SECONDS,
+    timeout=settings.OPENAI_TIMEOUT_SECONDS,
+    max_retries=settings.OPENAI_MAX_RETRIES,
+)
+
+
+def get_client_registry() -> ClientRegistry:
+    """
+    Returns the process-wide client registry.
+    """
+    return _registry
+
+
+def get_shared_client(api_key: str, model: str, temperature: float, max_tokens: int) -> OpenAIGeniusClient:
+    """
+    Convenience wrapper around `ClientRegistry.get_client` on the process-wide registry.
+
+    Args:
+        api_key (str): OpenAI API key.
+        model (str): Model name.
+        temperature (float): Sampling temperature.
+        max_tokens (int): Completion token limit.
+
+    Returns:
+        OpenAIGeniusClient: A client backed by a pooled transport.
+    """
+    return _registry.get_client(api_key, model, temperature, max_tokens)
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from src.config import settings
+from src.services.base_operation import OpenAIOperation
+from src.services.openai_client import is_error_response
+from src.services.text_translator_service import TextTranslator
+from src.services.token_usage import TokenUsage
+from src.utils.text_segmenter import segment_text
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class DocumentTranslator(OpenAIOperation):
+    """
+    A class that implements the OpenAIOperation interface to translate long documents.
+
+    The document is split into token-bounded segments at paragraph and sentence boundaries,
+    the segments are translated concurrently, and the translations are reassembled in order
+    with the original whitespace between them.
+
+    Attributes:
+        failed_segments (dict): Error messages of the last execution, keyed by segment index.
+    """
+
+    def __init__(self, source_lang: str, target_lang: str, text: str,
+                 max_segment_tokens: int = None, concurrency: int = None):
+        """
+        Initializes the DocumentTranslator and splits the document into segments.
+
+        Args:
+            source_lang (str): The source language of the document.
+            target_lang (str): The target language for translation.
+            text (str): The document to be translated.
+            max_segment_tokens (int, optional): Token budget per segment. Defaults to settings.
+            concurrency (int, optional): Maximum segments translated at once. Defaults to settings.
+        """
+        if not text or not source_lang or not target_lang:
+            raise ValueError("Text, source language, and target language are required")
+        if source_lang == target_lang:
+            raise ValueError("Source and target languages must be different")
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.text = text
+        self.max_segment_tokens = max_segment_tokens or settings.DOCUMENT_SEGMENT_TOKENS
+        self.concurrency = concurrency or settings.DOCUMENT_CONCURRENCY
+        self.segments = segment_text(text, self.max_segment_tokens)
+        self.failed_segments: Dict[int, str] = {}
+        logger.info(f"DocumentTranslator initialized with {len(self.segments)} segments, "
+                    f"source_lang: {self.source_lang}, target_lang: {self.target_lang}")
+
+    def execute(self, client) -> Tuple[str, TokenUsage]:
+        """
+        Translates the document using a thread pool over the provided OpenAI client.
+
+        Args:
+            client: The OpenAIGeniusClient instance used to perform the translation.
+
+        Returns:
+            Tuple[str, TokenUsage]: The translated document, or the error message of the first
+            failed segment (see `failed_segments`), and the total token usage.
+        """
+        translations = [""] * len(self.segments)
+        total_usage = TokenUsage()
+        self.failed_segments = {}
+        for index, translation, usage in self.iter_segments(client, ordered=False):
+            translations[index] = translation
+            total_usage += usage
+            if is_error_response(translation.strip()):
+                self.failed_segments[index] = translation.strip()
+        return self._result(translations, total_usage), total_usage
+
+    async def aexecute(self, client) -> Tuple[str, TokenUsage]:
+        """
+        Translates the document concurrently on the event loop.
+
+        Args:
+            client: The AsyncOpenAIGeniusClient instance used to perform the translation.
+
+        Returns:
+            Tuple[str, TokenUsage]: The translated document, or the error message of the first
+            failed segment (see `failed_segments`), and the total token usage.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def translate(index: int) -> Tuple[str, TokenUsage]:
+            async with semaphore:
+                translation, tokens_used = await self._translator(index).aexecute(client)
+                return self._with_separator(index, translation), tokens_used
+
+        results = await asyncio.gather(*(translate(i) for i in range(len(self.segments))))
+        total_usage = sum((usage for _, usage in results), TokenUsage())
+        self.failed_segments = {
+            index: translation.strip() for index, (translation, _) in enumerate(results)
+            if is_error_response(translation.strip())
+        }
+        return self._result([translation for translation, _ in results], total_usage), total_usage
+
+    def iter_segments(self, client, ordered: bool = True,
+                      indexes: Iterable[int] = None) -> Iterator[Tuple[int, str, TokenUsage]]:
+        """
+        Translates the segments concurrently and yields them as they finish.
+
+        Args:
+            client: The OpenAIGeniusClient instance used to perform the translation.
+            ordered (bool, optional): When True, segments are yielded in index order as soon
+                as all preceding segments are done; otherwise in completion order.
+            indexes (iterable, optional): The segments to translate, e.g. those a resumed job
+                has not finished yet. Defaults to all segments.
+
+        Yields:
+            tuple: The segment index, its translation followed by the original separator,
+            and its token usage.
+        """
+        indexes = sorted(set(range(len(self.segments)) if indexes is None else indexes))
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            futures = {
+                executor.submit(self._translator(index).execute, client): index
+                for index in indexes
+            }
+            pending = {}
+            order = iter(indexes)
+            next_index = next(order, None)
+            for future in as_completed(futures):
+                index = futures[future]
+                translation, tokens_used = future.result()
+                result = (index, self._with_separator(index, translation), tokens_used)
+                if not ordered:
+                    yield result
+                    continue
+                pending[index] = result
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index = next(order, None)
+        finally:
+            # Stop queued segments if a segment failed or the consumer stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _result(self, translations: List[str], total_usage: TokenUsage) -> str:
+        """
+        Joins the segment translations, or returns the first error if any segment failed, so
+        that a partially translated document is never returned as a success.
+        """
+        if self.failed_segments:
+            logger.warning(f"Document translation failed on {len(self.failed_segments)} of "
+                           f"{len(self.segments)} segment(s): {sorted(self.failed_segments)}")
+            return self.failed_segments[min(self.failed_segments)]
+        logger.info(f"Document translation completed. Tokens used: {total_usage}")
+        return "".join(translations)
+
+    def _translator(self, index: int) -> TextTranslator:
+        """
+        Builds the TextTranslator for a single segment.
+        """
+        return TextTranslator(self.source_lang, self.target_lang, self.segments[index][0].strip())
+
+    def _with_separator(self, index: int, translation: str) -> str:
+        """
+        Surrounds the translation with the whitespace around the segment in the source
+        document: the document's leading whitespace for the first segment, and the separator
+        that followed it.
+        """
+        text = self.segments[index][0]
+        leading = text[:len(text) - len(text.lstrip())]
+        return leading + translation.strip() + self.segments[index][1]
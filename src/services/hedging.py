@@ -0,0 +1,348 @@
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from src.config import settings
+from src.services.metrics import HEDGED_REQUESTS
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent successful request latencies.
+
+    Attributes:
+        window (int): Number of latencies kept.
+        min_samples (int): Latencies needed before percentiles are reported.
+    """
+
+    def __init__(self, window: int, min_samples: int):
+        """
+        Initializes an empty tracker.
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float):
+        """
+        Records the latency of a successful request, in seconds.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Returns the given percentile (0-100) of the recorded latencies, or None while there
+        are fewer than `min_samples` of them.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        rank = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[min(rank, len(ordered) - 1)]
+
+
+class HedgeBudget:
+    """
+    Caps hedged requests to a fraction of all requests.
+
+    Every request earns `ratio` credit, up to `burst`; a hedge spends one credit. Over any
+    long run at most `ratio` extra requests are sent per request.
+
+    Attributes:
+        ratio (float): Hedges allowed per request.
+        burst (float): Maximum credit saved up while requests do not need hedging.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        """
+        Initializes an empty budget.
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """
+        Earns credit for a request.
+        """
+        with self._lock:
+            self._credit = min(self.burst, self._credit + self.ratio)
+
+    def available(self) -> bool:
+        """
+        Tells whether a credit is available, without spending it.
+        """
+        with self._lock:
+            return self._credit >= 1.0
+
+    def try_spend(self) -> bool:
+        """
+        Spends one credit for a hedge if available.
+        """
+        with self._lock:
+            if self._credit < 1.0:
+                return False
+            self._credit -= 1.0
+            return True
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+# One slot per executor thread: calls are only submitted with a slot, so they never queue
+_workers: Optional[threading.BoundedSemaphore] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _workers
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.HEDGING_MAX_WORKERS, thread_name_prefix="hedge")
+            _workers = threading.BoundedSemaphore(settings.HEDGING_MAX_WORKERS)
+        return _executor
+
+
+def _reserve_worker() -> bool:
+    """
+    Reserves an idle hedging thread, without waiting.
+    """
+    _get_executor()
+    return _workers.acquire(blocking=False)
+
+
+def _submit(fn: Callable[[], T], started: threading.Event = None):
+    """
+    Runs a call on the hedging thread reserved with `_reserve_worker`, releasing it when done.
+    """
+    # Copy the context so request-scoped context variables reach the worker thread
+    context = contextvars.copy_context()
+
+    def run() -> T:
+        if started is not None:
+            started.set()
+        return context.run(fn)
+
+    future = _get_executor().submit(run)
+    future.add_done_callback(lambda _: _workers.release())
+    return future
+
+
+class HedgePolicy:
+    """
+    Sends a duplicate of a request that is slower than most recent ones and keeps whichever
+    copy succeeds first.
+
+    The hedge is fired once the request has been pending for the `percentile` of recently
+    observed latencies (at least `min_delay`), and only while the `HedgeBudget` allows and
+    the caller admits it. Only the upstream call itself should be hedged: time spent waiting
+    for rate limiter capacity or between retries would skew the observed latencies.
+    Asynchronous losers are cancelled; synchronous ones cannot be interrupted mid-request, so
+    their result is handed to `on_discard` when they finish.
+
+    Synchronous calls run on a shared pool of `HEDGING_MAX_WORKERS` threads but never wait
+    for one: when the pool is busy, the request is sent from the caller's thread without a
+    hedge, and a hedge is only sent if a thread is idle.
+
+    Attributes:
+        model (str): The model the policy's latencies are observed for.
+        percentile (float): Latency percentile after which a request is hedged.
+        min_delay (float): Shortest wait before hedging, in seconds.
+        tracker (LatencyTracker): Recent latencies of the model.
+        budget (HedgeBudget): Limit on the extra requests sent.
+    """
+
+    def __init__(self, model: str, percentile: float = None, min_delay: float = None, max_ratio: float = None,
+                 window: int = None, min_samples: int = None):
+        """
+        Initializes the policy; parameters default to settings.
+        """
+        self.model = model
+        self.percentile = percentile if percentile is not None else settings.HEDGING_PERCENTILE
+        self.min_delay = min_delay if min_delay is not None else settings.HEDGING_MIN_DELAY_SECONDS
+        self.tracker = LatencyTracker(window or settings.HEDGING_WINDOW,
+                                      min_samples if min_samples is not None else settings.HEDGING_MIN_SAMPLES)
+        self.budget = HedgeBudget(max_ratio if max_ratio is not None else settings.HEDGING_MAX_RATIO)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Returns how long a request may be pending before it is hedged, or None while there
+        is not enough latency history.
+        """
+        latency = self.tracker.percentile(self.percentile)
+        return None if latency is None else max(latency, self.min_delay)
+
+    def _timed(self, fn: Callable[[], T]) -> Callable[[], T]:
+        def run() -> T:
+            start = time.perf_counter()
+            result = fn()
+            self.tracker.observe(time.perf_counter() - start)
+            return result
+        return run
+
+    def _should_hedge(self, admit: Optional[Callable[[], bool]]) -> bool:
+        """
+        Asks the caller whether a hedge may be sent now, and spends budget for it only once
+        it is admitted, so a refused hedge keeps its credit.
+        """
+        if not self.budget.available():
+            HEDGED_REQUESTS.inc(model=self.model, result="over_budget")
+            return False
+        if admit is not None and not admit():
+            HEDGED_REQUESTS.inc(model=self.model, result="not_admitted")
+            return False
+        if not self.budget.try_spend():
+            # Another request spent the last credit meanwhile
+            HEDGED_REQUESTS.inc(model=self.model, result="over_budget")
+            return False
+        return True
+
+    def run(self, fn: Callable[[], T], admit: Callable[[], bool] = None,
+            on_discard: Callable[[T], None] = None) -> T:
+        """
+        Calls `fn`, hedging it with a second call when it is slow.
+
+        Args:
+            fn (callable): Sends the request and returns its response; raises on failure.
+            admit (callable, optional): Returns whether a hedge may be sent now, e.g. whether
+                rate limiter capacity is available without waiting.
+            on_discard (callable, optional): Receives the response of a call that succeeded
+                after the other one had won, e.g. to account for its token usage.
+
+        Returns:
+            The response of the first call that succeeds.
+
+        Raises:
+            Exception: The last error if every call failed.
+        """
+        self.budget.record_request()
+        timed = self._timed(fn)
+        delay = self.hedge_delay()
+        if delay is None or not _reserve_worker():
+            return timed()
+
+        started = threading.Event()
+        primary = _submit(timed, started)
+        # The thread was idle, so the request starts right away; the delay counts from then
+        started.wait()
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not _reserve_worker():
+            HEDGED_REQUESTS.inc(model=self.model, result="not_admitted")
+            return primary.result()
+        if not self._should_hedge(admit):
+            _workers.release()
+            return primary.result()
+
+        hedge = _submit(timed)
+        logger.info(f"Request to {self.model} pending for {delay:.2f}s; sending a hedged request.")
+        names = {primary: "primary", hedge: "hedge"}
+        pending, error = set(names), None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winners = [future for future in done if future.exception() is None]
+            if winners:
+                for loser in [*winners[1:], *pending]:
+                    # A loser already sending cannot be cancelled; its response is discarded when it arrives
+                    if not loser.cancel() and on_discard is not None:
+                        loser.add_done_callback(lambda future: self._discard(future, on_discard))
+                HEDGED_REQUESTS.inc(model=self.model, result=f"{names[winners[0]]}_won")
+                return winners[0].result()
+            error = next(iter(done)).exception()
+        HEDGED_REQUESTS.inc(model=self.model, result="failed")
+        raise error
+
+    @staticmethod
+    def _discard(future, on_discard: Callable[[T], None]):
+        """
+        Hands the response of a losing call to `on_discard`, if it succeeded.
+        """
+        if not future.cancelled() and future.exception() is None:
+            try:
+                on_discard(future.result())
+            except Exception as e:
+                logger.warning(f"Handling a discarded hedged response failed: {e}")
+
+    async def arun(self, fn: Callable[[], Awaitable[T]], admit: Callable[[], bool] = None,
+                   on_discard: Callable[[T], None] = None) -> T:
+        """
+        Asyncio counterpart of `run`; `fn` returns a new coroutine on each call. Losers are
+        cancelled, so only one that finished together with the winner reaches `on_discard`.
+        """
+        self.budget.record_request()
+
+        async def timed() -> T:
+            start = time.perf_counter()
+            result = await fn()
+            self.tracker.observe(time.perf_counter() - start)
+            return result
+
+        delay = self.hedge_delay()
+        if delay is None:
+            return await timed()
+
+        primary = asyncio.ensure_future(timed())
+        tasks = {primary: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            if not self._should_hedge(admit):
+                return await primary
+
+            logger.info(f"Request to {self.model} pending for {delay:.2f}s; sending a hedged request.")
+            tasks[asyncio.ensure_future(timed())] = "hedge"
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    if on_discard is not None:
+                        for loser in winners[1:]:
+                            self._discard(loser, on_discard)
+                    HEDGED_REQUESTS.inc(model=self.model, result=f"{tasks[winners[0]]}_won")
+                    return winners[0].result()
+                error = next(iter(done)).exception()
+            HEDGED_REQUESTS.inc(model=self.model, result="failed")
+            raise error
+        finally:
+            # Cancels the loser, or every copy if the caller itself was cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+_policies: Dict[str, HedgePolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_hedge_policy(model: str) -> HedgePolicy:
+    """
+    Returns the process-wide hedging policy for a model, creating it on first use.
+
+    Args:
+        model (str): The model name.
+
+    Returns:
+        HedgePolicy: The shared policy.
+    """
+    with _policies_lock:
+        policy = _policies.get(model)
+        if policy is None:
+            policy = _policies[model] = HedgePolicy(model)
+        return policy
@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from src.config import settings
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+def _joke_key(joke: str) -> str:
+    return hashlib.sha256(joke.strip().encode("utf-8")).hexdigest()
+
+
+class JokeExplanationStore:
+    """
+    Persistent store of joke explanations keyed by model and joke text, backed by SQLite.
+
+    The joke corpus is finite and static, so explanations are generated once (see
+    `src.services.joke_warmup`) and served from here afterwards.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens (or creates) the explanation database.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS explanations ("
+            "model TEXT NOT NULL, joke_key TEXT NOT NULL, joke TEXT NOT NULL, "
+            "explanation TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (model, joke_key))"
+        )
+        self._conn.commit()
+
+    def get(self, model: str, joke: str) -> Optional[str]:
+        """
+        Returns the stored explanation of a joke for a model, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT explanation FROM explanations WHERE model = ? AND joke_key = ?", (model, _joke_key(joke))
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def put(self, model: str, joke: str, explanation: str):
+        """
+        Stores the explanation of a joke for a model, replacing any earlier one.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO explanations (model, joke_key, joke, explanation, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (model, _joke_key(joke), joke, explanation, time.time())
+            )
+            self._conn.commit()
+
+    def missing(self, model: str, jokes: Iterable[str]) -> List[str]:
+        """
+        Returns the jokes that have no stored explanation for a model, in input order.
+        """
+        with self._lock:
+            stored = {row[0] for row in self._conn.execute(
+                "SELECT joke_key FROM explanations WHERE model = ?", (model,)
+            )}
+        return [joke for joke in dict.fromkeys(jokes) if _joke_key(joke) not in stored]
+
+    def count(self, model: str = None) -> int:
+        """
+        Returns the number of stored explanations, for one model or overall.
+        """
+        with self._lock:
+            if model is None:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM explanations").fetchone()
+            else:
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM explanations WHERE model = ?", (model,)
+                ).fetchone()
+        return count
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_joke_explanation_store() -> Optional[JokeExplanationStore]:
+    """
+    Returns the process-wide explanation store configured from `src.config.settings`.
+
+    Returns:
+        JokeExplanationStore | None: The shared store, or None when it is disabled.
+    """
+    global _default_store
+    if not settings.JOKE_STORE_ENABLED:
+        return None
+
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = JokeExplanationStore(settings.JOKE_STORE_DB_PATH)
+            logger.info(f"Joke explanation store opened at {settings.JOKE_STORE_DB_PATH}.")
+        return _default_store
@@ -1,24 +1,40 @@
-import pyjokes
 import logging
-from typing import Tuple
+from typing import List, Optional, Tuple
+from src.config import settings
 from src.services.base_operation import OpenAIOperation
+from src.services.joke_explanation_store import get_joke_explanation_store
+from src.services.near_duplicate_cache import get_near_duplicate_cache
+from src.services.openai_client import _create_messages, is_error_response
+from src.services.token_usage import TokenUsage
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# The part of the pyjokes corpus jokes are drawn from
+JOKE_LANGUAGE = "en"
+JOKE_CATEGORY = "neutral"
+
 class Joker(OpenAIOperation):
     """
     A class that implements the OpenAIOperation interface to handle joke explanations
     using the OpenAI client. It fetches and explains jokes via OpenAI.
+
+    Explanations are served from the explanation store, which the background warm-up fills
+    for the whole corpus (see `src.services.joke_warmup`), and from the near-duplicate cache
+    for jokes that differ only trivially from one explained before. Both are keyed by the
+    model that generated the explanation, which for a routed client is the model that
+    served the request.
     """
 
+    CACHE_NAMESPACE = "joke_explanation"
+
     def __init__(self, client):
         """
         Initialize Joker with the OpenAI client.
         """
         self.client = client
 
-    def execute(self, joke: str) -> Tuple[str, int]:
+    def execute(self, joke: str) -> Tuple[str, TokenUsage]:
         """
         Explains the joke using the OpenAI API.
 
@@ -26,19 +42,136 @@ class Joker(OpenAIOperation):
             joke (str): The joke to be explained.
 
         Returns:
-            Tuple[str, int]: The explanation and the number of tokens used.
+            Tuple[str, TokenUsage]: The explanation and the token usage.
         """
-        system_msg = f"As an expert in computer science, explain this joke: {joke}"
+        messages = _create_messages(self._create_system_message(joke), joke)
+        cached = self._cache_lookup(joke, self._models(messages))
+        if cached is not None:
+            return cached, TokenUsage()
 
         try:
             logger.info(f"Requesting joke explanation from OpenAI: '{joke}'")
-            new_joke, tokens_used = self.client.call_openai_api(system_msg, joke)
+            if hasattr(self.client, "get_routed_completion"):
+                new_joke, tokens_used, model = self.client.get_routed_completion(messages, max_tokens=self._max_tokens())
+            else:
+                new_joke, tokens_used = self.client.get_chat_completion(messages, max_tokens=self._max_tokens())
+                model = self.client.model
             logger.info(f"Joke explained successfully. Tokens used: {tokens_used}")
+            self._cache_store(model, joke, new_joke, tokens_used)
             return new_joke, tokens_used
         except Exception as e:
             logger.error(f"Error during joke explanation: {e}", exc_info=True)
             raise RuntimeError(f"Failed to explain the joke: {joke}") from e
 
+    async def aexecute(self, joke: str) -> Tuple[str, TokenUsage]:
+        """
+        Explains the joke using the OpenAI API asynchronously.
+        The Joker must have been initialized with an AsyncOpenAIGeniusClient.
+
+        Args:
+            joke (str): The joke to be explained.
+
+        Returns:
+            Tuple[str, TokenUsage]: The explanation and the token usage.
+        """
+        messages = _create_messages(self._create_system_message(joke), joke)
+        cached = self._cache_lookup(joke, self._models(messages))
+        if cached is not None:
+            return cached, TokenUsage()
+
+        try:
+            logger.info(f"Requesting async joke explanation from OpenAI: '{joke}'")
+            if hasattr(self.client, "get_routed_completion"):
+                new_joke, tokens_used, model = await self.client.get_routed_completion(
+                    messages, max_tokens=self._max_tokens()
+                )
+            else:
+                new_joke, tokens_used = await self.client.get_chat_completion(messages, max_tokens=self._max_tokens())
+                model = self.client.model
+            logger.info(f"Joke explained successfully. Tokens used: {tokens_used}")
+            self._cache_store(model, joke, new_joke, tokens_used)
+            return new_joke, tokens_used
+        except Exception as e:
+            logger.error(f"Error during joke explanation: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to explain the joke: {joke}") from e
+
+    def _models(self, messages: List[dict]) -> List[str]:
+        """
+        Returns the models whose explanations can answer the request: the client's model, or
+        the candidates a routed client would try, best first.
+        """
+        if hasattr(self.client, "candidate_models"):
+            return self.client.candidate_models(messages)
+        return [self.client.model]
+
+    @staticmethod
+    def _max_tokens() -> Optional[int]:
+        """
+        Returns the completion budget of an explanation. Stored explanations are served to
+        every user of a model, so they are generated with the store's fixed budget rather
+        than the client's; without the store, the client setting applies.
+        """
+        return settings.JOKE_STORE_MAX_TOKENS if get_joke_explanation_store() is not None else None
+
+    def _cache_lookup(self, joke: str, models: List[str]):
+        """
+        Returns the stored explanation of the joke or of a near-identical one, or None.
+        """
+        store = get_joke_explanation_store()
+        if store is not None:
+            for model in models:
+                explanation = store.get(model, joke)
+                if explanation is not None:
+                    logger.info(f"Serving joke explanation for {model} from the explanation store.")
+                    return explanation
+
+        cache = get_near_duplicate_cache()
+        if cache is None:
+            return None
+        for model in models:
+            hit = cache.get(self.CACHE_NAMESPACE, self._near_duplicate_scope(model), joke)
+            if hit is not None:
+                logger.info(f"Serving joke explanation from the near-duplicate cache "
+                            f"(similarity {hit.similarity:.3f}).")
+                return hit.value
+        return None
+
+    def _cache_store(self, model: Optional[str], joke: str, explanation: str, usage: TokenUsage):
+        """
+        Remembers an explanation for the joke and near-identical ones, under the model that
+        generated it.
+
+        Explanations cut off at the completion limit are not kept, and neither are those
+        served from the response cache or shared with an identical request, whose usage does
+        not tell whether they were complete.
+        """
+        if model is None or is_error_response(explanation):
+            return
+        max_tokens = self._max_tokens() or getattr(self.client, "max_tokens", None)
+        if usage.completion_tokens == 0 or (max_tokens and usage.completion_tokens >= max_tokens):
+            logger.info("Not storing a joke explanation that may be truncated.")
+            return
+        store = get_joke_explanation_store()
+        if store is not None:
+            store.put(model, joke, explanation)
+        cache = get_near_duplicate_cache()
+        if cache is not None:
+            cache.set(self.CACHE_NAMESPACE, self._near_duplicate_scope(model), joke, explanation)
+
+    def _near_duplicate_scope(self, model: str) -> tuple:
+        """
+        Scopes near-duplicate cache entries to the API key as well as the model, so an
+        explanation is only served to callers using the key that paid for it.
+        """
+        return getattr(self.client, "api_key_hash", None), model
+
+    @staticmethod
+    def _create_system_message(joke: str) -> str:
+        """
+        Builds the system message asking the model to explain the joke.
+        """
+        return f"As an expert in computer science, explain this joke: {joke}"
+
     def tell_joke(self) -> str:
         """
         Fetches a random joke from the pyjokes library.
@@ -46,6 +179,20 @@ class Joker(OpenAIOperation):
         Returns:
             str: The fetched joke.
         """
-        joke = pyjokes.get_joke()
+        import pyjokes  # Imported on first use to keep app startup fast
+
+        joke = pyjokes.get_joke(language=JOKE_LANGUAGE, category=JOKE_CATEGORY)
         logger.info(f"Fetched joke: '{joke}'")
         return joke
+
+    @staticmethod
+    def list_jokes() -> List[str]:
+        """
+        Returns every joke `tell_joke` can return.
+
+        Returns:
+            list: The jokes of the corpus.
+        """
+        import pyjokes
+
+        return pyjokes.get_jokes(language=JOKE_LANGUAGE, category=JOKE_CATEGORY)
@@ -0,0 +1,170 @@
+"""
+Background generation of explanations for every joke `Joker.tell_joke` can return.
+
+Started from the joke page when `GENIUS_JOKE_WARMUP_ENABLED` is set, or ahead of time with:
+
+    OPENAI_API_KEY=... python -m src.services.joke_warmup --model gpt-3.5-turbo
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.services.joke_explanation_store import JokeExplanationStore, get_joke_explanation_store
+from src.services.joke_service import Joker
+from src.services.openai_client import is_error_response
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class JokeWarmup:
+    """
+    Explains every joke of the corpus that has no stored explanation yet for the client's
+    model, with bounded concurrency, on a background thread.
+
+    Explanations go through `Joker.execute`, so they use the same prompt and fixed token
+    budget as interactive requests and are stored by it.
+
+    Attributes:
+        concurrency (int): Maximum explanations generated at once.
+        total (int): Jokes that needed an explanation when the warm-up started.
+        done (int): Explanations generated so far.
+        failed (int): Jokes whose explanation failed.
+    """
+
+    def __init__(self, client, store: JokeExplanationStore, concurrency: int = None):
+        """
+        Initializes the warm-up for a client's model.
+
+        Args:
+            client: The OpenAIGeniusClient used to generate explanations.
+            store (JokeExplanationStore): The store the explanations are kept in.
+            concurrency (int, optional): Maximum explanations generated at once. Defaults to settings.
+        """
+        self.client = client
+        self.store = store
+        self.concurrency = concurrency or settings.JOKE_WARMUP_CONCURRENCY
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def _explain(self, joker: Joker, joke: str):
+        if self._stop.is_set():
+            return
+        try:
+            explanation, _ = joker.execute(joke)
+            succeeded = not is_error_response(explanation)
+        except Exception as e:
+            logger.warning(f"Warm-up explanation failed: {e}")
+            succeeded = False
+        with self._lock:
+            if succeeded:
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def run(self):
+        """
+        Generates the missing explanations and returns when all are done or the warm-up is stopped.
+        """
+        jokes = self.store.missing(self.client.model, Joker.list_jokes())
+        self.total = len(jokes)
+        logger.info(f"Joke warm-up for {self.client.model}: {self.total} explanation(s) to generate.")
+        joker = Joker(self.client)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="joke-warmup") as executor:
+            list(executor.map(lambda joke: self._explain(joker, joke), jokes))
+        logger.info(f"Joke warm-up for {self.client.model} finished: {self.done} generated, {self.failed} failed.")
+
+    def start(self) -> "JokeWarmup":
+        """
+        Runs the warm-up on a daemon thread, unless it is already running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="joke-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Asks a running warm-up to stop; explanations in progress still complete.
+        """
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self) -> dict:
+        """
+        Returns the progress of the warm-up.
+        """
+        with self._lock:
+            return {"model": self.client.model, "running": self.running, "total": self.total,
+                    "done": self.done, "failed": self.failed}
+
+
+_warmups: Dict[str, JokeWarmup] = {}
+_warmups_lock = threading.Lock()
+
+
+def start_joke_warmup(client) -> Optional[JokeWarmup]:
+    """
+    Starts the process-wide warm-up for the client's model, once per model.
+
+    Args:
+        client: The OpenAIGeniusClient used to generate explanations.
+
+    Returns:
+        JokeWarmup | None: The warm-up for the model, or None when the explanation store is
+        disabled or the client routes each request to a model of its choice.
+    """
+    store = get_joke_explanation_store()
+    if store is None:
+        return None
+    if hasattr(client, "candidate_models"):
+        logger.info("Joke warm-up needs a fixed model; skipping it for a routed client.")
+        return None
+    with _warmups_lock:
+        warmup = _warmups.get(client.model)
+        if warmup is None:
+            warmup = _warmups[client.model] = JokeWarmup(client, store).start()
+        return warmup
+
+
+def main(argv: List[str] = None):
+    """
+    Generates all missing explanations for a model in the foreground.
+    """
+    from src.services.client_registry import get_shared_client
+
+    parser = argparse.ArgumentParser(description="Pre-generate explanations for the joke corpus.")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Model to generate explanations with")
+    parser.add_argument("--temperature", type=float, default=0.7, help="Sampling temperature")
+    parser.add_argument("--concurrency", type=int, default=None, help="Explanations generated at once")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        parser.error("OPENAI_API_KEY must be set")
+    store = get_joke_explanation_store()
+    if store is None:
+        parser.error("The joke explanation store is disabled (GENIUS_JOKE_STORE_ENABLED)")
+
+    client = get_shared_client(api_key, args.model, args.temperature, settings.JOKE_STORE_MAX_TOKENS)
+    warmup = JokeWarmup(client, store, args.concurrency)
+    warmup.run()
+    print(warmup.status())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.services.base_operation import OpenAIOperation
+from src.services.openai_client import is_error_response
+from src.services.prompt_registry import render_prompt
+from src.services.text_translator_service import TextTranslator
+from src.services.token_usage import TokenUsage
+from src.services.translation_memory import MemoryMatch, TranslationMemory, get_translation_memory
+from src.utils.text_segmenter import split_sentences
+from src.utils.token_counter import count_tokens
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+def _parse_segment_translations(content: str, expected: int) -> Optional[List[str]]:
+    """
+    Parses the JSON array of translations returned for a group of segments.
+
+    Returns:
+        list | None: The translations, or None if the response is not a list of `expected` strings.
+    """
+    content = content.strip()
+    if content.startswith("```"):
+        # Tolerate a fenced code block around the JSON
+        content = content.strip("`")
+        content = content[content.find("["):] if "[" in content else content
+    try:
+        translations = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(translations, list) or len(translations) != expected:
+        return None
+    if not all(isinstance(translation, str) for translation in translations):
+        return None
+    return translations
+
+
+class MemoryTranslator(OpenAIOperation):
+    """
+    A class that implements the OpenAIOperation interface to translate text through the
+    translation memory.
+
+    The text is split into sentences. Sentences with an exact match in the memory reuse the
+    stored translation; the remaining distinct sentences are sent upstream in token-bounded
+    groups, with fuzzy matches passed along as reference translations. New translations are
+    stored back, and the result is stitched together with the original whitespace.
+
+    Attributes:
+        leverage (dict): Reuse statistics of the last execution: segment counts and the
+            share of words served from the memory (`leverage_percent`) or helped by a fuzzy
+            match (`fuzzy_percent`).
+    """
+
+    def __init__(self, source_lang: str, target_lang: str, text: str,
+                 memory: Optional[TranslationMemory] = None, batch_tokens: int = None):
+        """
+        Initializes the MemoryTranslator and splits the text into sentences.
+
+        Args:
+            source_lang (str): The source language of the text.
+            target_lang (str): The target language for translation.
+            text (str): The text to be translated.
+            memory (TranslationMemory, optional): The memory to use. Defaults to the shared memory.
+            batch_tokens (int, optional): Token budget of the segments sent in one request. Defaults to settings.
+
+        Raises:
+            ValueError: If the input is invalid or no translation memory is configured.
+        """
+        if not text or not source_lang or not target_lang:
+            raise ValueError("Text, source language, and target language are required")
+        if source_lang == target_lang:
+            raise ValueError("Source and target languages must be different")
+        self.memory = memory or get_translation_memory()
+        if self.memory is None:
+            raise ValueError("Translation memory is disabled")
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.text = text
+        self.batch_tokens = batch_tokens or settings.TRANSLATION_MEMORY_BATCH_TOKENS
+        self.segments = split_sentences(text)
+        self.leverage: Dict[str, float] = {}
+        logger.info(f"MemoryTranslator initialized with {len(self.segments)} segments, "
+                    f"source_lang: {self.source_lang}, target_lang: {self.target_lang}")
+
+    def execute(self, client) -> Tuple[str, TokenUsage]:
+        """
+        Translates the text, reusing the memory, with the provided OpenAI client.
+
+        Args:
+            client: The OpenAIGeniusClient instance used for the unmatched segments.
+
+        Returns:
+            Tuple[str, TokenUsage]: The translated text and the token usage.
+        """
+        matches, pending = self._lookup()
+        translations: Dict[str, str] = {}
+        total_usage = TokenUsage()
+        for group in self._groups(pending):
+            system_msg, user_msg = self._group_request(group, matches)
+            content, usage = client.call_openai_api(system_msg, user_msg)
+            total_usage += usage
+            if is_error_response(content):
+                return content, total_usage
+            results = _parse_segment_translations(content, len(group))
+            if results is None:
+                logger.warning(f"Unusable response for a group of {len(group)} segments; translating them one by one.")
+                results = []
+                for segment in group:
+                    translation, usage = TextTranslator(self.source_lang, self.target_lang, segment).execute(client)
+                    total_usage += usage
+                    if is_error_response(translation):
+                        return translation, total_usage
+                    results.append(translation)
+            translations.update(self._store(group, results))
+        return self._finish(matches, translations), total_usage
+
+    async def aexecute(self, client) -> Tuple[str, TokenUsage]:
+        """
+        Translates the text, reusing the memory, with the provided async OpenAI client.
+        Groups of unmatched segments are translated concurrently.
+
+        Args:
+            client: The AsyncOpenAIGeniusClient instance used for the unmatched segments.
+
+        Returns:
+            Tuple[str, TokenUsage]: The translated text and the token usage.
+        """
+        matches, pending = self._lookup()
+
+        async def translate_group(group: List[str]) -> Tuple[Optional[List[str]], str, TokenUsage]:
+            system_msg, user_msg = self._group_request(group, matches)
+            content, usage = await client.call_openai_api(system_msg, user_msg)
+            if is_error_response(content):
+                return None, content, usage
+            results = _parse_segment_translations(content, len(group))
+            if results is None:
+                logger.warning(f"Unusable response for a group of {len(group)} segments; translating them one by one.")
+                fallbacks = await asyncio.gather(*(
+                    TextTranslator(self.source_lang, self.target_lang, segment).aexecute(client) for segment in group
+                ))
+                usage = sum((fallback_usage for _, fallback_usage in fallbacks), usage)
+                results = [translation for translation, _ in fallbacks]
+                for translation in results:
+                    if is_error_response(translation):
+                        return None, translation, usage
+            return results, content, usage
+
+        groups = self._groups(pending)
+        outcomes = await asyncio.gather(*(translate_group(group) for group in groups))
+        translations: Dict[str, str] = {}
+        total_usage = sum((usage for _, _, usage in outcomes), TokenUsage())
+        error = None
+        for group, (results, content, _) in zip(groups, outcomes):
+            if results is None:
+                error = error or content
+            else:
+                translations.update(self._store(group, results))
+        if error is not None:
+            return error, total_usage
+        return self._finish(matches, translations), total_usage
+
+    def _lookup(self) -> Tuple[List[Optional[MemoryMatch]], List[str]]:
+        """
+        Looks up every segment and computes the leverage statistics.
+
+        Returns:
+            tuple: The match of each segment (None if unmatched), and the distinct segments
+            that need an upstream translation, in document order.
+        """
+        matches = [self.memory.lookup(self.source_lang, self.target_lang, segment) for segment, _ in self.segments]
+        pending = list(dict.fromkeys(
+            segment for (segment, _), match in zip(self.segments, matches) if match is None or not match.exact
+        ))
+
+        words = {"exact": 0, "fuzzy": 0, "new": 0}
+        counts = {"exact": 0, "fuzzy": 0, "new": 0}
+        for (segment, _), match in zip(self.segments, matches):
+            kind = "new" if match is None else "exact" if match.exact else "fuzzy"
+            counts[kind] += 1
+            words[kind] += len(segment.split())
+        total_words = sum(words.values()) or 1
+        self.leverage = {
+            "segments": len(self.segments),
+            "exact": counts["exact"],
+            "fuzzy": counts["fuzzy"],
+            "new": counts["new"],
+            "leverage_percent": round(100 * words["exact"] / total_words, 1),
+            "fuzzy_percent": round(100 * words["fuzzy"] / total_words, 1),
+        }
+        logger.info(f"Translation memory leverage: {self.leverage}")
+        return matches, pending
+
+    def _groups(self, pending: List[str]) -> List[List[str]]:
+        """
+        Packs the pending segments into consecutive groups within the token budget.
+        """
+        groups, current, current_tokens = [], [], 0
+        for segment in pending:
+            tokens = count_tokens(segment)
+            if current and current_tokens + tokens > self.batch_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(segment)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def _group_request(self, group: List[str], matches: List[Optional[MemoryMatch]]) -> Tuple[str, str]:
+        """
+        Builds the system and user messages translating a group of segments.
+        """
+        fuzzy = {segment: match for (segment, _), match in zip(self.segments, matches)
+                 if match is not None and not match.exact}
+        references = [{"source": fuzzy[segment].source, "translation": fuzzy[segment].target}
+                      for segment in group if segment in fuzzy]
+        payload = {"segments": group}
+        if references:
+            payload["references"] = references
+        system_msg = render_prompt('translation_memory', 'SYSTEM_SEGMENT_TRANSLATOR',
+                                   source_lang=self.source_lang, target_lang=self.target_lang)
+        return system_msg, json.dumps(payload, ensure_ascii=False)
+
+    def _store(self, group: List[str], results: List[str]) -> Dict[str, str]:
+        """
+        Adds new segment translations to the memory and returns them by segment.
+        """
+        for segment, translation in zip(group, results):
+            self.memory.add(self.source_lang, self.target_lang, segment, translation.strip())
+        return {segment: translation.strip() for segment, translation in zip(group, results)}
+
+    def _finish(self, matches: List[Optional[MemoryMatch]], translations: Dict[str, str]) -> str:
+        """
+        Stitches the segment translations together with the original whitespace.
+        """
+        leading = self.text[:len(self.text) - len(self.text.lstrip())]
+        parts = []
+        for (segment, separator), match in zip(self.segments, matches):
+            translation = match.target if match is not None and match.exact else translations[segment]
+            parts.append(translation + separator)
+        return leading + "".join(parts)
@@ -0,0 +1,151 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from src.services.rate_limiter import get_rate_limiter_stats
+from src.services.response_cache import get_default_cache
+from src.services.single_flight import get_single_flight
+from src.services.token_usage import TokenUsage
+from src.utils.metrics import MetricsRegistry
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+_registry = MetricsRegistry()
+
+# Operations (OpenAIOperation subclasses)
+OPERATION_DURATION = _registry.histogram(
+    "genius_operation_duration_seconds", "Total time spent in an operation.", ["operation"])
+OPERATION_TOKENS = _registry.counter(
+    "genius_operation_tokens_total", "Tokens reported by operations.", ["operation", "kind"])
+OPERATION_ERRORS = _registry.counter(
+    "genius_operation_errors_total", "Operations that raised, by error class.", ["operation", "error"])
+
+# Upstream OpenAI requests
+QUEUE_DURATION = _registry.histogram(
+    "genius_openai_queue_seconds", "Time requests waited for the client-side rate limiter.", ["model"])
+UPSTREAM_DURATION = _registry.histogram(
+    "genius_openai_upstream_seconds", "Time until the OpenAI API responded, per attempt; for streams, until the stream opened.", ["model"])
+UPSTREAM_TOKENS = _registry.counter(
+    "genius_openai_tokens_total", "Tokens billed by the OpenAI API.", ["model", "kind"])
+UPSTREAM_ERRORS = _registry.counter(
+    "genius_openai_errors_total", "Failed OpenAI API attempts, by error class.", ["model", "error"])
+UPSTREAM_RETRIES = _registry.counter(
+    "genius_openai_retries_total", "OpenAI API requests retried, by the error that caused the retry.",
+    ["model", "error"])
+
+# Batch API
+BATCH_API_REQUESTS = _registry.counter(
+    "genius_batch_api_requests_total",
+    "Requests sent through the Batch API, by result (completed, failed, or the status of a batch that ended early).",
+    ["model", "result"])
+
+# Hedged requests
+HEDGED_REQUESTS = _registry.counter(
+    "genius_hedged_requests_total",
+    "Slow requests that were due a hedge, by outcome (primary_won, hedge_won, failed, over_budget, not_admitted).",
+    ["model", "result"])
+
+# Model routing
+ROUTER_REQUESTS = _registry.counter(
+    "genius_router_requests_total",
+    "Routed requests by rule, serving model and result (ok, error, fallback_ok, fallback_error).",
+    ["rule", "model", "result"])
+
+# Near-duplicate cache
+NEAR_DUPLICATE_LOOKUPS = _registry.counter(
+    "genius_near_duplicate_lookups_total", "Near-duplicate cache lookups, by result (exact, near or miss).",
+    ["namespace", "result"])
+NEAR_DUPLICATE_SIMILARITY = _registry.histogram(
+    "genius_near_duplicate_similarity",
+    "Similarity of the closest cached request, for hits and for misses that had a candidate.",
+    ["namespace", "result"], buckets=(0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.98, 1.0))
+
+# HTTP routes
+HTTP_DURATION = _registry.histogram(
+    "genius_http_request_duration_seconds",
+    "Time to produce a REST API response; streamed responses are measured until the headers are sent.",
+    ["endpoint", "method", "status"])
+
+
+def _cache_stats():
+    cache = get_default_cache()
+    return cache.stats() if cache is not None else None
+
+
+def _cache_samples(field: str):
+    stats = _cache_stats()
+    return [((), stats[field])] if stats is not None else []
+
+
+def _single_flight_samples(field: str):
+    return [((), get_single_flight().stats()[field])]
+
+
+def _rate_limiter_samples():
+    return [((model,), depth) for model, depth in sorted(get_rate_limiter_stats().items())]
+
+
+_registry.callback("genius_cache_hits_total", "Response cache hits.", "counter",
+                   lambda: _cache_samples("hits"))
+_registry.callback("genius_cache_misses_total", "Response cache misses.", "counter",
+                   lambda: _cache_samples("misses"))
+_registry.callback("genius_cache_hit_ratio", "Share of response cache lookups that were hits.", "gauge",
+                   lambda: _cache_samples("hit_ratio"))
+_registry.callback("genius_cache_memory_entries", "Entries in the in-process response cache.", "gauge",
+                   lambda: _cache_samples("memory_entries"))
+_registry.callback("genius_single_flight_calls_total", "Coalescable requests that went upstream.", "counter",
+                   lambda: _single_flight_samples("calls"))
+_registry.callback("genius_single_flight_collapsed_total",
+                   "Requests served by an identical in-flight request.", "counter",
+                   lambda: _single_flight_samples("collapsed"))
+_registry.callback("genius_rate_limiter_queue_depth", "Requests waiting for the client-side rate limiter.",
+                   "gauge", _rate_limiter_samples, ["model"])
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Returns the process-wide metrics registry.
+    """
+    return _registry
+
+
+def render_metrics() -> str:
+    """
+    Renders all metrics in the Prometheus text format, for the `/metrics` endpoint.
+    """
+    return _registry.render()
+
+
+def record_tokens(counter, usage: TokenUsage, **labels):
+    """
+    Adds a TokenUsage to a token counter, split into prompt, completion and cached tokens.
+    """
+    if not isinstance(usage, TokenUsage):
+        return
+    counter.inc(usage.prompt_tokens, kind="prompt", **labels)
+    counter.inc(usage.completion_tokens, kind="completion", **labels)
+    counter.inc(usage.cached_tokens, kind="cached", **labels)
+
+
+@contextmanager
+def observe_operation(operation: str):
+    """
+    Measures an operation's duration and records the class of any error it raises.
+
+    Yields:
+        callable: Records the operation's result, so its token usage is counted.
+    """
+    start = time.perf_counter()
+
+    def record_result(result):
+        if isinstance(result, tuple) and len(result) == 2:
+            record_tokens(OPERATION_TOKENS, result[1], operation=operation)
+
+    try:
+        yield record_result
+    except Exception as e:
+        OPERATION_ERRORS.inc(operation=operation, error=type(e).__name__)
+        raise
+    finally:
+        OPERATION_DURATION.observe(time.perf_counter() - start, operation=operation)
@@ -0,0 +1,566 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import openai
+
+from src.config import settings
+from src.config.models import get_context_window, get_max_output_tokens
+from src.services.async_openai_client import AsyncOpenAIGeniusClient
+from src.services.client_registry import get_shared_client
+from src.services.metrics import ROUTER_REQUESTS
+from src.services.openai_client import ERROR_RESPONSE_PREFIX, _create_messages
+from src.services.rate_limiter import get_queue_depth
+from src.services.routing_context import RoutingContext, get_routing_context
+from src.services.token_usage import TokenUsage
+from src.utils.hashing import hash_api_key
+from src.utils.load_yaml import load_yaml
+from src.utils.log_sanitizer import loggable_text
+from src.utils.token_counter import ContextWindowExceededError, count_message_tokens
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Model name that selects routing instead of a fixed model
+AUTO_MODEL = "auto"
+
+# Model used for "auto" when routing is disabled
+UNROUTED_MODEL = "gpt-3.5-turbo"
+
+DEFAULT_POLICY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "config", "model_routing.yml")
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """
+    One entry of the routing policy: conditions on a request and the models to try for it.
+
+    Attributes:
+        name (str): Label used in logs and metrics.
+        models (tuple): Candidate models, in order of preference.
+        operations (frozenset | None): Operation class names the rule applies to; None for any.
+        min_input_tokens (int | None): Smallest prompt size the rule applies to.
+        max_input_tokens (int | None): Largest prompt size the rule applies to.
+        language_pairs (frozenset | None): Lowercased "source->target" pairs; None for any.
+        prefer (str): "order" to try the models as listed, "fastest" to try them by observed latency.
+    """
+    name: str
+    models: Tuple[str, ...]
+    operations: Optional[FrozenSet[str]] = None
+    min_input_tokens: Optional[int] = None
+    max_input_tokens: Optional[int] = None
+    language_pairs: Optional[FrozenSet[str]] = None
+    prefer: str = "order"
+
+    @classmethod
+    def from_dict(cls, data: dict, index: int) -> "RoutingRule":
+        """
+        Builds a rule from its policy file entry.
+
+        Raises:
+            ValueError: If the entry has no models or an unknown preference.
+        """
+        models = tuple(data.get("models") or ())
+        if not models:
+            raise ValueError(f"Routing rule {index} has no models")
+        prefer = data.get("prefer", "order")
+        if prefer not in ("order", "fastest"):
+            raise ValueError(f"Routing rule {index} has unknown preference {prefer!r}")
+        pairs = data.get("language_pairs")
+        return cls(
+            name=data.get("name") or f"rule-{index}",
+            models=models,
+            operations=frozenset(data["operations"]) if data.get("operations") else None,
+            min_input_tokens=data.get("min_input_tokens"),
+            max_input_tokens=data.get("max_input_tokens"),
+            language_pairs=frozenset(_normalize_pair(pair) for pair in pairs) if pairs else None,
+            prefer=prefer,
+        )
+
+    def matches(self, input_tokens: int, context: RoutingContext) -> bool:
+        """
+        Tells whether the rule applies to a request.
+        """
+        if self.operations is not None and context.operation not in self.operations:
+            return False
+        if self.min_input_tokens is not None and input_tokens < self.min_input_tokens:
+            return False
+        if self.max_input_tokens is not None and input_tokens > self.max_input_tokens:
+            return False
+        if self.language_pairs is not None:
+            if not context.source_lang or not context.target_lang:
+                return False
+            if _normalize_pair(f"{context.source_lang}->{context.target_lang}") not in self.language_pairs:
+                return False
+        return True
+
+
+def _is_model_failure(exc: BaseException) -> bool:
+    """
+    Tells whether an error says something about the model rather than about the caller.
+
+    Connection failures, timeouts and server errors count against a model's health and are
+    worth retrying on another model. Authentication, quota, rate limit and invalid request
+    errors belong to the caller's key or request, so they neither affect the health shared
+    by every key nor trigger a fallback.
+    """
+    if isinstance(exc, openai.APIConnectionError):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 408 or exc.status_code >= 500
+    return False
+
+
+def _model_unavailable(exc: BaseException) -> bool:
+    """
+    Tells whether the caller's key cannot use the model, so another model may still serve it.
+    """
+    return isinstance(exc, (openai.PermissionDeniedError, openai.NotFoundError))
+
+
+def _normalize_pair(pair: str) -> str:
+    source, _, target = pair.partition("->")
+    return f"{source.strip().lower()}->{target.strip().lower()}"
+
+
+@dataclass
+class ModelHealth:
+    """
+    Observed behaviour of one model.
+
+    Attributes:
+        latency (float | None): Exponentially weighted moving average of successful request latency, in seconds.
+        error_rate (float): Exponentially weighted moving average of the failure rate.
+        consecutive_failures (int): Failures since the last success.
+        cooldown_until (float): Monotonic time until which the model is avoided after repeated failures.
+        requests (int): Requests observed.
+    """
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    requests: int = 0
+
+
+@dataclass
+class RouteDecision:
+    """
+    The models to try for a request, best first, and the rule that selected them.
+    """
+    rule: str
+    models: List[str] = field(default_factory=list)
+
+
+class ModelRouter:
+    """
+    Chooses the model for each completion request from a policy and from the observed
+    latency and error rate of each model.
+
+    Attributes:
+        rules (list): The routing rules, tried in order.
+        alpha (float): Weight of the latest observation in the moving averages.
+        error_threshold (float): Error rate above which a model is avoided.
+        failure_threshold (int): Consecutive failures after which a model cools down.
+        cooldown_seconds (float): How long a failing model is avoided.
+        max_queue_depth (int): Rate limiter queue depth above which a model counts as overloaded.
+    """
+
+    def __init__(self, rules: List[RoutingRule], alpha: float = None, error_threshold: float = None,
+                 failure_threshold: int = None, cooldown_seconds: float = None, max_queue_depth: int = None):
+        """
+        Initializes the router with its policy; thresholds default to settings.
+
+        Raises:
+            ValueError: If there are no rules.
+        """
+        if not rules:
+            raise ValueError("A routing policy needs at least one rule")
+        self.rules = rules
+        self.alpha = alpha or settings.ROUTER_LATENCY_ALPHA
+        self.error_threshold = error_threshold or settings.ROUTER_ERROR_THRESHOLD
+        self.failure_threshold = failure_threshold or settings.ROUTER_FAILURE_THRESHOLD
+        self.cooldown_seconds = cooldown_seconds or settings.ROUTER_COOLDOWN_SECONDS
+        self.max_queue_depth = max_queue_depth or settings.ROUTER_MAX_QUEUE_DEPTH
+        self._health: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ModelRouter":
+        """
+        Loads the routing policy from a YAML file.
+        """
+        policy = load_yaml(path) or {}
+        rules = [RoutingRule.from_dict(rule, index) for index, rule in enumerate(policy.get("rules") or [])]
+        logger.info(f"Loaded {len(rules)} routing rule(s) from {path}.")
+        return cls(rules, **kwargs)
+
+    def _available(self, model: str, now: float, queue_depths: Dict[str, int]) -> bool:
+        """
+        Tells whether a model is healthy and not overloaded. Must be called with the lock held.
+        """
+        health = self._health.get(model)
+        if health is not None and (health.cooldown_until > now or health.error_rate > self.error_threshold):
+            return False
+        return queue_depths.get(model, 0) <= self.max_queue_depth
+
+    def route(self, input_tokens: int, context: RoutingContext = None,
+              queue_depths: Dict[str, int] = None) -> RouteDecision:
+        """
+        Orders the candidate models for a request.
+
+        Models whose context window cannot hold the prompt are dropped. Unhealthy or
+        overloaded models are kept at the end, as a last resort.
+
+        Args:
+            input_tokens (int): Prompt size of the request.
+            context (RoutingContext, optional): The operation issuing the request. Defaults to the current one.
+            queue_depths (dict, optional): Callers waiting at each model's rate limiter.
+
+        Returns:
+            RouteDecision: The models to try, best first.
+        """
+        context = context or get_routing_context()
+        queue_depths = queue_depths or {}
+        rule = next((rule for rule in self.rules if rule.matches(input_tokens, context)), self.rules[-1])
+        models = [model for model in rule.models if get_context_window(model) > input_tokens] or list(rule.models)
+
+        now = time.monotonic()
+        with self._lock:
+            def rank(item):
+                position, model = item
+                health = self._health.get(model)
+                # Unmeasured models sort first under "fastest", so they get measured
+                latency = health.latency if health is not None and health.latency is not None else 0.0
+                preference = latency if rule.prefer == "fastest" else position
+                return not self._available(model, now, queue_depths), preference, position
+
+            ordered = [model for _, model in sorted(enumerate(models), key=rank)]
+        return RouteDecision(rule.name, ordered)
+
+    def record(self, model: str, latency: Optional[float], ok: bool):
+        """
+        Updates a model's health after a request.
+
+        Args:
+            model (str): The model that served the request.
+            latency (float | None): Request latency in seconds; None if it should not count
+                (e.g. a cache hit).
+            ok (bool): Whether the request succeeded.
+        """
+        with self._lock:
+            health = self._health.setdefault(model, ModelHealth())
+            health.requests += 1
+            health.error_rate += self.alpha * ((0.0 if ok else 1.0) - health.error_rate)
+            if ok:
+                health.consecutive_failures = 0
+                if latency is not None:
+                    health.latency = latency if health.latency is None else \
+                        health.latency + self.alpha * (latency - health.latency)
+            else:
+                health.consecutive_failures += 1
+                if health.consecutive_failures >= self.failure_threshold:
+                    health.cooldown_until = time.monotonic() + self.cooldown_seconds
+                    # Give the model a clean slate once the cooldown ends
+                    health.error_rate = 0.0
+                    health.consecutive_failures = 0
+                    logger.warning(f"Model {model} failed repeatedly; avoiding it for {self.cooldown_seconds}s.")
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Returns the observed health of each model.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                model: {"latency": health.latency, "error_rate": round(health.error_rate, 3),
+                        "cooling_down": health.cooldown_until > now, "requests": health.requests}
+                for model, health in self._health.items()
+            }
+
+
+class _RoutedClientBase:
+    """
+    Routing logic shared by the synchronous and asynchronous routed clients.
+    """
+
+    model = AUTO_MODEL
+
+    def __init__(self, api_key: str, temperature: float, max_tokens: int, router: Optional[ModelRouter]):
+        if not api_key:
+            raise ValueError("API key is required")
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.router = router or get_model_router()
+        self._api_key = api_key
+        self.api_key_hash = hash_api_key(api_key)
+
+    def _client(self, model: str):
+        raise NotImplementedError
+
+    def _route(self, messages: List[dict]) -> Tuple[int, RouteDecision]:
+        input_tokens = count_message_tokens(messages)
+        queue_depths = {}
+        if settings.RATE_LIMIT_ENABLED:
+            for model in {model for rule in self.router.rules for model in rule.models}:
+                queue_depths[model] = get_queue_depth(self.api_key_hash, model)
+        return input_tokens, self.router.route(input_tokens, queue_depths=queue_depths)
+
+    def _decide(self, messages: List[dict]) -> RouteDecision:
+        input_tokens, decision = self._route(messages)
+        logger.info(f"Routing request ({input_tokens} prompt tokens) by rule {decision.rule}: {decision.models}")
+        return decision
+
+    def candidate_models(self, messages: List[dict]) -> List[str]:
+        """
+        Returns the models a request would currently be tried on, best first, without sending it.
+        """
+        return self._route(messages)[1].models
+
+    def _record(self, decision: RouteDecision, model: str, start: float, usage: Optional[TokenUsage],
+                error: Optional[BaseException], attempt: int) -> bool:
+        """
+        Records the outcome of a request on one model.
+
+        Returns:
+            bool: Whether the request should be retried on the next candidate model.
+        """
+        # Cache hits and coalesced requests report no usage and say nothing about the model's latency
+        latency = time.perf_counter() - start if usage is not None and usage.total_tokens else None
+        model_failure = error is not None and _is_model_failure(error)
+        if error is None or model_failure:
+            self.router.record(model, latency, error is None)
+        result = "ok" if error is None else "error"
+        ROUTER_REQUESTS.inc(rule=decision.rule, model=model, result=result if attempt == 0 else f"fallback_{result}")
+        if error is None:
+            return False
+        logger.error(f"Error during chat completion with {model}: {error}")
+        fall_back = (model_failure or _model_unavailable(error)) and attempt + 1 < len(decision.models)
+        if fall_back:
+            logger.warning(f"Model {model} failed; falling back to {decision.models[attempt + 1]}.")
+        return fall_back
+
+
+class RoutedClient(_RoutedClientBase):
+    """
+    Drop-in replacement for `OpenAIGeniusClient` that picks the model per request with a
+    `ModelRouter` and falls back to the next candidate when a request fails.
+
+    Requests go through the pooled per-model clients of `src.services.client_registry`, so
+    caching, rate limiting and retries apply per model as usual.
+
+    Attributes:
+        model (str): Always "auto".
+        temperature (float): The sampling temperature.
+        max_tokens (int): The completion token limit, clamped to each model's maximum.
+        api_key_hash (str): Digest of the API key, scoping caches to the key.
+    """
+
+    def __init__(self, api_key: str, temperature: float, max_tokens: int, router: ModelRouter = None):
+        """
+        Initializes the routed client.
+        """
+        super().__init__(api_key, temperature, max_tokens, router)
+
+    def _client(self, model: str):
+        return get_shared_client(self._api_key, model, self.temperature,
+                                 min(self.max_tokens, get_max_output_tokens(model)))
+
+    def get_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                            use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
+        """
+        Fetches a chat completion from the best available model, falling back on failure.
+        See `OpenAIGeniusClient.get_chat_completion`.
+        """
+        content, usage, _ = self.get_routed_completion(messages, temperature, max_tokens, use_cache, response_format)
+        return content, usage
+
+    def get_routed_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                              use_cache: bool = True,
+                              response_format: dict = None) -> Tuple[str, TokenUsage, Optional[str]]:
+        """
+        Like `get_chat_completion`, but also returns the model that served the request, or
+        None if the request failed.
+        """
+        decision = self._decide(messages)
+        error = None
+        for attempt, model in enumerate(decision.models):
+            start = time.perf_counter()
+            try:
+                content, usage = self._client(model).fetch_chat_completion(messages, temperature, max_tokens,
+                                                                           use_cache, response_format)
+            except ContextWindowExceededError as e:
+                # The prompt does not fit this model; try the next one
+                logger.warning(f"Skipping model {model}: {e}")
+                error = e
+                continue
+            except Exception as e:
+                error = e
+                if self._record(decision, model, start, None, e, attempt):
+                    continue
+                break
+            self._record(decision, model, start, usage, None, attempt)
+            return content, usage, model
+        if isinstance(error, ContextWindowExceededError):
+            raise error
+        return f"{ERROR_RESPONSE_PREFIX}{error}", TokenUsage(), None
+
+    def stream_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                               use_cache: bool = True) -> Iterator[Tuple[str, Optional[TokenUsage]]]:
+        """
+        Streams a chat completion from the best available model. Falls back to the next model
+        if the stream fails before producing output; later errors are raised to the caller.
+        See `OpenAIGeniusClient.stream_chat_completion`.
+        """
+        decision = self._decide(messages)
+        error = None
+        for attempt, model in enumerate(decision.models):
+            start = time.perf_counter()
+            stream = self._client(model).stream_chat_completion(messages, temperature, max_tokens, use_cache)
+            try:
+                first = next(stream)
+            except ContextWindowExceededError as e:
+                logger.warning(f"Skipping model {model}: {e}")
+                error = e
+                continue
+            except Exception as e:
+                if self._record(decision, model, start, None, e, attempt):
+                    error = e
+                    continue
+                raise
+
+            yield first
+            usage = None
+            for delta, usage in stream:
+                yield delta, usage
+            self._record(decision, model, start, usage or first[1], None, attempt)
+            return
+        raise error
+
+    def call_openai_api(self, system_msg: str, user_msg: str) -> Tuple[str, TokenUsage]:
+        """
+        Helper function to structure messages and call the routed model.
+        """
+        logger.info(f"Preparing routed call with system message {loggable_text(system_msg)} "
+                    f"and user message {loggable_text(user_msg)}")
+        return self.get_chat_completion(_create_messages(system_msg, user_msg))
+
+    def call_openai_api_stream(self, system_msg: str, user_msg: str) -> Iterator[Tuple[str, Optional[TokenUsage]]]:
+        """
+        Helper function to structure messages and stream the response of the routed model.
+        """
+        return self.stream_chat_completion(_create_messages(system_msg, user_msg))
+
+
+class AsyncRoutedClient(_RoutedClientBase):
+    """
+    Asyncio counterpart of `RoutedClient`, routing over `AsyncOpenAIGeniusClient` instances
+    created per model on first use. Must be closed with `close`.
+    """
+
+    def __init__(self, api_key: str, temperature: float, max_tokens: int, router: ModelRouter = None):
+        """
+        Initializes the routed client.
+        """
+        super().__init__(api_key, temperature, max_tokens, router)
+        self._clients: Dict[str, AsyncOpenAIGeniusClient] = {}
+
+    def _client(self, model: str) -> AsyncOpenAIGeniusClient:
+        client = self._clients.get(model)
+        if client is None:
+            client = self._clients[model] = AsyncOpenAIGeniusClient(
+                self._api_key, model, self.temperature, min(self.max_tokens, get_max_output_tokens(model))
+            )
+        return client
+
+    async def get_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                                  use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
+        """
+        Fetches a chat completion from the best available model, falling back on failure.
+        """
+        content, usage, _ = await self.get_routed_completion(messages, temperature, max_tokens, use_cache,
+                                                             response_format)
+        return content, usage
+
+    async def get_routed_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                                    use_cache: bool = True,
+                                    response_format: dict = None) -> Tuple[str, TokenUsage, Optional[str]]:
+        """
+        Like `get_chat_completion`, but also returns the model that served the request, or
+        None if the request failed.
+        """
+        decision = self._decide(messages)
+        error = None
+        for attempt, model in enumerate(decision.models):
+            start = time.perf_counter()
+            try:
+                content, usage = await self._client(model).fetch_chat_completion(
+                    messages, temperature, max_tokens, use_cache, response_format
+                )
+            except ContextWindowExceededError as e:
+                logger.warning(f"Skipping model {model}: {e}")
+                error = e
+                continue
+            except Exception as e:
+                error = e
+                if self._record(decision, model, start, None, e, attempt):
+                    continue
+                break
+            self._record(decision, model, start, usage, None, attempt)
+            return content, usage, model
+        if isinstance(error, ContextWindowExceededError):
+            raise error
+        return f"{ERROR_RESPONSE_PREFIX}{error}", TokenUsage(), None
+
+    async def call_openai_api(self, system_msg: str, user_msg: str) -> Tuple[str, TokenUsage]:
+        """
+        Helper function to structure messages and call the routed model.
+        """
+        return await self.get_chat_completion(_create_messages(system_msg, user_msg))
+
+    async def close(self):
+        """
+        Closes the per-model clients.
+        """
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """
+    Returns the process-wide router, loaded from `settings.ROUTER_POLICY_PATH` or the bundled policy.
+    """
+    global _default_router
+    with _default_router_lock:
+        if _default_router is None:
+            _default_router = ModelRouter.from_file(settings.ROUTER_POLICY_PATH or DEFAULT_POLICY_PATH)
+        return _default_router
+
+
+def get_client(api_key: str, model: str, temperature: float, max_tokens: int):
+    """
+    Returns a routed client for model "auto" and the pooled client for any other model.
+    With routing disabled, "auto" stands for `UNROUTED_MODEL`.
+
+    Args:
+        api_key (str): OpenAI API key.
+        model (str): Model name, or "auto" to route each request.
+        temperature (float): Sampling temperature.
+        max_tokens (int): Completion token limit.
+
+    Returns:
+        RoutedClient | OpenAIGeniusClient: The client.
+    """
+    if model == AUTO_MODEL:
+        if settings.ROUTER_ENABLED:
+            return RoutedClient(api_key, temperature, max_tokens)
+        model = UNROUTED_MODEL
+    return get_shared_client(api_key, model, temperature, max_tokens)
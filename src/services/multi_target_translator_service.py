@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.config.models import get_context_window, get_max_output_tokens
+from src.services.base_operation import OpenAIOperation
+from src.services.openai_client import _create_messages, is_error_response
+from src.services.prompt_registry import render_prompt
+from src.services.text_translator_service import TextTranslator
+from src.services.token_usage import TokenUsage
+from src.utils.token_counter import count_message_tokens, count_tokens
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Completion tokens reserved per target language: the translation may be longer than the
+# source in tokens, plus the JSON key and quoting
+_TOKENS_PER_SOURCE_TOKEN = 2
+_JSON_OVERHEAD_TOKENS = 16
+
+
+def _parse_translations(content: str, target_langs: List[str]) -> Dict[str, str]:
+    """
+    Parses the JSON object of translations keyed by language.
+
+    Returns:
+        dict: The usable translations, keyed by target language as requested; languages that
+        are missing, empty or not strings are left out. Keys are matched case-insensitively.
+    """
+    try:
+        translations = json.loads(content)
+    except ValueError:
+        return {}
+    if not isinstance(translations, dict):
+        return {}
+    by_name = {str(key).strip().lower(): value for key, value in translations.items()}
+    parsed = {}
+    for target_lang in target_langs:
+        translation = by_name.get(target_lang.strip().lower())
+        if isinstance(translation, str) and translation.strip():
+            parsed[target_lang] = translation
+    return parsed
+
+
+class MultiTargetTranslator(OpenAIOperation):
+    """
+    A class that implements the OpenAIOperation interface to translate one text into several
+    languages with a single completion.
+
+    All target languages are requested at once as a JSON object, so the source text is sent
+    once instead of once per language. When the translations would not fit in one completion
+    of the model, the languages are split into as few groups as fit. Languages missing from
+    the response, or the whole response if it cannot be parsed, are translated with one
+    `TextTranslator` call each.
+
+    Attributes:
+        fallback_languages (list): Languages of the last execution that needed a separate call.
+        errors (dict): Error messages of the last execution for languages that could not be translated.
+    """
+
+    def __init__(self, source_lang: str, target_langs: List[str], text: str):
+        """
+        Initializes the MultiTargetTranslator.
+
+        Args:
+            source_lang (str): The source language of the text.
+            target_langs (list): The languages to translate into; duplicates are ignored.
+            text (str): The text to be translated.
+
+        Raises:
+            ValueError: If any of the required parameters are missing, a target language equals
+                        the source language, or there are too many target languages.
+        """
+        target_langs = list(dict.fromkeys(lang.strip() for lang in target_langs or [] if lang and lang.strip()))
+        if not text or not source_lang or not target_langs:
+            raise ValueError("Text, source language, and at least one target language are required")
+        if source_lang in target_langs:
+            raise ValueError("Source and target languages must be different")
+        if len(target_langs) > settings.MULTI_TARGET_MAX_LANGUAGES:
+            raise ValueError(f"At most {settings.MULTI_TARGET_MAX_LANGUAGES} target languages are allowed")
+        self.source_lang = source_lang
+        self.target_langs = target_langs
+        self.text = text
+        self.fallback_languages: List[str] = []
+        self.errors: Dict[str, str] = {}
+        logger.info(f"MultiTargetTranslator initialized with source_lang: {self.source_lang}, "
+                    f"target_langs: {self.target_langs}")
+
+    def execute(self, client) -> Tuple[Dict[str, Optional[str]], TokenUsage]:
+        """
+        Translates the text into all target languages using the provided OpenAI client.
+
+        Args:
+            client: The OpenAIGeniusClient instance used to perform the translation.
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], TokenUsage]: The translation per target language,
+            None for languages listed in `errors`, and the total token usage.
+        """
+        translations, usage = {}, TokenUsage()
+        for group in self._groups(client):
+            messages, max_tokens = self._request(client, group)
+            content, group_usage = client.get_chat_completion(messages, max_tokens=max_tokens,
+                                                              response_format=JSON_RESPONSE_FORMAT)
+            usage += group_usage
+            translations.update(self._parse(content, group))
+        self._find_missing(translations)
+        for target_lang in self.fallback_languages:
+            translation, fallback_usage = TextTranslator(self.source_lang, target_lang, self.text).execute(client)
+            usage += fallback_usage
+            translations[target_lang] = self._fallback_result(target_lang, translation)
+        return self._ordered(translations), usage
+
+    async def aexecute(self, client) -> Tuple[Dict[str, Optional[str]], TokenUsage]:
+        """
+        Translates the text into all target languages using the provided async OpenAI client.
+        Combined requests and fallback translations run concurrently.
+
+        Args:
+            client: The AsyncOpenAIGeniusClient instance used to perform the translation.
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], TokenUsage]: The translation per target language,
+            None for languages listed in `errors`, and the total token usage.
+        """
+        groups = self._groups(client)
+
+        async def request(group: List[str]) -> Tuple[str, TokenUsage]:
+            messages, max_tokens = self._request(client, group)
+            return await client.get_chat_completion(messages, max_tokens=max_tokens,
+                                                    response_format=JSON_RESPONSE_FORMAT)
+
+        translations, usage = {}, TokenUsage()
+        for group, (content, group_usage) in zip(groups, await asyncio.gather(*(request(g) for g in groups))):
+            usage += group_usage
+            translations.update(self._parse(content, group))
+        self._find_missing(translations)
+        fallbacks = await asyncio.gather(*(
+            TextTranslator(self.source_lang, target_lang, self.text).aexecute(client)
+            for target_lang in self.fallback_languages
+        ))
+        for target_lang, (translation, fallback_usage) in zip(self.fallback_languages, fallbacks):
+            usage += fallback_usage
+            translations[target_lang] = self._fallback_result(target_lang, translation)
+        return self._ordered(translations), usage
+
+    def _per_language_tokens(self) -> int:
+        return _TOKENS_PER_SOURCE_TOKEN * count_tokens(self.text) + _JSON_OVERHEAD_TOKENS
+
+    def _groups(self, client) -> List[List[str]]:
+        """
+        Splits the target languages into groups whose translations fit in one completion of
+        the client's model, so no combined response is cut off at the output limit.
+
+        Returns:
+            list: The groups, in target language order; empty if not even one translation
+            fits, in which case every language is translated separately.
+        """
+        model = getattr(client, "model", None)
+        # The prompt listing every language is the largest a group can have
+        messages, _ = self._request(client, self.target_langs)
+        available = min(get_max_output_tokens(model), get_context_window(model) - count_message_tokens(messages, model))
+        per_group = available // self._per_language_tokens()
+        if per_group < 1:
+            logger.warning(f"One translation does not fit in a {model} completion; translating languages separately.")
+            return []
+        groups = [self.target_langs[i:i + per_group] for i in range(0, len(self.target_langs), per_group)]
+        if len(groups) > 1:
+            logger.info(f"Splitting {len(self.target_langs)} target languages into {len(groups)} combined requests.")
+        return groups
+
+    def _request(self, client, target_langs: List[str]) -> Tuple[List[dict], int]:
+        """
+        Builds the messages and the completion token limit of a combined request for some
+        of the target languages.
+
+        The completion budget is raised to fit every translation, within the model limits the
+        client enforces.
+        """
+        system_msg = render_prompt(
+            'multi_target_translator', 'SYSTEM_MULTI_TARGET_TRANSLATOR',
+            source_lang=self.source_lang,
+            target_langs=json.dumps(target_langs, ensure_ascii=False)
+        )
+        needed = len(target_langs) * self._per_language_tokens()
+        max_tokens = max(needed, getattr(client, "max_tokens", None) or 0)
+        return _create_messages(system_msg, self.text), max_tokens
+
+    @staticmethod
+    def _parse(content: str, target_langs: List[str]) -> Dict[str, str]:
+        """
+        Extracts the translations from a combined response.
+        """
+        return {} if is_error_response(content) else _parse_translations(content, target_langs)
+
+    def _find_missing(self, translations: Dict[str, str]):
+        """
+        Determines the fallback languages, those missing from the combined responses.
+        """
+        self.errors = {}
+        self.fallback_languages = [lang for lang in self.target_langs if lang not in translations]
+        if self.fallback_languages:
+            logger.warning(f"Combined translation missing {self.fallback_languages}; translating them separately.")
+
+    def _fallback_result(self, target_lang: str, translation: str) -> Optional[str]:
+        if is_error_response(translation):
+            self.errors[target_lang] = translation
+            return None
+        return translation
+
+    def _ordered(self, translations: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        logger.info(f"Multi-target translation completed: {len(self.target_langs)} languages, "
+                    f"{len(self.fallback_languages)} separately, {len(self.errors)} failed.")
+        return {target_lang: translations.get(target_lang) for target_lang in self.target_langs}
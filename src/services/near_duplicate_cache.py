@@ -0,0 +1,268 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, Optional, Tuple
+
+from src.config import settings
+from src.services.metrics import NEAR_DUPLICATE_LOOKUPS, NEAR_DUPLICATE_SIMILARITY
+from src.utils.minhash import LSHIndex, MinHasher, jaccard, normalize, shingles
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_NUMBER = re.compile(r"\d+")
+# Negations in normalized text; contractions such as "don't" are normalized to "don t"
+_NEGATION = re.compile(r"\b(?:not|no|never|none|nothing|nobody|nowhere|neither|nor|without|cannot|\w+n t)\b")
+
+_BANDS = 16
+_ROWS = 4
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+def fingerprint_text(text: str) -> str:
+    """
+    Normalizes a request for near-duplicate matching: lowercase, no punctuation, single spaces.
+    """
+    return normalize(_PUNCTUATION.sub(" ", text))
+
+
+@dataclass(frozen=True)
+class NearDuplicateHit:
+    """
+    A cached response served for a lookup.
+
+    Attributes:
+        value (str): The cached response.
+        similarity (float): Similarity between the lookup and the cached request, 1.0 for exact matches.
+        exact (bool): Whether the normalized requests are identical.
+    """
+    value: str
+    similarity: float
+    exact: bool
+
+
+@dataclass
+class _Entry:
+    shingles: FrozenSet[str]
+    value: str
+    expires_at: float
+    hits: int = 0
+
+
+class NearDuplicateCache:
+    """
+    In-process cache that serves a response for requests that are near-duplicates of an
+    earlier one, e.g. differing only in whitespace, casing, punctuation or a word or two.
+
+    Requests are normalized and compared by the Jaccard similarity of their character
+    trigrams. A MinHash/LSH index per namespace and scope finds candidates, which are
+    verified with the exact similarity against `threshold`. The scope holds everything that
+    must match exactly, such as the model and system prompt. Numbers and negations in the
+    text must match exactly as well, since "under 100 words" and "under 150 words", or "will
+    renew" and "will not renew", are near-identical text with a different meaning.
+
+    Attributes:
+        threshold (float): Minimum similarity for a near-duplicate hit.
+        max_entries (int): Maximum number of entries before one is evicted.
+        ttl_seconds (float): Lifetime of an entry in seconds.
+        eviction (str): "lru" evicts the least recently used entry, "lfu" the least reused one.
+    """
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 2048, ttl_seconds: float = 86400.0,
+                 eviction: str = "lru"):
+        """
+        Initializes an empty cache.
+
+        Raises:
+            ValueError: If the eviction policy is unknown or the threshold is not in (0, 1].
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {eviction!r}, expected one of {EVICTION_POLICIES}")
+        if not 0 < threshold <= 1:
+            raise ValueError("Threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.eviction = eviction
+        self._hasher = MinHasher(num_perm=_BANDS * _ROWS)
+        # Keyed by `_key`, in least recently used order; one LSH index per (namespace, scope, numbers, negations)
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._indexes: Dict[Tuple, LSHIndex] = {}
+        self._lock = threading.Lock()
+        self._counts = {"exact": 0, "near": 0, "miss": 0}
+        self._similarity_sum = 0.0
+
+    @staticmethod
+    def _key(namespace: str, scope: Hashable, normalized: str) -> Tuple:
+        """
+        Entry key: the index it belongs to, (namespace, scope, numbers and negations in the
+        text), and a hash of the normalized text.
+        """
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return namespace, (scope, tuple(_NUMBER.findall(normalized)), tuple(_NEGATION.findall(normalized))), digest
+
+    def _remove(self, key: Tuple):
+        """
+        Drops an entry and its index signature. Must be called with the lock held.
+        """
+        self._entries.pop(key, None)
+        index = self._indexes.get(key[:2])
+        if index is not None:
+            index.remove(key)
+            if not len(index):
+                del self._indexes[key[:2]]
+
+    def _record(self, namespace: str, result: str, similarity: Optional[float]):
+        """
+        Counts a lookup and its similarity. Must be called with the lock held.
+        """
+        self._counts[result] += 1
+        NEAR_DUPLICATE_LOOKUPS.inc(namespace=namespace, result=result)
+        if similarity is not None:
+            NEAR_DUPLICATE_SIMILARITY.observe(similarity, namespace=namespace, result=result)
+            if result != "miss":
+                self._similarity_sum += similarity
+
+    def get(self, namespace: str, scope: Hashable, text: str) -> Optional[NearDuplicateHit]:
+        """
+        Looks up a response for a request or a near-duplicate of it.
+
+        Args:
+            namespace (str): The kind of request, e.g. "prompt_generator".
+            scope (hashable): Values that must match exactly, e.g. the model and system prompt.
+            text (str): The request text compared for similarity.
+
+        Returns:
+            NearDuplicateHit | None: The most similar cached response above the threshold, or None.
+        """
+        normalized = fingerprint_text(text)
+        key = self._key(namespace, scope, normalized)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at >= now:
+                entry.hits += 1
+                self._entries.move_to_end(key)
+                self._record(namespace, "exact", 1.0)
+                return NearDuplicateHit(entry.value, 1.0, True)
+
+            index = self._indexes.get(key[:2])
+            best_key, best_similarity = None, None
+            if index is not None:
+                request_shingles = shingles(normalized)
+                for candidate_key, estimate in index.query(self._hasher.signature(request_shingles)):
+                    if estimate < self.threshold * 0.8:
+                        break  # Sorted by estimate; the rest are too far off to verify
+                    candidate = self._entries.get(candidate_key)
+                    if candidate is None or candidate.expires_at < now:
+                        continue
+                    similarity = jaccard(request_shingles, candidate.shingles)
+                    if best_similarity is None or similarity > best_similarity:
+                        best_key, best_similarity = candidate_key, similarity
+
+            if best_key is None or best_similarity < self.threshold:
+                self._record(namespace, "miss", best_similarity)
+                return None
+
+            entry = self._entries[best_key]
+            entry.hits += 1
+            self._entries.move_to_end(best_key)
+            self._record(namespace, "near", best_similarity)
+        logger.info(f"Near-duplicate cache hit in {namespace} with similarity {best_similarity:.3f}.")
+        return NearDuplicateHit(entry.value, best_similarity, False)
+
+    def set(self, namespace: str, scope: Hashable, text: str, value: str):
+        """
+        Stores the response to a request, evicting an entry when the cache is full.
+
+        Args:
+            namespace (str): The kind of request, e.g. "prompt_generator".
+            scope (hashable): Values that must match exactly, e.g. the model and system prompt.
+            text (str): The request text compared for similarity.
+            value (str): The response to serve for the request and its near-duplicates.
+        """
+        normalized = fingerprint_text(text)
+        key = self._key(namespace, scope, normalized)
+        request_shingles = frozenset(shingles(normalized))
+        signature = self._hasher.signature(request_shingles)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(request_shingles, value, time.monotonic() + self.ttl_seconds)
+            self._indexes.setdefault(key[:2], LSHIndex(_BANDS, _ROWS)).add(key, signature)
+            while len(self._entries) > self.max_entries:
+                self._remove(self._eviction_candidate())
+
+    def _eviction_candidate(self) -> Tuple:
+        """
+        Picks the entry to evict: an expired one if any, else by the eviction policy.
+        Must be called with the lock held.
+        """
+        now = time.monotonic()
+        for key, entry in self._entries.items():
+            if entry.expires_at < now:
+                return key
+        if self.eviction == "lfu":
+            # Ties go to the least recently used entry, which comes first in the ordering
+            return min(self._entries, key=lambda key: self._entries[key].hits)
+        return next(iter(self._entries))
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._indexes.clear()
+            self._counts = {"exact": 0, "near": 0, "miss": 0}
+            self._similarity_sum = 0.0
+
+    def stats(self) -> dict:
+        """
+        Returns the lookup counters, the mean similarity of hits and the number of entries.
+        """
+        with self._lock:
+            hits = self._counts["exact"] + self._counts["near"]
+            lookups = hits + self._counts["miss"]
+            return {
+                "exact_hits": self._counts["exact"],
+                "near_hits": self._counts["near"],
+                "misses": self._counts["miss"],
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "mean_hit_similarity": self._similarity_sum / hits if hits else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_near_duplicate_cache() -> Optional[NearDuplicateCache]:
+    """
+    Returns the process-wide near-duplicate cache configured from `src.config.settings`.
+
+    Returns:
+        NearDuplicateCache | None: The shared cache, or None when it is disabled.
+    """
+    global _default_cache
+    if not settings.NEAR_DUPLICATE_CACHE_ENABLED:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = NearDuplicateCache(settings.NEAR_DUPLICATE_CACHE_THRESHOLD,
+                                                settings.NEAR_DUPLICATE_CACHE_MAX_ENTRIES,
+                                                settings.NEAR_DUPLICATE_CACHE_TTL_SECONDS,
+                                                settings.NEAR_DUPLICATE_CACHE_EVICTION)
+            logger.info(f"Near-duplicate cache initialized (threshold {settings.NEAR_DUPLICATE_CACHE_THRESHOLD}, "
+                        f"eviction {settings.NEAR_DUPLICATE_CACHE_EVICTION}).")
+        return _default_cache
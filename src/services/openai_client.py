@@ -1,7 +1,30 @@
 import logging
+import time
+import openai
 from openai import OpenAI
-from tenacity import retry, wait_exponential, stop_after_attempt
-from typing import List, Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from src.config import settings
+from src.services.hedging import HedgePolicy, get_hedge_policy
+from src.services.metrics import QUEUE_DURATION, UPSTREAM_DURATION, UPSTREAM_ERRORS, UPSTREAM_TOKENS, record_tokens
+from src.services.rate_limiter import RateLimiter, get_rate_limiter
+from src.services.response_cache import CachedResponse, ResponseCache, get_default_cache, make_cache_key
+from src.services.retry_policy import completion_retry, retry_after_seconds
+from src.services.single_flight import SingleFlight, get_single_flight
+from src.services.token_usage import TokenUsage
+from src.utils.hashing import hash_api_key
+from src.utils.log_sanitizer import loggable_messages, loggable_text
+from src.utils.token_counter import ContextWindowExceededError, plan_completion_budget
+
+# Prefix of the message returned instead of a completion when a request fails after retries
+ERROR_RESPONSE_PREFIX = "An error occurred: "
+
+
+def is_error_response(content: str) -> bool:
+    """
+    Tells whether a completion returned by `get_chat_completion` is an error message.
+    """
+    return content.startswith(ERROR_RESPONSE_PREFIX)
 
 
 def _create_messages(system_msg: str, user_msg: str) -> List[dict]:
@@ -21,7 +44,107 @@ def _create_messages(system_msg: str, user_msg: str) -> List[dict]:
     ]
 
 
-class OpenAIGeniusClient:
+class _GeniusClientBase:
+    """
+    Settings, rate limiting, request coalescing and response-cache handling shared by the
+    synchronous and asynchronous clients.
+    """
+
+    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int,
+                 cache: Optional[ResponseCache]):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.cache = cache if cache is not None else get_default_cache()
+        self.api_key_hash = hash_api_key(api_key)
+        self.single_flight: Optional[SingleFlight] = get_single_flight() if settings.SINGLE_FLIGHT_ENABLED else None
+        self.hedging: Optional[HedgePolicy] = get_hedge_policy(model) if settings.HEDGING_ENABLED else None
+
+        # Initialize the logger
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """
+        The limiter shared by the API key and model, None when rate limiting is disabled.
+        Looked up on each use, since idle limiters are dropped from the registry.
+        """
+        return get_rate_limiter(self.api_key_hash, self.model) if settings.RATE_LIMIT_ENABLED else None
+
+    def _resolve_params(self, messages: List[dict], temperature: Optional[float],
+                        max_tokens: Optional[int]) -> Tuple[float, int, int]:
+        """
+        Falls back to the client settings for parameters that were not given explicitly and
+        clamps the completion length to the model limits before anything is sent.
+
+        Returns:
+            tuple: The temperature, the clamped completion token limit and the prompt token count.
+
+        Raises:
+            ContextWindowExceededError: If the prompt does not fit in the model's context window.
+        """
+        temperature = temperature if temperature is not None else self.temperature
+        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+        prompt_tokens, max_tokens = plan_completion_budget(messages, self.model, max_tokens)
+        return temperature, max_tokens, prompt_tokens
+
+    def _on_request_error(self, error: Exception):
+        """
+        Pauses every caller sharing the rate limiter when the API answers with a 429 that
+        says how long to back off.
+        """
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None or not isinstance(error, openai.RateLimitError):
+            return
+        retry_after = retry_after_seconds(error)
+        if retry_after:
+            rate_limiter.pause(min(retry_after, settings.RETRY_MAX_WAIT_SECONDS))
+
+    def _hedge_admission(self, tokens: int) -> Optional[Callable[[], bool]]:
+        """
+        Returns the check that lets a hedged request through only if the rate limiter has
+        capacity for it right away, so hedging never adds load while callers are queueing.
+        """
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None:
+            return None
+        return lambda: rate_limiter.try_acquire(tokens)
+
+    def _record_discarded(self, completion):
+        """
+        Accounts for the tokens of a hedged request whose response was not used.
+        """
+        usage = TokenUsage.from_completion(completion.usage)
+        record_tokens(UPSTREAM_TOKENS, usage, model=self.model)
+        self.logger.info(f"Discarded the response of a hedged request. Tokens used: {usage}")
+
+    def _cache_lookup(self, messages: List[dict], temperature: float, max_tokens: int, use_cache: bool,
+                      response_format: Optional[dict] = None) -> Tuple[Optional[str], Optional[CachedResponse]]:
+        """
+        Computes the cache key for a request and looks it up.
+
+        The key is also used to coalesce identical in-flight requests, so it is computed even
+        when caching is disabled.
+
+        Returns:
+            tuple: The cache key (None when the cache is bypassed) and the cached response, if any.
+        """
+        if not use_cache:
+            return None, None
+        cache_key = make_cache_key(self.api_key_hash, self.model, temperature, max_tokens, messages, response_format)
+        if self.cache is None:
+            return cache_key, None
+        return cache_key, self.cache.get(cache_key)
+
+    def _cache_store(self, cache_key: Optional[str], content: Optional[str], usage: TokenUsage):
+        """
+        Stores a successful response under the given key.
+        """
+        if self.cache is not None and cache_key is not None and content is not None:
+            self.cache.set(cache_key, (content, usage.total_tokens))
+
+
+class OpenAIGeniusClient(_GeniusClientBase):
     """
     A client to interact with OpenAI's API to perform various tasks such as code translation,
     sentiment analysis, text rephrasing, and more.
@@ -31,25 +154,65 @@ class OpenAIGeniusClient:
         model (str): The OpenAI model to be used for generating responses.
         temperature (float): The temperature to control the randomness of the model's output.
         max_tokens (int): The maximum number of tokens for the completion.
+        cache (ResponseCache | None): Cache for completion responses, None when caching is disabled.
+        hedging (HedgePolicy | None): Hedging of slow completions, None when hedging is disabled.
     """
 
-    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int):
+    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int,
+                 cache: Optional[ResponseCache] = None, openai_client: Optional[OpenAI] = None):
         """
         Initializes the OpenAIGeniusClient with the given API key, model, temperature, and max_tokens.
+        When no cache is given, the process-wide default cache is used. An existing `openai.OpenAI`
+        instance can be passed to share its connection pool; see `src.services.client_registry`.
         """
         if not api_key:
             raise ValueError("API key is required")
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
-        self.temperature = temperature
-        self.max_tokens = max_tokens
+        super().__init__(api_key, model, temperature, max_tokens, cache)
+        self.client = openai_client if openai_client is not None else OpenAI(
+            api_key=api_key,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES
+        )
 
-        # Initialize the logger
-        self.logger = logging.getLogger(__name__)
+    @completion_retry
+    def _create_completion(self, messages: List[dict], temperature: float, max_tokens: int,
+                           prompt_tokens: int, **kwargs):
+        """
+        Sends one chat completion request, waiting for rate limiter capacity first.
+        Transient failures are retried according to `src.services.retry_policy`; within an
+        attempt, a slow request may be hedged according to `src.services.hedging`.
+        """
+        tokens = prompt_tokens + max_tokens
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            QUEUE_DURATION.observe(rate_limiter.acquire(tokens), model=self.model)
+        if self.hedging is None or kwargs.get("stream"):
+            return self._send(messages, temperature, max_tokens, **kwargs)
+        return self.hedging.run(lambda: self._send(messages, temperature, max_tokens, **kwargs),
+                                admit=self._hedge_admission(tokens), on_discard=self._record_discarded)
 
-    @retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(5))
-    def get_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None) -> Tuple[
-        str, int]:
+    def _send(self, messages: List[dict], temperature: float, max_tokens: int, **kwargs):
+        """
+        Sends the request upstream.
+        """
+        start = time.perf_counter()
+        try:
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(model=self.model, error=type(e).__name__)
+            self._on_request_error(e)
+            raise
+        finally:
+            UPSTREAM_DURATION.observe(time.perf_counter() - start, model=self.model)
+
+    def get_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                            use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
         """
         Fetches chat completion results from OpenAI's API.
 
@@ -57,28 +220,109 @@ class OpenAIGeniusClient:
             messages (list): A list of formatted message dictionaries.
             temperature (float, optional): Temperature for controlling randomness. Defaults to class setting.
             max_tokens (int, optional): Maximum tokens for the completion. Defaults to class setting.
+            use_cache (bool, optional): Set to False to bypass the response cache for this call.
+            response_format (dict, optional): Structured output format, e.g. {"type": "json_object"}.
 
         Returns:
-            tuple: The generated content and the number of tokens used.
-        """
-        temperature = temperature if temperature is not None else self.temperature
-        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+            tuple: The generated content and its TokenUsage. Cache hits and responses shared with
+            an identical in-flight request report zero usage, and errors that persist after
+            retrying are returned as an error message.
 
+        Raises:
+            ContextWindowExceededError: If the prompt does not fit in the model's context window.
+        """
         try:
-            self.logger.info(f"Sending request to OpenAI API with messages: {messages}")
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            self.logger.info(f"Received response from OpenAI API. Total tokens used: {completion.usage.total_tokens}")
-            return completion.choices[0].message.content, completion.usage.total_tokens
+            return self.fetch_chat_completion(messages, temperature, max_tokens, use_cache, response_format)
+        except ContextWindowExceededError:
+            raise
         except Exception as e:
             self.logger.error(f"Error during chat completion: {e}", exc_info=True)
-            return f"An error occurred: {e}", 0
+            return f"{ERROR_RESPONSE_PREFIX}{e}", TokenUsage()
+
+    def fetch_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                              use_cache: bool = True, response_format: dict = None) -> Tuple[str, TokenUsage]:
+        """
+        Like `get_chat_completion`, but errors that persist after retrying are raised instead
+        of being returned as an error message, so callers can tell them apart.
+        """
+        temperature, max_tokens, prompt_tokens = self._resolve_params(messages, temperature, max_tokens)
+
+        cache_key, cached = self._cache_lookup(messages, temperature, max_tokens, use_cache, response_format)
+        if cached is not None:
+            self.logger.info("Serving chat completion from cache.")
+            return cached[0], TokenUsage()
+        kwargs = {"response_format": response_format} if response_format is not None else {}
+
+        def fetch() -> Tuple[str, TokenUsage]:
+            self.logger.info(f"Sending request to OpenAI API with messages {loggable_messages(messages)}")
+            completion = self._create_completion(messages, temperature, max_tokens, prompt_tokens, **kwargs)
+            usage = TokenUsage.from_completion(completion.usage)
+            record_tokens(UPSTREAM_TOKENS, usage, model=self.model)
+            self.logger.info(f"Received response from OpenAI API. Tokens used: {usage}")
+            content = completion.choices[0].message.content
+            self._cache_store(cache_key, content, usage)
+            return content, usage
+
+        if cache_key is None or self.single_flight is None:
+            return fetch()
+        # Coalesce per API key, so a response is never shared with a caller using a different key
+        (content, usage), shared = self.single_flight.do((self.api_key_hash, cache_key), fetch)
+        # Only the request that went upstream reports the tokens it spent
+        return content, TokenUsage() if shared else usage
 
-    def call_openai_api(self, system_msg: str, user_msg: str) -> Tuple[str, int]:
+    def stream_chat_completion(self, messages: List[dict], temperature: float = None, max_tokens: int = None,
+                               use_cache: bool = True) -> Iterator[Tuple[str, Optional[TokenUsage]]]:
+        """
+        Streams chat completion results from OpenAI's API as they are generated.
+
+        Unlike `get_chat_completion`, errors are raised to the caller. Opening the stream is
+        retried like any other request, but a partially consumed stream cannot be retried
+        transparently.
+
+        Args:
+            messages (list): A list of formatted message dictionaries.
+            temperature (float, optional): Temperature for controlling randomness. Defaults to class setting.
+            max_tokens (int, optional): Maximum tokens for the completion. Defaults to class setting.
+            use_cache (bool, optional): Set to False to bypass the response cache for this call.
+
+        Yields:
+            tuple: Content deltas paired with None, followed by a final ("", TokenUsage) once the
+            stream is complete. A cache hit yields the whole cached content in a single delta
+            and reports zero usage.
+
+        Raises:
+            ContextWindowExceededError: If the prompt does not fit in the model's context window.
+        """
+        temperature, max_tokens, prompt_tokens = self._resolve_params(messages, temperature, max_tokens)
+
+        cache_key, cached = self._cache_lookup(messages, temperature, max_tokens, use_cache)
+        if cached is not None:
+            self.logger.info("Serving streamed chat completion from cache.")
+            yield cached[0], None
+            yield "", TokenUsage()
+            return
+
+        self.logger.info(f"Sending streaming request to OpenAI API with messages {loggable_messages(messages)}")
+        stream = self._create_completion(messages, temperature, max_tokens, prompt_tokens,
+                                         stream=True, stream_options={"include_usage": True})
+
+        parts = []
+        usage = TokenUsage()
+        for chunk in stream:
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta, None
+            if chunk.usage is not None:
+                usage = TokenUsage.from_completion(chunk.usage)
+
+        record_tokens(UPSTREAM_TOKENS, usage, model=self.model)
+        self.logger.info(f"Streamed response from OpenAI API completed. Tokens used: {usage}")
+        self._cache_store(cache_key, "".join(parts), usage)
+        yield "", usage
+
+    def call_openai_api(self, system_msg: str, user_msg: str) -> Tuple[str, TokenUsage]:
         """
         Helper function to structure messages and call OpenAI's API.
 
@@ -87,13 +331,28 @@ class OpenAIGeniusClient:
             user_msg (str): The user's input message.
 
         Returns:
-            tuple: The generated content and the number of tokens used.
+            tuple: The generated content and its TokenUsage.
         """
         self.logger.info(
-            f"Preparing to call OpenAI API with system message: '{system_msg[:50]}...' and user message: '{user_msg[:50]}...'")
+            f"Preparing to call OpenAI API with system message {loggable_text(system_msg)} "
+            f"and user message {loggable_text(user_msg)}")
 
         # Format the messages to send to the OpenAI API
         messages = _create_messages(system_msg, user_msg)
 
         # Call the OpenAI API to get the completion
         return self.get_chat_completion(messages)
+
+    def call_openai_api_stream(self, system_msg: str, user_msg: str) -> Iterator[Tuple[str, Optional[TokenUsage]]]:
+        """
+        Helper function to structure messages and stream the response from OpenAI's API.
+
+        Args:
+            system_msg (str): The system's instruction message.
+            user_msg (str): The user's input message.
+
+        Returns:
+            Iterator[Tuple[str, Optional[TokenUsage]]]: The stream produced by `stream_chat_completion`.
+        """
+        messages = _create_messages(system_msg, user_msg)
+        return self.stream_chat_completion(messages)
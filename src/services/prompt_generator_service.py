@@ -1,7 +1,10 @@
 import logging
 from typing import Tuple
 from src.services.base_operation import OpenAIOperation
-from src.utils.load_yaml import load_yaml
+from src.services.near_duplicate_cache import fingerprint_text, get_near_duplicate_cache
+from src.services.openai_client import is_error_response
+from src.services.prompt_registry import render_prompt
+from src.services.token_usage import TokenUsage
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -11,8 +14,13 @@ class PromptGenerator(OpenAIOperation):
     """
     A class responsible for generating prompts by interacting with the OpenAI API.
     It formats user inputs into a prompt request and sends it to the API.
+
+    Requests that are near-duplicates of an earlier one with the same tone are served from
+    the near-duplicate cache; see `src.services.near_duplicate_cache`.
     """
 
+    CACHE_NAMESPACE = "prompt_generator"
+
     def __init__(self, context: str, tone_selected: str, constraints: str):
         """
         Initializes the PromptGenerator with the necessary user inputs.
@@ -27,7 +35,7 @@ class PromptGenerator(OpenAIOperation):
         self.constraints = constraints
         logger.info("PromptGenerator initialized with context, tone, and constraints.")
 
-    def execute(self, client) -> Tuple[str, int]:
+    def execute(self, client) -> Tuple[str, TokenUsage]:
         """
         Executes the prompt generation process by calling the OpenAI API.
 
@@ -35,30 +43,100 @@ class PromptGenerator(OpenAIOperation):
             client: The OpenAI API client.
 
         Returns:
-            Tuple[str, int]: The generated prompt and the number of tokens used.
+            Tuple[str, TokenUsage]: The generated prompt and the token usage.
         """
-        self._validate_input()
-        logger.info("Input validated successfully.")
-
-        # Load the system prompt template
-        prompts = load_yaml('src/prompts/prompt_generator.yml')
-        system_msg = prompts.get('SYSTEM_PROMPT_ENGINEER')
-        logger.info("Prompt template loaded from configuration.")
-
-        # Generate the user message based on the inputs
-        user_msg = self._create_user_message()
-        logger.info("User message created.")
+        system_msg, user_msg = self._prepare_messages()
+        cached = self._cache_lookup(client, system_msg)
+        if cached is not None:
+            return cached, TokenUsage()
 
         # Call the OpenAI API to generate the prompt
         logger.info("Calling OpenAI API...")
         try:
             result = client.call_openai_api(system_msg, user_msg)
             logger.info("OpenAI API call successful.")
+            self._cache_store(client, system_msg, result[0])
+            return result
+        except Exception as e:
+            logger.error(f"Error during OpenAI API call: {str(e)}", exc_info=True)
+            raise
+
+    async def aexecute(self, client) -> Tuple[str, TokenUsage]:
+        """
+        Executes the prompt generation process by calling the OpenAI API asynchronously.
+
+        Args:
+            client: The AsyncOpenAIGeniusClient instance.
+
+        Returns:
+            Tuple[str, TokenUsage]: The generated prompt and the token usage.
+        """
+        system_msg, user_msg = self._prepare_messages()
+        cached = self._cache_lookup(client, system_msg)
+        if cached is not None:
+            return cached, TokenUsage()
+
+        logger.info("Calling OpenAI API asynchronously...")
+        try:
+            result = await client.call_openai_api(system_msg, user_msg)
+            logger.info("OpenAI API call successful.")
+            self._cache_store(client, system_msg, result[0])
             return result
         except Exception as e:
             logger.error(f"Error during OpenAI API call: {str(e)}", exc_info=True)
             raise
 
+    def _prepare_messages(self) -> Tuple[str, str]:
+        """
+        Validates the input and builds the system and user messages.
+
+        Returns:
+            Tuple[str, str]: The system message and the user message.
+        """
+        self._validate_input()
+        logger.info("Input validated successfully.")
+
+        # Load the system prompt template
+        system_msg = render_prompt('prompt_generator', 'SYSTEM_PROMPT_ENGINEER')
+
+        # Generate the user message based on the inputs
+        user_msg = self._create_user_message()
+        logger.info("User message created.")
+        return system_msg, user_msg
+
+    def _cache_scope(self, client, system_msg: str) -> tuple:
+        """
+        The parts of the request that must match exactly for a cached prompt to be reused.
+        Like the response cache, it includes the API key, so a prompt is only served to
+        callers using the key that paid for it.
+        """
+        return (getattr(client, "api_key_hash", None), getattr(client, "model", None), system_msg,
+                fingerprint_text(self.tone_selected))
+
+    def _cache_text(self) -> str:
+        return f"{self.context}\n{self.constraints}"
+
+    def _cache_lookup(self, client, system_msg: str):
+        """
+        Returns a prompt generated for a near-identical request, or None.
+        """
+        cache = get_near_duplicate_cache()
+        if cache is None:
+            return None
+        hit = cache.get(self.CACHE_NAMESPACE, self._cache_scope(client, system_msg), self._cache_text())
+        if hit is None:
+            return None
+        logger.info(f"Serving generated prompt from the near-duplicate cache (similarity {hit.similarity:.3f}).")
+        return hit.value
+
+    def _cache_store(self, client, system_msg: str, content: str):
+        """
+        Remembers a generated prompt for near-identical requests.
+        """
+        cache = get_near_duplicate_cache()
+        if cache is not None and not is_error_response(content):
+            cache.set(self.CACHE_NAMESPACE, self._cache_scope(client, system_msg), self._cache_text(), content)
+
     def _validate_input(self):
         """
         Validates that all required inputs are provided.
@@ -0,0 +1,227 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from src.config import settings
+from src.utils.load_yaml import load_yaml
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Prompt files live next to this package, independent of the working directory
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+
+class PromptTemplate:
+    """
+    A prompt from a YAML file, parsed once into the placeholders it expects.
+
+    Prompts whose text is not a valid `str.format` template with identifier placeholders
+    (e.g. ones containing literal JSON braces) are treated as plain text.
+
+    Attributes:
+        name (str): The key of the prompt in its file.
+        text (str): The raw prompt text.
+        fields (frozenset | None): Placeholder names, or None for plain-text prompts.
+    """
+
+    def __init__(self, name: str, text: str):
+        """
+        Parses the template and records its placeholders.
+        """
+        self.name = name
+        self.text = text
+        self.fields: Optional[FrozenSet[str]] = self._parse_fields(text)
+
+    @staticmethod
+    def _parse_fields(text: str) -> Optional[FrozenSet[str]]:
+        try:
+            fields = {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+        except ValueError:
+            return None
+        if not all(field.isidentifier() for field in fields):
+            return None
+        return frozenset(fields)
+
+    def render(self, **params) -> str:
+        """
+        Fills in the placeholders.
+
+        Args:
+            **params: A value for every placeholder of the template.
+
+        Returns:
+            str: The formatted prompt.
+
+        Raises:
+            ValueError: If parameters are missing or unexpected.
+        """
+        if self.fields is None:
+            if params:
+                raise ValueError(f"Prompt {self.name} is plain text and takes no parameters")
+            return self.text
+        if set(params) != self.fields:
+            raise ValueError(f"Prompt {self.name} expects parameters {sorted(self.fields)}, got {sorted(params)}")
+        return self.text.format(**params)
+
+
+class _PromptFile:
+    """
+    The parsed templates of one YAML file and the modification time they were read at.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        prompts = load_yaml(path) or {}
+        if not isinstance(prompts, dict):
+            raise ValueError(f"Prompts file {path} must contain a mapping of prompt names to text")
+        self.templates: Dict[str, PromptTemplate] = {
+            name: PromptTemplate(name, str(text)) for name, text in prompts.items()
+        }
+        self.checked_at = time.monotonic()
+
+
+class PromptRegistry:
+    """
+    Loads prompt files once, keeps their parsed templates in memory and caches rendered prompts.
+
+    Files are checked for changes at most every `reload_interval` seconds and reloaded when
+    their modification time changes, so prompts can be edited without a restart while the
+    hot path does no file I/O or YAML parsing.
+
+    Attributes:
+        directory (str): Directory containing the `<name>.yml` prompt files.
+        reload_interval (float): Minimum seconds between modification checks; negative disables reloading.
+    """
+
+    def __init__(self, directory: str = PROMPTS_DIR, reload_interval: float = None, max_rendered: int = 1024):
+        """
+        Initializes an empty registry; files are loaded on first use.
+        """
+        self.directory = directory
+        self.reload_interval = settings.PROMPT_RELOAD_SECONDS if reload_interval is None else reload_interval
+        self.max_rendered = max_rendered
+        self._files: Dict[str, _PromptFile] = {}
+        self._rendered: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _file(self, file_name: str) -> _PromptFile:
+        """
+        Returns the parsed prompt file, loading or reloading it when needed.
+        Must be called with the lock held.
+        """
+        prompt_file = self._files.get(file_name)
+        if prompt_file is None:
+            prompt_file = _PromptFile(os.path.join(self.directory, f"{file_name}.yml"))
+            self._files[file_name] = prompt_file
+            logger.info(f"Loaded {len(prompt_file.templates)} prompt(s) from {prompt_file.path}.")
+            return prompt_file
+
+        if self.reload_interval < 0 or time.monotonic() - prompt_file.checked_at < self.reload_interval:
+            return prompt_file
+        prompt_file.checked_at = time.monotonic()
+        try:
+            changed = os.path.getmtime(prompt_file.path) != prompt_file.mtime
+        except OSError:
+            return prompt_file
+        if changed:
+            try:
+                prompt_file = _PromptFile(prompt_file.path)
+            except Exception as e:
+                # Keep serving the last good version while the file is being edited
+                logger.error(f"Failed to reload prompts from {prompt_file.path}: {e}")
+                return self._files[file_name]
+            self._files[file_name] = prompt_file
+            for key in [key for key in self._rendered if key[0] == file_name]:
+                del self._rendered[key]
+            logger.info(f"Reloaded prompts from {prompt_file.path}.")
+        return prompt_file
+
+    def get(self, file_name: str, name: str) -> PromptTemplate:
+        """
+        Returns a parsed prompt template.
+
+        Args:
+            file_name (str): The prompt file, without the `.yml` extension.
+            name (str): The key of the prompt in the file.
+
+        Returns:
+            PromptTemplate: The template.
+
+        Raises:
+            FileNotFoundError: If the prompt file does not exist.
+            KeyError: If the file has no prompt with that name.
+        """
+        with self._lock:
+            templates = self._file(file_name).templates
+        if name not in templates:
+            raise KeyError(f"Prompt {name} not found in {file_name}.yml")
+        return templates[name]
+
+    def render(self, file_name: str, name: str, /, **params) -> str:
+        """
+        Returns a formatted prompt, reusing the result for repeated parameters
+        (e.g. the same language pair).
+
+        Args:
+            file_name (str): The prompt file, without the `.yml` extension.
+            name (str): The key of the prompt in the file.
+            **params: A value for every placeholder of the template.
+
+        Returns:
+            str: The formatted prompt.
+        """
+        key = (file_name, name, tuple(sorted(params.items())))
+        with self._lock:
+            self._file(file_name)  # Drops cached renders if the file changed
+            rendered = self._rendered.get(key)
+            if rendered is not None:
+                self._rendered.move_to_end(key)
+                return rendered
+
+        rendered = self.get(file_name, name).render(**params)
+        with self._lock:
+            self._rendered[key] = rendered
+            while len(self._rendered) > self.max_rendered:
+                self._rendered.popitem(last=False)
+        return rendered
+
+    def validate(self):
+        """
+        Loads every prompt file in the directory, raising on the first invalid one.
+        Useful at startup to fail fast on broken prompt files.
+        """
+        for entry in sorted(os.listdir(self.directory)):
+            if entry.endswith(".yml"):
+                with self._lock:
+                    self._file(entry[:-len(".yml")])
+
+
+_default_registry = PromptRegistry()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """
+    Returns the process-wide prompt registry for `src/prompts`.
+    """
+    return _default_registry
+
+
+def render_prompt(file_name: str, name: str, /, **params) -> str:
+    """
+    Convenience wrapper around `PromptRegistry.render` on the process-wide registry.
+
+    Args:
+        file_name (str): The prompt file, without the `.yml` extension.
+        name (str): The key of the prompt in the file.
+        **params: A value for every placeholder of the template.
+
+    Returns:
+        str: The formatted prompt.
+    """
+    return _default_registry.render(file_name, name, **params)
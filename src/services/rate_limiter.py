@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict
+
+from src.config import settings
+from src.utils.bounded_pool import BoundedIdlePool
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of rejecting requests.
+
+    A reservation always succeeds and may drive the balance negative; the caller waits for
+    the returned delay, during which the bucket refills. This paces callers in arrival order
+    without polling.
+
+    Attributes:
+        capacity (float): Maximum balance, i.e. the allowed burst.
+        refill_per_second (float): Rate at which the balance refills.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initializes a full bucket.
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._balance = capacity
+        self._updated_at = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Takes `amount` from the bucket and returns how long the caller must wait before using it.
+        Must be called under the owner's lock.
+        """
+        elapsed = now - self._updated_at
+        self._balance = min(self.capacity, self._balance + elapsed * self.refill_per_second)
+        self._updated_at = now
+        self._balance -= amount
+        if self._balance >= 0:
+            return 0.0
+        return -self._balance / self.refill_per_second
+
+    def available(self, now: float) -> float:
+        """
+        Returns the current balance. Must be called under the owner's lock.
+        """
+        return min(self.capacity, self._balance + (now - self._updated_at) * self.refill_per_second)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for requests per minute (RPM) and tokens per minute (TPM).
+
+    Every completion reserves one request and its estimated tokens (prompt plus `max_tokens`,
+    which is how OpenAI accounts TPM) before it is sent. A 429 with `Retry-After` pauses all
+    callers sharing the limiter until the upstream window reopens.
+
+    Attributes:
+        rpm (int): Requests allowed per minute.
+        tpm (int): Tokens allowed per minute.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Initializes the limiter with full request and token buckets.
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = TokenBucket(rpm, rpm / 60.0)
+        self._tokens = TokenBucket(tpm, tpm / 60.0)
+        self._blocked_until = 0.0
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of callers currently waiting for capacity.
+        """
+        return self._waiting
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Reserves capacity for one request and returns the required delay in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self._requests.reserve(1, now),
+                self._tokens.reserve(tokens, now),
+                self._blocked_until - now,
+            )
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Blocks until a request of `tokens` estimated tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        delay = self._reserve(tokens)
+        if delay <= 0:
+            return 0.0
+        with self._lock:
+            self._waiting += 1
+        try:
+            logger.info(f"Rate limiter delaying request by {delay:.2f}s (queue depth: {self._waiting}).")
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return delay
+
+    async def aacquire(self, tokens: int) -> float:
+        """
+        Waits without blocking the event loop until a request of `tokens` estimated tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        delay = self._reserve(tokens)
+        if delay <= 0:
+            return 0.0
+        with self._lock:
+            self._waiting += 1
+        try:
+            logger.info(f"Rate limiter delaying request by {delay:.2f}s (queue depth: {self._waiting}).")
+            await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return delay
+
+    def try_acquire(self, tokens: int) -> bool:
+        """
+        Reserves capacity for a request of `tokens` estimated tokens only if it may be sent
+        right away, without waiting or queueing behind other callers.
+
+        Returns:
+            bool: Whether the capacity was reserved.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (self._blocked_until > now or self._requests.available(now) < 1
+                    or self._tokens.available(now) < tokens):
+                return False
+            self._requests.reserve(1, now)
+            self._tokens.reserve(tokens, now)
+            return True
+
+    def pause(self, seconds: float):
+        """
+        Holds back every caller for `seconds`, e.g. after a 429 response with `Retry-After`.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limiter paused for {seconds:.2f}s after an upstream rate limit.")
+
+
+# Limiters per (API key hash, model); idle ones are dropped once their buckets have refilled
+_limiters = BoundedIdlePool(settings.RATE_LIMIT_MAX_LIMITERS, settings.RATE_LIMIT_IDLE_SECONDS)
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key_hash: str, model: str) -> RateLimiter:
+    """
+    Returns the process-wide limiter for an API key and model, creating it on first use.
+
+    Limiters unused for `settings.RATE_LIMIT_IDLE_SECONDS` are dropped, and the least
+    recently used beyond `settings.RATE_LIMIT_MAX_LIMITERS`, so callers should look the
+    limiter up per request rather than keep it.
+
+    Args:
+        api_key_hash (str): Digest of the API key, see `src.utils.hashing.hash_api_key`.
+        model (str): The model name.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    key = (api_key_hash, model)
+    with _limiters_lock:
+        _limiters.evict_idle()
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(settings.RATE_LIMIT_RPM, settings.RATE_LIMIT_TPM)
+            _limiters.put(key, limiter)
+        return limiter
+
+
+def get_queue_depth(api_key_hash: str, model: str) -> int:
+    """
+    Returns the callers waiting at the limiter of an API key and model, without creating it.
+    """
+    with _limiters_lock:
+        limiter = _limiters.peek((api_key_hash, model))
+    return limiter.queue_depth if limiter is not None else 0
+
+
+def get_rate_limiter_stats() -> Dict[str, int]:
+    """
+    Returns the current queue depth of every limiter, keyed by model.
+    Limiters for different API keys on the same model are summed.
+    """
+    with _limiters_lock:
+        limiters = _limiters.items()
+    stats = {}
+    for (_, model), limiter in limiters:
+        stats[model] = stats.get(model, 0) + limiter.queue_depth
+    return stats
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.config import settings
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# A cached completion: the generated content and the tokens it originally cost
+CachedResponse = Tuple[str, int]
+
+
+def make_cache_key(api_key_hash: str, model: str, temperature: float, max_tokens: int, messages: List[dict],
+                   response_format: Optional[dict] = None) -> str:
+    """
+    Builds a canonical hash for a chat completion request.
+
+    The payload is serialized with sorted keys and no insignificant whitespace so that
+    logically identical requests always map to the same key. The key is scoped to the API
+    key, so a cached completion is only served to callers using the key that paid for it.
+
+    Args:
+        api_key_hash (str): Digest of the API key, see `src.utils.hashing.hash_api_key`.
+        model (str): The OpenAI model name.
+        temperature (float): The sampling temperature.
+        max_tokens (int): The completion token limit.
+        messages (list): The formatted message dictionaries.
+        response_format (dict, optional): The requested response format, if any.
+
+    Returns:
+        str: A hex SHA-256 digest identifying the request.
+    """
+    payload = {
+        "api_key": api_key_hash,
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": messages,
+    }
+    if response_format is not None:
+        # Only added when set, so keys of plain requests stay the same
+        payload["response_format"] = response_format
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheTier:
+    """
+    In-process LRU cache with per-entry TTL.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept before the least recently used is evicted.
+        ttl_seconds (float): Lifetime of an entry in seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initializes the memory tier with the given size limit and TTL.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Returns the cached response for the key, or None if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse):
+        """
+        Stores a response, evicting the least recently used entries when full.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheTier:
+    """
+    Persistent cache tier backed by a SQLite database, shared across processes and restarts.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+        max_entries (int): Maximum number of rows kept before the least recently used are pruned.
+        ttl_seconds (float): Lifetime of an entry in seconds.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        """
+        Opens (or creates) the cache database.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, tokens INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Returns the cached response for the key, or None if absent or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, tokens, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            content, tokens, expires_at = row
+            if expires_at < now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return content, tokens
+
+    def set(self, key: str, value: CachedResponse):
+        """
+        Stores a response and prunes expired and least recently used rows.
+        """
+        now = time.time()
+        content, tokens = value
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, tokens, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content, tokens, now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for chat completion responses.
+
+    Lookups go to the in-process LRU first and then to the optional SQLite tier; disk hits
+    are promoted into memory. Hit and miss counters are kept for observability.
+
+    Attributes:
+        memory (MemoryCacheTier): The in-process LRU tier.
+        disk (SQLiteCacheTier | None): The optional persistent tier.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to go upstream.
+    """
+
+    def __init__(self, memory: MemoryCacheTier, disk: Optional[SQLiteCacheTier] = None):
+        """
+        Initializes the cache with its tiers.
+        """
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Looks up a response in all tiers.
+
+        Args:
+            key (str): The request key from `make_cache_key`.
+
+        Returns:
+            tuple | None: The cached content and original token usage, or None on a miss.
+        """
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache lookup failed: {e}")
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: CachedResponse):
+        """
+        Stores a response in all tiers.
+
+        Args:
+            key (str): The request key from `make_cache_key`.
+            value (tuple): The generated content and the tokens used to produce it.
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write failed: {e}")
+
+    def clear(self):
+        """
+        Removes all entries from every tier and resets the counters.
+        """
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters and the current memory tier size.
+        """
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """
+    Returns the process-wide response cache configured from `src.config.settings`.
+
+    Returns:
+        ResponseCache | None: The shared cache, or None when caching is disabled.
+    """
+    global _default_cache
+    if not settings.CACHE_ENABLED:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            disk = None
+            if settings.CACHE_DB_PATH:
+                disk = SQLiteCacheTier(settings.CACHE_DB_PATH, settings.CACHE_DB_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+            memory = MemoryCacheTier(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+            _default_cache = ResponseCache(memory, disk)
+            logger.info(f"Response cache initialized (disk tier: {settings.CACHE_DB_PATH or 'disabled'}).")
+        return _default_cache
@@ -0,0 +1,95 @@
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import openai
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from src.config import settings
+from src.services.metrics import UPSTREAM_RETRIES
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: request timeout, conflict, rate limit and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Returns True for errors that may succeed on a later attempt.
+
+    Connection problems, timeouts, rate limits and server errors are retryable; invalid
+    requests, authentication failures and local validation errors are not.
+    """
+    if isinstance(exc, openai.APIConnectionError):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES or exc.status_code >= 500
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Extracts the server-requested delay from the `Retry-After` headers of an API error.
+
+    Args:
+        exc (BaseException): The error raised by the OpenAI SDK.
+
+    Returns:
+        float | None: The delay in seconds, or None if the response did not specify one.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _wait_for_retry(retry_state) -> float:
+    """
+    Waits as long as the server asked for, or backs off exponentially if it did not say.
+    """
+    retry_after = retry_after_seconds(retry_state.outcome.exception())
+    if retry_after is not None:
+        return min(retry_after, settings.RETRY_MAX_WAIT_SECONDS)
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state):
+    exc = retry_state.outcome.exception()
+    client = retry_state.args[0] if retry_state.args else None
+    UPSTREAM_RETRIES.inc(model=getattr(client, "model", "unknown"), error=type(exc).__name__)
+    logger.warning(f"Retrying OpenAI request after {type(exc).__name__} "
+                   f"(attempt {retry_state.attempt_number}): {exc}")
+
+
+# Decorator for the methods that send a request upstream; works for sync and async functions
+completion_retry = retry(
+    retry=retry_if_exception(is_retryable),
+    wait=_wait_for_retry,
+    stop=stop_after_attempt(settings.RETRY_MAX_ATTEMPTS),
+    before_sleep=_log_retry,
+    reraise=True,
+)
@@ -0,0 +1,42 @@
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RoutingContext:
+    """
+    What is known about the operation issuing a completion request, for model routing.
+
+    Attributes:
+        operation (str | None): Class name of the running `OpenAIOperation`.
+        source_lang (str | None): Source language, for translation operations.
+        target_lang (str | None): Target language, for translation operations.
+    """
+    operation: Optional[str] = None
+    source_lang: Optional[str] = None
+    target_lang: Optional[str] = None
+
+
+_current = contextvars.ContextVar("genius_routing_context", default=RoutingContext())
+
+
+def get_routing_context() -> RoutingContext:
+    """
+    Returns the routing context of the innermost running operation.
+    """
+    return _current.get()
+
+
+@contextmanager
+def routing_context(operation: str, source_lang: str = None, target_lang: str = None):
+    """
+    Sets the routing context while an operation runs. Contexts follow the code into
+    coroutines but not into other threads; operations run on worker threads set their own.
+    """
+    token = _current.set(RoutingContext(operation, source_lang, target_lang))
+    try:
+        yield
+    finally:
+        _current.reset(token)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """
+    An upstream call in progress, shared by every caller with the same key.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into a single execution.
+
+    The first caller for a key (the leader) runs the function; callers arriving while it is
+    in flight wait for it and receive the same result, or the same exception. Nothing is kept
+    once the call completes, so this complements rather than replaces the response cache.
+
+    Threads and coroutines are tracked separately: `do` coalesces across threads, `ado`
+    across tasks on the same event loop.
+
+    Attributes:
+        calls (int): Number of calls that went upstream.
+        collapsed (int): Number of calls that were served by another in-flight call.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty in-flight table.
+        """
+        self.calls = 0
+        self.collapsed = 0
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._async_in_flight = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Runs `fn` unless an identical call is already in flight, in which case its result is awaited.
+
+        Args:
+            key (Hashable): Identifies equivalent calls.
+            fn (callable): The function to run if this caller becomes the leader.
+
+        Returns:
+            tuple: The result and whether it was shared from another caller's execution.
+
+        Raises:
+            Exception: Whatever `fn` raised, re-raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            if call is None:
+                call = _Call()
+                self._in_flight[key] = call
+                self.calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.collapsed += 1
+                leader = False
+
+        if not leader:
+            logger.info("Joining an identical in-flight OpenAI request.")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f"Shared an OpenAI response with {call.waiters} identical in-flight request(s).")
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Async counterpart of `do`: awaits `fn()` unless an identical call is already in flight
+        on the running event loop.
+
+        Args:
+            key (Hashable): Identifies equivalent calls.
+            fn (callable): Coroutine function to await if this caller becomes the leader.
+
+        Returns:
+            tuple: The result and whether it was shared from another caller's execution.
+
+        Raises:
+            Exception: Whatever `fn` raised, re-raised in every waiting caller.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            in_flight = self._async_in_flight.setdefault(loop, {})
+            future = in_flight.get(key)
+            if future is None:
+                future = loop.create_future()
+                in_flight[key] = future
+                self.calls += 1
+                leader = True
+            else:
+                self.collapsed += 1
+                leader = False
+
+        if not leader:
+            logger.info("Joining an identical in-flight OpenAI request.")
+            # Shielded so a cancelled waiter does not cancel the leader's result for the others
+            return await asyncio.shield(future), True
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del in_flight[key]
+
+    def stats(self) -> dict:
+        """
+        Returns the upstream and collapsed call counters.
+        """
+        with self._lock:
+            total = self.calls + self.collapsed
+            return {
+                "calls": self.calls,
+                "collapsed": self.collapsed,
+                "collapsed_ratio": self.collapsed / total if total else 0.0,
+                "in_flight": len(self._in_flight) + sum(len(calls) for calls in self._async_in_flight.values()),
+            }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide single-flight group used by the OpenAI clients.
+    """
+    return _single_flight
@@ -1,7 +1,8 @@
 import logging
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
 from src.services.base_operation import OpenAIOperation
-from src.utils.load_yaml import load_yaml
+from src.services.prompt_registry import render_prompt
+from src.services.token_usage import TokenUsage
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ class TextTranslator(OpenAIOperation):
         self.text = text
         logger.info(f"TextTranslator initialized with source_lang: {self.source_lang}, target_lang: {self.target_lang}")
 
-    def execute(self, client) -> Tuple[str, int]:
+    def execute(self, client) -> Tuple[str, TokenUsage]:
         """
         Executes the text translation operation using the provided OpenAI client.
 
@@ -34,23 +35,14 @@ class TextTranslator(OpenAIOperation):
             client: The OpenAIClientImpl instance used to perform the translation.
 
         Returns:
-            Tuple[str, int]: The translated text and the number of tokens used.
+            Tuple[str, TokenUsage]: The translated text and the token usage.
 
         Raises:
             ValueError: If any of the required parameters are missing or if source
                         and target languages are the same.
         """
         logger.info("Executing text translation.")
-        self._validate_input()
-
-        # Load the prompts from a YAML file
-        prompts = load_yaml('src/prompts/text_translator.yml')
-        logger.info("Loaded translation prompts from YAML.")
-
-        system_msg = prompts['SYSTEM_TRANSLATOR'].format(
-            source_lang=self.source_lang,
-            target_lang=self.target_lang
-        )
+        system_msg = self._prepare_system_message()
 
         try:
             # Call the OpenAI API to perform the translation
@@ -61,6 +53,67 @@ class TextTranslator(OpenAIOperation):
             logger.error(f"Error during translation: {e}")
             raise
 
+    async def aexecute(self, client) -> Tuple[str, TokenUsage]:
+        """
+        Executes the text translation operation using the provided async OpenAI client.
+
+        Args:
+            client: The AsyncOpenAIGeniusClient instance used to perform the translation.
+
+        Returns:
+            Tuple[str, TokenUsage]: The translated text and the token usage.
+
+        Raises:
+            ValueError: If any of the required parameters are missing or if source
+                        and target languages are the same.
+        """
+        logger.info("Executing async text translation.")
+        system_msg = self._prepare_system_message()
+
+        try:
+            translated_text, tokens_used = await client.call_openai_api(system_msg, self.text)
+            logger.info(f"Translation completed. Tokens used: {tokens_used}")
+            return translated_text, tokens_used
+        except Exception as e:
+            logger.error(f"Error during translation: {e}")
+            raise
+
+    def stream(self, client) -> Iterator[Tuple[str, Optional[TokenUsage]]]:
+        """
+        Streams the translation as it is generated.
+
+        The input is validated eagerly, so invalid requests raise before any output is produced.
+
+        Args:
+            client: The OpenAIGeniusClient instance used to perform the translation.
+
+        Returns:
+            Iterator[Tuple[str, Optional[TokenUsage]]]: Translated text deltas paired with None, followed by ("", TokenUsage).
+
+        Raises:
+            ValueError: If any of the required parameters are missing or if source
+                        and target languages are the same.
+        """
+        logger.info("Streaming text translation.")
+        system_msg = self._prepare_system_message()
+        return client.call_openai_api_stream(system_msg, self.text)
+
+    def _prepare_system_message(self) -> str:
+        """
+        Validates the input and builds the system message for the translation.
+
+        Returns:
+            str: The system message instructing the model to translate.
+        """
+        self._validate_input()
+
+        # Rendered once per language pair and then served from the prompt registry
+        return render_prompt(
+            'text_translator', 'SYSTEM_TRANSLATOR',
+            source_lang=self.source_lang,
+            target_lang=self.target_lang
+        )
+
     def _validate_input(self):
         """
         Validates the input data to ensure the text and language information are valid.
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """
+    Token usage of one or more completions.
+
+    Attributes:
+        prompt_tokens (int): Tokens in the prompt.
+        completion_tokens (int): Tokens generated in the completion.
+        cached_tokens (int): Prompt tokens served from OpenAI's prompt cache.
+    """
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """
+        Total number of tokens billed for the prompt and the completion.
+        """
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_completion(cls, usage) -> "TokenUsage":
+        """
+        Builds a TokenUsage from the `usage` object of an OpenAI chat completion.
+
+        Args:
+            usage: The `CompletionUsage` returned by the API, or None.
+
+        Returns:
+            TokenUsage: The usage breakdown.
+        """
+        if usage is None:
+            return cls()
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        return cls(
+            prompt_tokens=usage.prompt_tokens or 0,
+            completion_tokens=usage.completion_tokens or 0,
+            cached_tokens=cached_tokens,
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Returns the usage breakdown as a JSON-serializable dictionary.
+        """
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        if not isinstance(other, TokenUsage):
+            return NotImplemented
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+        )
+
+    def __radd__(self, other) -> "TokenUsage":
+        # Allows sum() over usages, which starts from 0
+        if other == 0:
+            return self
+        return self.__add__(other)
+
+    def __str__(self) -> str:
+        return (f"{self.total_tokens} (prompt: {self.prompt_tokens}, completion: {self.completion_tokens}, "
+                f"cached: {self.cached_tokens})")
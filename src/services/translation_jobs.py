@@ -0,0 +1,429 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from src.config import settings
+from src.services.document_translator_service import DocumentTranslator
+from src.services.model_router import get_client
+from src.services.openai_client import is_error_response
+from src.services.token_usage import TokenUsage
+from src.utils.hashing import hash_api_key
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _dump_usage(usage: TokenUsage) -> str:
+    return json.dumps({"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens,
+                       "cached_tokens": usage.cached_tokens})
+
+
+def _load_usage(value: str) -> TokenUsage:
+    return TokenUsage(**json.loads(value))
+
+
+class JobStore:
+    """
+    Persistent state of translation jobs, backed by SQLite and shareable between processes.
+
+    Jobs are claimed with a lease that the worker renews as it makes progress; a job whose
+    lease expired (its worker died or the process restarted) can be claimed again and resumes
+    from the segments already stored. API keys are never stored, only their hashes.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens (or creates) the job database.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, key_hash TEXT NOT NULL, status TEXT NOT NULL, "
+            "source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, text TEXT NOT NULL, "
+            "model TEXT NOT NULL, temperature REAL NOT NULL, max_tokens INTEGER NOT NULL, "
+            "segments_total INTEGER, translation TEXT, usage TEXT, error TEXT, "
+            "worker TEXT, lease_expires_at REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_segments ("
+            "job_id TEXT NOT NULL, idx INTEGER NOT NULL, translation TEXT NOT NULL, usage TEXT NOT NULL, "
+            "PRIMARY KEY (job_id, idx))"
+        )
+        self._conn.commit()
+
+    def create(self, key_hash: str, source_lang: str, target_lang: str, text: str,
+               model: str, temperature: float, max_tokens: int) -> str:
+        """
+        Adds a queued job and returns its id.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, key_hash, status, source_lang, target_lang, text, model, temperature, "
+                "max_tokens, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, key_hash, QUEUED, source_lang, target_lang, text, model, temperature, max_tokens, now, now)
+            )
+            self._conn.commit()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Returns a job with its progress, or None if it does not exist.
+        """
+        with self._lock:
+            self._conn.row_factory = sqlite3.Row
+            try:
+                row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if row is None:
+                    return None
+                (done,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM job_segments WHERE job_id = ?", (job_id,)
+                ).fetchone()
+            finally:
+                self._conn.row_factory = None
+        job = dict(row)
+        # Segments of succeeded jobs are dropped once the translation is assembled
+        job["segments_done"] = job["segments_total"] if job["status"] == SUCCEEDED else done
+        job["usage"] = _load_usage(job["usage"]) if job["usage"] else None
+        return job
+
+    def claim(self, key_hashes: List[str], worker: str, lease_seconds: float) -> Optional[dict]:
+        """
+        Claims the oldest queued job, or running job with an expired lease, for one of the keys.
+
+        Returns:
+            dict | None: The claimed job, or None if there is nothing to do.
+        """
+        if not key_hashes:
+            return None
+        now = time.time()
+        placeholders = ",".join("?" * len(key_hashes))
+        with self._lock:
+            candidates = self._conn.execute(
+                f"SELECT id FROM jobs WHERE key_hash IN ({placeholders}) AND "
+                f"(status = ? OR (status = ? AND lease_expires_at < ?)) ORDER BY created_at LIMIT 5",
+                (*key_hashes, QUEUED, RUNNING, now)
+            ).fetchall()
+            claimed = None
+            for (job_id,) in candidates:
+                # Conditional update, so concurrent processes cannot claim the same job
+                updated = self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, lease_expires_at = ?, updated_at = ? "
+                    "WHERE id = ? AND (status = ? OR (status = ? AND lease_expires_at < ?))",
+                    (RUNNING, worker, now + lease_seconds, now, job_id, QUEUED, RUNNING, now)
+                ).rowcount
+                if updated:
+                    claimed = job_id
+                    break
+            self._conn.commit()
+        return self.get(claimed) if claimed else None
+
+    def active_key_hashes(self, key_hashes: List[str]) -> Set[str]:
+        """
+        Returns the key hashes, among those given, that have queued or running jobs.
+        """
+        if not key_hashes:
+            return set()
+        placeholders = ",".join("?" * len(key_hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT key_hash FROM jobs WHERE key_hash IN ({placeholders}) AND status IN (?, ?)",
+                (*key_hashes, QUEUED, RUNNING)
+            ).fetchall()
+        return {key_hash for (key_hash,) in rows}
+
+    def set_segments_total(self, job_id: str, total: int):
+        """
+        Records how many segments a job was split into.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET segments_total = ?, updated_at = ? WHERE id = ?",
+                               (total, time.time(), job_id))
+            self._conn.commit()
+
+    def segments(self, job_id: str) -> Dict[int, tuple]:
+        """
+        Returns the stored segment translations of a job, with their token usage, by index.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, translation, usage FROM job_segments WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {index: (translation, _load_usage(usage)) for index, translation, usage in rows}
+
+    def save_segment(self, job_id: str, index: int, translation: str, usage: TokenUsage, lease_seconds: float):
+        """
+        Stores a finished segment and renews the job's lease.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_segments (job_id, idx, translation, usage) VALUES (?, ?, ?, ?)",
+                (job_id, index, translation, _dump_usage(usage))
+            )
+            self._conn.execute("UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                               (now + lease_seconds, now, job_id))
+            self._conn.commit()
+
+    def finish(self, job_id: str, translation: str = None, usage: TokenUsage = None, error: str = None):
+        """
+        Marks a job as succeeded with its result, or as failed with an error.
+        Stored segments of succeeded jobs are dropped.
+        """
+        status = FAILED if error is not None else SUCCEEDED
+        usage_json = _dump_usage(usage) if usage is not None else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, translation = ?, usage = ?, error = ?, lease_expires_at = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (status, translation, usage_json, error, time.time(), job_id)
+            )
+            if status == SUCCEEDED:
+                self._conn.execute("DELETE FROM job_segments WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def prune(self, older_than_seconds: float) -> int:
+        """
+        Deletes finished jobs last updated more than `older_than_seconds` ago.
+        """
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM job_segments WHERE job_id IN (SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?)",
+                (SUCCEEDED, FAILED, cutoff)
+            )
+            deleted = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (SUCCEEDED, FAILED, cutoff)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of jobs per status.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class TranslationJobQueue:
+    """
+    Runs translation jobs on a pool of worker threads.
+
+    Each job is translated like `/translate/document`: split into segments, translated in
+    parallel and reassembled. Finished segments are stored as they complete, so a job picked
+    up again after a restart only translates what is left.
+
+    Since API keys are not persisted, a job can only run in a process that has seen its key,
+    either from the submission or from a status request of the job's owner. Keys are only kept
+    in memory while they have unfinished jobs. Jobs left over from a previous run resume as
+    soon as their owner polls them.
+
+    Attributes:
+        store (JobStore): The persistent job state.
+        concurrency (int): Number of jobs processed at once.
+        lease_seconds (float): How long a claimed job stays reserved without progress.
+    """
+
+    def __init__(self, store: JobStore, concurrency: int = None, lease_seconds: float = None,
+                 poll_seconds: float = None):
+        """
+        Initializes the queue; workers are started with `start`.
+        """
+        self.store = store
+        self.concurrency = concurrency or settings.JOBS_CONCURRENCY
+        self.lease_seconds = lease_seconds or settings.JOBS_LEASE_SECONDS
+        self.poll_seconds = poll_seconds or settings.JOBS_POLL_SECONDS
+        self._api_keys: Dict[str, str] = {}
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "TranslationJobQueue":
+        """
+        Starts the worker threads.
+        """
+        if self._threads:
+            return self
+        self._stop.clear()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._work, name=f"translation-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.concurrency} translation job worker(s).")
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        Stops the workers after their current segment; unfinished jobs resume once their lease expires.
+        """
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _remember_key(self, api_key: str) -> str:
+        key_hash = hash_api_key(api_key)
+        with self._wakeup:
+            if key_hash not in self._api_keys:
+                self._api_keys[key_hash] = api_key
+                self._wakeup.notify_all()
+        return key_hash
+
+    def submit(self, api_key: str, source_lang: str, target_lang: str, text: str,
+               model: str, temperature: float, max_tokens: int) -> str:
+        """
+        Enqueues a translation.
+
+        Args:
+            api_key (str): The OpenAI API key the job runs with.
+            source_lang (str): The source language of the text.
+            target_lang (str): The target language for translation.
+            text (str): The text to be translated.
+            model (str): Model name.
+            temperature (float): Sampling temperature.
+            max_tokens (int): Completion token limit per segment.
+
+        Returns:
+            str: The job id.
+
+        Raises:
+            ValueError: If the input is invalid.
+        """
+        if not text or not source_lang or not target_lang:
+            raise ValueError("Text, source language, and target language are required")
+        if source_lang == target_lang:
+            raise ValueError("Source and target languages must be different")
+        # The job is created before its key is remembered, so an idle worker cannot forget the key in between
+        job_id = self.store.create(hash_api_key(api_key), source_lang, target_lang, text, model, temperature,
+                                   max_tokens)
+        self._remember_key(api_key)
+        pruned = self.store.prune(settings.JOBS_RETENTION_SECONDS)
+        if pruned:
+            logger.info(f"Pruned {pruned} finished translation job(s).")
+        with self._wakeup:
+            self._wakeup.notify()
+        logger.info(f"Translation job {job_id} queued.")
+        return job_id
+
+    def get(self, job_id: str, api_key: str) -> Optional[dict]:
+        """
+        Returns a job, if it belongs to the API key. Also lets leftover jobs of the key resume.
+
+        Returns:
+            dict | None: The job, or None if it does not exist or belongs to another key.
+        """
+        job = self.store.get(job_id)
+        if job is None or job["key_hash"] != hash_api_key(api_key):
+            return None
+        if job["status"] in (QUEUED, RUNNING):
+            self._remember_key(api_key)
+        return job
+
+    def _forget_idle_keys(self):
+        """
+        Drops the API keys that no longer have unfinished jobs.
+        """
+        with self._wakeup:
+            # Queried with the lock held, so a key remembered meanwhile for a new job is not dropped
+            active = self.store.active_key_hashes(list(self._api_keys))
+            for key_hash in [key_hash for key_hash in self._api_keys if key_hash not in active]:
+                del self._api_keys[key_hash]
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                with self._wakeup:
+                    key_hashes = list(self._api_keys)
+                job = self.store.claim(key_hashes, self._worker_id, self.lease_seconds)
+                if job is None:
+                    self._forget_idle_keys()
+            except sqlite3.Error as e:
+                # E.g. "database is locked" while another process writes; try again after a pause
+                logger.error(f"Claiming a translation job failed: {e}")
+                job = None
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_seconds)
+                continue
+            try:
+                self._run(job)
+            except Exception as e:
+                logger.error(f"Translation job {job['id']} failed: {e}", exc_info=True)
+                try:
+                    self.store.finish(job["id"], error=str(e))
+                except sqlite3.Error as store_error:
+                    # The job is claimed again once its lease expires
+                    logger.error(f"Could not record the failure of translation job {job['id']}: {store_error}")
+
+    def _run(self, job: dict):
+        """
+        Translates the remaining segments of a claimed job and stores the result.
+        """
+        job_id = job["id"]
+        with self._wakeup:
+            api_key = self._api_keys[job["key_hash"]]
+        translator = DocumentTranslator(job["source_lang"], job["target_lang"], job["text"])
+        self.store.set_segments_total(job_id, len(translator.segments))
+        done = self.store.segments(job_id)
+        remaining = [index for index in range(len(translator.segments)) if index not in done]
+        logger.info(f"Running translation job {job_id}: {len(remaining)} of {len(translator.segments)} "
+                    f"segment(s) left.")
+
+        client = get_client(api_key, job["model"], job["temperature"], job["max_tokens"])
+        for index, translation, usage in translator.iter_segments(client, ordered=False, indexes=remaining):
+            if is_error_response(translation.strip()):
+                self.store.finish(job_id, error=translation.strip())
+                logger.warning(f"Translation job {job_id} failed on segment {index}.")
+                return
+            self.store.save_segment(job_id, index, translation, usage, self.lease_seconds)
+            done[index] = (translation, usage)
+            if self._stop.is_set():
+                logger.info(f"Translation job {job_id} interrupted; it resumes from the stored segments.")
+                return
+
+        translation = "".join(done[index][0] for index in range(len(translator.segments)))
+        usage = sum((segment_usage for _, segment_usage in done.values()), TokenUsage())
+        self.store.finish(job_id, translation, usage)
+        logger.info(f"Translation job {job_id} succeeded. Tokens used: {usage}")
+
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+def get_translation_job_queue() -> TranslationJobQueue:
+    """
+    Returns the process-wide job queue configured from `src.config.settings`, starting its
+    workers on first use (after any fork of the server process).
+    """
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = TranslationJobQueue(JobStore(settings.JOBS_DB_PATH)).start()
+        return _default_queue
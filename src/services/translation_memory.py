@@ -0,0 +1,243 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.config import settings
+from src.utils.minhash import LSHIndex, MinHasher, jaccard, shingles
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 16 bands of 4 rows find pairs above ~0.5 estimated similarity with high probability
+_BANDS = 16
+_ROWS = 4
+
+# Pruning removes the least recently used segments down to this fraction of `max_entries`,
+# so it runs once per many inserts instead of on every insert at capacity
+_PRUNE_TO = 0.9
+
+
+def _exact_key(segment: str) -> str:
+    """
+    Key for exact matches: segments that differ only in whitespace share a key.
+    """
+    return hashlib.sha256(_WHITESPACE.sub(" ", segment).strip().encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class MemoryMatch:
+    """
+    A previously translated segment matching a lookup.
+
+    Attributes:
+        source (str): The stored source segment.
+        target (str): Its stored translation.
+        score (float): Similarity to the looked-up segment, 1.0 for exact matches.
+        exact (bool): Whether the segments are identical up to whitespace.
+    """
+    source: str
+    target: str
+    score: float
+    exact: bool
+
+
+class TranslationMemory:
+    """
+    Persistent store of segment translations per language pair, with exact and fuzzy lookup.
+
+    Exact matches are found by key in SQLite. Fuzzy matches use a MinHash/LSH index over
+    character trigrams, built in memory per language pair on first use; candidates are
+    verified with the exact trigram Jaccard similarity before they are returned.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+        fuzzy_threshold (float): Minimum similarity for a fuzzy match.
+        max_entries (int): Maximum number of stored segments before the least recently used are pruned.
+    """
+
+    def __init__(self, path: str, fuzzy_threshold: float = 0.8, max_entries: int = 200000):
+        """
+        Opens (or creates) the translation memory database.
+        """
+        self.path = path
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_entries = max_entries
+        self._hasher = MinHasher(num_perm=_BANDS * _ROWS)
+        self._indexes: Dict[Tuple[str, str], LSHIndex] = {}
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, key TEXT NOT NULL, "
+            "source TEXT NOT NULL, target TEXT NOT NULL, last_used REAL NOT NULL, "
+            "PRIMARY KEY (source_lang, target_lang, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments(last_used)")
+        self._conn.commit()
+        # Segments stored; other processes sharing the database can change it, so it is
+        # recounted before pruning
+        (self._entries,) = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()
+
+    def _index(self, source_lang: str, target_lang: str) -> LSHIndex:
+        """
+        Returns the fuzzy index of a language pair, building it from the database on first use.
+        Must be called with the lock held.
+        """
+        pair = (source_lang, target_lang)
+        index = self._indexes.get(pair)
+        if index is None:
+            index = LSHIndex(_BANDS, _ROWS)
+            rows = self._conn.execute(
+                "SELECT key, source FROM segments WHERE source_lang = ? AND target_lang = ?", pair
+            ).fetchall()
+            for key, source in rows:
+                index.add(key, self._hasher.signature(shingles(source)))
+            self._indexes[pair] = index
+            logger.info(f"Built translation memory index for {source_lang}->{target_lang} ({len(rows)} segments).")
+        return index
+
+    def lookup(self, source_lang: str, target_lang: str, segment: str) -> Optional[MemoryMatch]:
+        """
+        Finds the best stored translation for a segment.
+
+        Args:
+            source_lang (str): Source language.
+            target_lang (str): Target language.
+            segment (str): The segment to translate.
+
+        Returns:
+            MemoryMatch | None: An exact match, else the most similar fuzzy match above the
+            threshold, else None.
+        """
+        key = _exact_key(segment)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, target FROM segments WHERE source_lang = ? AND target_lang = ? AND key = ?",
+                (source_lang, target_lang, key)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE segments SET last_used = ? WHERE source_lang = ? AND target_lang = ? AND key = ?",
+                    (time.time(), source_lang, target_lang, key)
+                )
+                self._conn.commit()
+                return MemoryMatch(row[0], row[1], 1.0, True)
+
+            segment_shingles = shingles(segment)
+            candidates = self._index(source_lang, target_lang).query(self._hasher.signature(segment_shingles))
+            best = None
+            for candidate_key, estimate in candidates:
+                if estimate < self.fuzzy_threshold * 0.8:
+                    break  # Sorted by estimate; the rest are too far off to verify
+                row = self._conn.execute(
+                    "SELECT source, target FROM segments WHERE source_lang = ? AND target_lang = ? AND key = ?",
+                    (source_lang, target_lang, candidate_key)
+                ).fetchone()
+                if row is None:
+                    continue
+                score = jaccard(segment_shingles, shingles(row[0]))
+                if score >= self.fuzzy_threshold and (best is None or score > best.score):
+                    best = MemoryMatch(row[0], row[1], score, False)
+            return best
+
+    def add(self, source_lang: str, target_lang: str, segment: str, translation: str):
+        """
+        Stores a segment translation, replacing an earlier translation of the same segment.
+
+        Args:
+            source_lang (str): Source language.
+            target_lang (str): Target language.
+            segment (str): The source segment.
+            translation (str): Its translation.
+        """
+        key = _exact_key(segment)
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM segments WHERE source_lang = ? AND target_lang = ? AND key = ?",
+                (source_lang, target_lang, key)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO segments (source_lang, target_lang, key, source, target, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source_lang, target_lang, key, segment, translation, time.time())
+            )
+            if exists is None:
+                self._entries += 1
+            if self._entries > self.max_entries:
+                self._prune()
+            self._conn.commit()
+            if (source_lang, target_lang) in self._indexes:
+                self._indexes[(source_lang, target_lang)].add(key, self._hasher.signature(shingles(segment)))
+
+    def _prune(self):
+        """
+        Removes the least recently used segments down to `_PRUNE_TO` of `max_entries`, and
+        drops them from the fuzzy indexes. Must be called with the lock held.
+        """
+        (self._entries,) = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()
+        if self._entries <= self.max_entries:
+            return
+        excess = self._entries - int(self.max_entries * _PRUNE_TO)
+        rows = self._conn.execute(
+            "SELECT rowid, source_lang, target_lang, key FROM segments ORDER BY last_used LIMIT ?", (excess,)
+        ).fetchall()
+        self._conn.executemany("DELETE FROM segments WHERE rowid = ?", [(row[0],) for row in rows])
+        self._entries -= len(rows)
+        for _, source_lang, target_lang, key in rows:
+            index = self._indexes.get((source_lang, target_lang))
+            if index is not None:
+                index.remove(key)
+        logger.info(f"Pruned {len(rows)} least recently used translation memory segments.")
+
+    def stats(self) -> dict:
+        """
+        Returns the number of stored segments.
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()
+        return {"entries": entries}
+
+    def clear(self):
+        """
+        Removes all stored segments.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM segments")
+            self._conn.commit()
+            self._indexes.clear()
+            self._entries = 0
+
+
+_default_memory = None
+_default_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """
+    Returns the process-wide translation memory configured from `src.config.settings`.
+
+    Returns:
+        TranslationMemory | None: The shared memory, or None when it is disabled.
+    """
+    global _default_memory
+    if not settings.TRANSLATION_MEMORY_ENABLED:
+        return None
+
+    with _default_memory_lock:
+        if _default_memory is None:
+            _default_memory = TranslationMemory(settings.TRANSLATION_MEMORY_DB_PATH,
+                                                settings.TRANSLATION_MEMORY_FUZZY_THRESHOLD,
+                                                settings.TRANSLATION_MEMORY_MAX_ENTRIES)
+            logger.info(f"Translation memory opened at {settings.TRANSLATION_MEMORY_DB_PATH}.")
+        return _default_memory
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Tuple
+
+
+class BoundedIdlePool:
+    """
+    Mapping with an LRU size bound and idle-time eviction. Not thread-safe; callers hold
+    their own lock.
+
+    Attributes:
+        max_size (int): Maximum number of entries before the least recently used is dropped.
+        idle_seconds (float): Time without use after which `evict_idle` drops an entry.
+    """
+
+    def __init__(self, max_size: int, idle_seconds: float):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._items = OrderedDict()
+
+    def get(self, key: Hashable):
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        self._items[key] = (time.monotonic(), entry[1])
+        self._items.move_to_end(key)
+        return entry[1]
+
+    def peek(self, key: Hashable):
+        """
+        Returns the entry without counting it as a use.
+        """
+        entry = self._items.get(key)
+        return None if entry is None else entry[1]
+
+    def put(self, key: Hashable, value):
+        self._items[key] = (time.monotonic(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def evict_idle(self) -> int:
+        # Entries are kept in order of last use, so the idle ones are at the front
+        cutoff = time.monotonic() - self.idle_seconds
+        evicted = 0
+        while self._items:
+            key, (last_used, _) = next(iter(self._items.items()))
+            if last_used >= cutoff:
+                break
+            del self._items[key]
+            evicted += 1
+        return evicted
+
+    def items(self) -> List[Tuple[Hashable, object]]:
+        return [(key, value) for key, (_, value) in self._items.items()]
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
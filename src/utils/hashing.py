@@ -0,0 +1,14 @@
+import hashlib
+
+
+def hash_api_key(api_key: str) -> str:
+    """
+    Returns a stable digest of an API key so the key itself is never used as a dictionary key or logged.
+
+    Args:
+        api_key (str): The OpenAI API key.
+
+    Returns:
+        str: A hex SHA-256 digest of the key.
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
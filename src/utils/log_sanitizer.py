@@ -0,0 +1,79 @@
+import re
+from typing import List
+
+from src.config import settings
+
+# Credentials that must never reach the log file
+_REDACTION_PATTERNS = [
+    (re.compile(r"sk-[A-Za-z0-9_\-]{8,}"), "sk-***"),
+    (re.compile(r"(?i)(bearer\s+)[A-Za-z0-9._\-]{8,}"), r"\1***"),
+    (re.compile(r"(?i)((?:api[_-]?key|authorization|password|secret|token)[\"']?\s*[:=]\s*[\"']?)[^\s\"',;]{4,}"),
+     r"\1***"),
+]
+
+
+def redact(text: str) -> str:
+    """
+    Masks API keys, bearer tokens and similar credentials in a text.
+
+    Args:
+        text (str): The text to clean.
+
+    Returns:
+        str: The text with credentials replaced by `***`.
+    """
+    for pattern, replacement in _REDACTION_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """
+    Shortens a text to `max_chars`, noting how much was cut.
+
+    Args:
+        text (str): The text to shorten.
+        max_chars (int): Maximum number of characters to keep.
+
+    Returns:
+        str: The text, or its beginning followed by the number of omitted characters.
+    """
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
+
+
+def loggable_text(text: str) -> str:
+    """
+    Describes a prompt or response body for logging.
+
+    Bodies are only logged when payload logging is enabled (`GENIUS_LOG_PAYLOADS`), and then
+    redacted and truncated; otherwise only their size is logged.
+
+    Args:
+        text (str): The prompt or response body.
+
+    Returns:
+        str: A log-safe representation of the text.
+    """
+    text = text or ""
+    if not settings.LOG_PAYLOADS:
+        return f"<{len(text)} chars>"
+    return repr(truncate(redact(text), settings.LOG_PAYLOAD_MAX_CHARS))
+
+
+def loggable_messages(messages: List[dict]) -> str:
+    """
+    Describes a list of chat messages for logging, see `loggable_text`.
+
+    Args:
+        messages (list): The formatted message dictionaries.
+
+    Returns:
+        str: A log-safe representation of the messages.
+    """
+    if not settings.LOG_PAYLOADS:
+        chars = sum(len(message.get("content") or "") for message in messages)
+        return f"<{len(messages)} messages, {chars} chars>"
+    return "[" + ", ".join(f"{message.get('role')}: {loggable_text(message.get('content'))}"
+                           for message in messages) + "]"
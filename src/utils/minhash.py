@@ -0,0 +1,149 @@
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+# Largest 61-bit Mersenne prime, the modulus of the permutation hashes
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+Signature = Tuple[int, ...]
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercases a text and collapses whitespace, so formatting differences do not affect similarity.
+    """
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Returns the set of character n-grams of a normalized text.
+
+    Args:
+        text (str): The text.
+        size (int): The n-gram length.
+
+    Returns:
+        set: The n-grams; a text shorter than `size` yields itself.
+    """
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """
+    Exact Jaccard similarity of two shingle sets.
+    """
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures, whose agreement rate estimates the Jaccard similarity of
+    the underlying shingle sets.
+
+    Signatures are deterministic for a given `num_perm` and `seed`, so they are comparable
+    across processes.
+
+    Attributes:
+        num_perm (int): Number of hash permutations, i.e. the signature length.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """
+        Draws the permutation parameters.
+        """
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, items: Iterable[str]) -> Signature:
+        """
+        Computes the signature of a set of shingles.
+        """
+        hashes = [zlib.crc32(item.encode("utf-8")) for item in items]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in self._params)
+
+    @staticmethod
+    def similarity(a: Signature, b: Signature) -> float:
+        """
+        Estimated Jaccard similarity of two signatures.
+        """
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are cut into `bands` bands of `rows` values; items sharing any band are
+    returned as candidates. With b bands of r rows, pairs with similarity s are found with
+    probability 1 - (1 - s^r)^b, which is steep around (1/b)^(1/r).
+
+    Attributes:
+        bands (int): Number of bands.
+        rows (int): Signature values per band.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4):
+        """
+        Initializes an empty index for signatures of length `bands * rows`.
+        """
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [defaultdict(set) for _ in range(bands)]
+        self._signatures: Dict[Hashable, Signature] = {}
+
+    def _band_keys(self, signature: Signature):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, key: Hashable, signature: Signature):
+        """
+        Indexes a signature under a key, replacing any previous signature for the key.
+        """
+        if len(signature) != self.bands * self.rows:
+            raise ValueError(f"Signature length {len(signature)} does not match {self.bands} bands "
+                             f"of {self.rows} rows")
+        self.remove(key)
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].add(key)
+
+    def remove(self, key: Hashable):
+        """
+        Removes a key from the index, if present.
+        """
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def query(self, signature: Signature) -> List[Tuple[Hashable, float]]:
+        """
+        Returns candidate keys with their estimated similarity, most similar first.
+        """
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        scored = [(key, MinHasher.similarity(signature, self._signatures[key])) for key in candidates]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
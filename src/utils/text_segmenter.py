@@ -0,0 +1,118 @@
+import re
+from typing import List, Tuple
+
+from src.utils.token_counter import count_tokens
+
+# A segment of text and the whitespace that followed it in the original document
+Segment = Tuple[str, str]
+
+_PARAGRAPH_BREAK = re.compile(r"(\n\s*\n)")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。！？])(\s+)|(\n)")
+_WORD_BREAK = re.compile(r"(\s+)")
+
+
+def _split_keep_separators(text: str, pattern: re.Pattern) -> List[Segment]:
+    """
+    Splits text on a pattern, pairing each piece with the separator that followed it.
+    Whitespace at the start of the text stays at the start of the first piece.
+    """
+    pieces = []
+    # Whitespace before the first piece, kept at the start of its text
+    head = ""
+    parts = [part for part in pattern.split(text) if part is not None]
+    # re.split with a capturing group alternates piece, separator, piece, ...
+    for i in range(0, len(parts), 2):
+        piece = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        stripped = piece.strip()
+        if stripped:
+            leading = piece[:len(piece) - len(piece.lstrip())]
+            trailing = piece[len(piece.rstrip()):]
+            if pieces:
+                pieces[-1] = (pieces[-1][0], pieces[-1][1] + leading)
+            else:
+                stripped = head + leading + stripped
+            pieces.append((stripped, trailing + separator))
+        elif pieces:
+            pieces[-1] = (pieces[-1][0], pieces[-1][1] + piece + separator)
+        else:
+            head += piece + separator
+    return pieces
+
+
+def _split_oversized(piece: Segment, max_tokens: int) -> List[Segment]:
+    """
+    Breaks a piece that exceeds the budget into sentences, and sentences into word runs.
+    """
+    text, separator = piece
+    if count_tokens(text) <= max_tokens:
+        return [piece]
+
+    sentences = _split_keep_separators(text, _SENTENCE_BREAK)
+    if len(sentences) > 1:
+        sentences[-1] = (sentences[-1][0], sentences[-1][1] + separator)
+        return [part for sentence in sentences for part in _split_oversized(sentence, max_tokens)]
+
+    # A single sentence that is still too long: fall back to word boundaries
+    words = _split_keep_separators(text, _WORD_BREAK)
+    words[-1] = (words[-1][0], separator)
+    return words
+
+
+def segment_text(text: str, max_tokens: int) -> List[Segment]:
+    """
+    Splits a document into segments of at most `max_tokens` estimated tokens.
+
+    Paragraph boundaries are preferred, then sentence boundaries, then word boundaries.
+    Consecutive small paragraphs are packed together so that short documents stay in a
+    single segment. Each segment is paired with the whitespace that followed it, so
+    `"".join(text + separator for text, separator in segments)` restores the layout.
+
+    Args:
+        text (str): The document to split.
+        max_tokens (int): The token budget per segment.
+
+    Returns:
+        list: The segments as (text, trailing separator) tuples, in document order.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+
+    pieces = []
+    for paragraph in _split_keep_separators(text, _PARAGRAPH_BREAK):
+        pieces.extend(_split_oversized(paragraph, max_tokens))
+
+    segments = []
+    current, current_separator = "", ""
+    for piece, separator in pieces:
+        candidate = current + current_separator + piece if current else piece
+        if current and count_tokens(candidate) > max_tokens:
+            segments.append((current, current_separator))
+            current = piece
+        else:
+            current = candidate
+        current_separator = separator
+    if current:
+        segments.append((current, current_separator))
+    return segments
+
+
+def split_sentences(text: str) -> List[Segment]:
+    """
+    Splits a text into sentences, without packing them together.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list: The sentences as (text, trailing separator) tuples, in document order.
+        Leading whitespace of the text is not included.
+    """
+    sentences = []
+    for paragraph, separator in _split_keep_separators(text, _PARAGRAPH_BREAK):
+        parts = _split_keep_separators(paragraph, _SENTENCE_BREAK)
+        parts[-1] = (parts[-1][0], parts[-1][1] + separator)
+        sentences.extend(parts)
+    if sentences:
+        sentences[0] = (sentences[0][0].lstrip(), sentences[0][1])
+    return sentences
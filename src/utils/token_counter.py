@@ -0,0 +1,146 @@
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.config.models import get_context_window, get_max_output_tokens
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional
+    tiktoken = None
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Average number of characters per token, used when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+# Formatting overhead the chat format adds per message and once per request
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REQUEST = 3
+
+# Encoding used for models tiktoken does not know about
+FALLBACK_ENCODING = "cl100k_base"
+
+
+class ContextWindowExceededError(ValueError):
+    """
+    Raised when a prompt leaves no room for a completion in the model's context window.
+    """
+
+
+# Encodings loaded so far by model; loading is serialized so that concurrent first calls do
+# not each download the encoding file
+_encodings: Dict[Optional[str], object] = {}
+_encodings_lock = threading.Lock()
+# Set once loading has failed, so that other models do not retry the download either
+_encodings_unavailable = False
+
+
+def _get_encoding(model: Optional[str]):
+    """
+    Returns the tiktoken encoding for a model, or None when tiktoken is unavailable.
+
+    tiktoken downloads encoding files on first use; if that fails (e.g. no network access),
+    token counts fall back to the characters-per-token estimate for the life of the process.
+    """
+    try:
+        return _encodings[model]
+    except KeyError:
+        pass
+    with _encodings_lock:
+        if model not in _encodings:
+            _encodings[model] = _load_encoding(model)
+        return _encodings[model]
+
+
+def _load_encoding(model: Optional[str]):
+    """
+    Loads the tiktoken encoding for a model. Must be called with `_encodings_lock` held.
+    """
+    global _encodings_unavailable
+    if tiktoken is None or _encodings_unavailable:
+        return None
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                logger.info(f"No tiktoken encoding registered for model {model}; using {FALLBACK_ENCODING}.")
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        _encodings_unavailable = True
+        logger.warning(f"Could not load tiktoken encoding, estimating token counts instead: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """
+    Counts the tokens in a text locally, without calling the API.
+
+    Uses the model's tiktoken encoding when tiktoken is installed and falls back to a
+    characters-per-token estimate otherwise.
+
+    Args:
+        text (str): The text to measure.
+        model (str, optional): The model whose tokenizer should be used.
+
+    Returns:
+        int: The token count.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[dict], model: str = None) -> int:
+    """
+    Counts the prompt tokens of a list of chat messages, including formatting overhead.
+
+    Args:
+        messages (list): The formatted message dictionaries.
+        model (str, optional): The model whose tokenizer should be used.
+
+    Returns:
+        int: The prompt token count.
+    """
+    return TOKENS_PER_REQUEST + sum(
+        TOKENS_PER_MESSAGE + count_tokens(message.get("content") or "", model) for message in messages
+    )
+
+
+def plan_completion_budget(messages: List[dict], model: str, max_tokens: int) -> Tuple[int, int]:
+    """
+    Checks a request against the model limits before it is sent.
+
+    The requested completion length is clamped to what the model can generate and to the
+    room the prompt leaves in the context window.
+
+    Args:
+        messages (list): The formatted message dictionaries.
+        model (str): The model the request is for.
+        max_tokens (int): The requested completion token limit.
+
+    Returns:
+        tuple: The prompt token count and the clamped completion token limit.
+
+    Raises:
+        ContextWindowExceededError: If the prompt alone fills the model's context window.
+    """
+    prompt_tokens = count_message_tokens(messages, model)
+    context_window = get_context_window(model)
+    available = context_window - prompt_tokens
+    if available <= 0:
+        raise ContextWindowExceededError(
+            f"Prompt of {prompt_tokens} tokens exceeds the {context_window} token context window of {model}"
+        )
+
+    budget = min(max_tokens, get_max_output_tokens(model), available)
+    if budget < max_tokens:
+        logger.info(f"Clamped max_tokens from {max_tokens} to {budget} for {model} "
+                    f"(prompt tokens: {prompt_tokens}).")
+    return prompt_tokens, budget